@@ -10,74 +10,1084 @@ Based on pybis v1.37.3 documentation from:
 - https://openbis.readthedocs.io/en/latest/software-developer-documentation/apis/python-v3-api.html
 """
 
+import asyncio
+import contextlib
+import functools
+import heapq
+import importlib.util
+import itertools
+import json
 import logging
+import operator
 import os
 import re
-from typing import Dict, List, Any
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from langchain_core.tools import Tool
 
 # Check if pandas is available for advanced date filtering
-try:
-    import importlib.util
-    PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
-except ImportError:
-    PANDAS_AVAILABLE = False
-
-# Load environment variables from .env file
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv not available, continue without it
+PANDAS_AVAILABLE = importlib.util.find_spec("pandas") is not None
 
 logger = logging.getLogger(__name__)
 
-# Try to import pybis
-try:
-    import pybis
-    PYBIS_AVAILABLE = True
-except ImportError:
+# pybis pulls in a large dependency graph, so it is only located here and
+# imported on the first connect (see _get_pybis)
+PYBIS_AVAILABLE = importlib.util.find_spec("pybis") is not None
+if not PYBIS_AVAILABLE:
     logger.warning("pybis package not available. Function calling will be disabled.")
-    PYBIS_AVAILABLE = False
+pybis = None
+
+
+def _get_pybis():
+    """Import pybis on first use."""
+    global pybis
+    if pybis is None:
+        import pybis as _pybis
+        pybis = _pybis
+    return pybis
+
+
+# Month names and abbreviations understood by the date filters
+_MONTH_NUMBERS = {
+    'january': 1, 'jan': 1, 'february': 2, 'feb': 2,
+    'march': 3, 'mar': 3, 'april': 4, 'apr': 4,
+    'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8, 'september': 9, 'sep': 9,
+    'october': 10, 'oct': 10, 'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12
+}
+
+# Month/year patterns like "February 2024", "Feb 2024", "2024-02", "02/2024",
+# tried in order. The flag tells whether the year is the first group.
+_MONTH_YEAR_PATTERNS = (
+    (re.compile(r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{4})'), False),
+    (re.compile(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{4})'), False),
+    (re.compile(r'(\d{4})-(\d{1,2})'), True),
+    (re.compile(r'(\d{1,2})/(\d{4})'), False),
+)
+
+# Year-only patterns like "2024", "in 2023"
+_YEAR_PATTERN = re.compile(r'\b(20\d{2})\b')
+
+# Every date filter needs a digit or one of the words of "last/this month/year"
+_DATE_HINT_PATTERN = re.compile(r'\d|month|year')
+
+# Words in tool input asking to show properties or registration dates
+_PROPERTIES_PATTERN = re.compile(r'propert(?:y|ies)', re.IGNORECASE)
+_DATES_PATTERN = re.compile(r'(?:creation|registration) date', re.IGNORECASE)
+
+# A key=value pair whose whole value is quoted, e.g. reason="Deleted, retired"
+_QUOTED_PAIR_PATTERN = re.compile(r'''[^,=]*=\s*(["']).*?\1\s*(?=,|$)''', re.DOTALL)
+
+# Tool input made of a single key=value token, e.g. "identifier=/LAB/S1"
+_SINGLE_PAIR_PATTERN = re.compile(r'[^\s=,"\']+=[^\s,"\']*')
+
+_MONTH_NAMES = ('', 'January', 'February', 'March', 'April', 'May', 'June',
+                'July', 'August', 'September', 'October', 'November', 'December')
+
+# Tool parameters that hold a parsed date filter
+_DATE_KEYS = frozenset(('year', 'month'))
+
+
+def _registration_date_criteria(date_filters: Dict[str, Any]) -> Dict[str, str]:
+    """Return pybis search criteria for the start of a year/month filter.
+
+    pybis takes a single comparison per attribute, so only the lower bound is
+    searched on the server; the rest of the filter is applied to the results.
+    """
+    year = date_filters.get('year')
+    if not isinstance(year, int):
+        return {}
+    month = date_filters.get('month')
+    month = month if isinstance(month, int) and 1 <= month <= 12 else 1
+    return {'registrationDate': f">={year:04d}-{month:02d}-01"}
+
+
+def _append_fields(parts: List[str], obj, fields, keep_falsy: bool = False) -> None:
+    """Append a "Label: value" line for each (label, attribute) set on ``obj``.
+
+    Each attribute is read once; missing attributes, None and empty strings
+    are skipped, as are other falsy values unless ``keep_falsy`` is set.
+    """
+    for label, attr in fields:
+        value = getattr(obj, attr, None)
+        if value or (keep_falsy and value is not None and value != ''):
+            parts.append(f"{label}: {value}\n")
+
+
+def _format_entity(kind: str, entity) -> str:
+    """Format the details of an entity as shown by the get_<kind> tools."""
+    title_attr, fields, with_properties = ENTITY_DETAIL_FIELDS[kind]
+    parts = [f"{ENTITY_KINDS[kind][0]}: {getattr(entity, title_attr)}\n"]
+    _append_fields(parts, entity, fields)
+
+    properties = getattr(entity, 'properties', None) if with_properties else None
+    if properties:
+        parts.append("Properties:\n")
+        parts.extend(f"  {key}: {value}\n" for key, value in properties.items())
+    return "".join(parts)
+
+
+def _dataset_owner(dataset) -> str:
+    """Describe the entity a dataset is attached to, e.g. " → Sample: S1".
+
+    Only the references already loaded with the dataset are read, since the
+    lazy sample/experiment properties would fetch each owner from the server.
+    """
+    for _, loaded_attr, prefix in DATASET_OWNER_KINDS:
+        name = _clean_ref(_field(getattr(dataset, loaded_attr, None) or {}, 'identifier'))
+        if name:
+            return prefix + name
+
+    # Fallback: reference attributes, still without lazy loading
+    attrs_all = getattr(getattr(dataset, 'attrs', None), 'all', None)
+    attrs = attrs_all() if attrs_all else {}
+    for attr, _, prefix in DATASET_OWNER_KINDS:
+        name = _clean_ref(attrs.get(attr))
+        if name:
+            return prefix + name
+    return ""
+
+
+def _format_dataset_row(number: int, dataset) -> str:
+    """Format one numbered line of the list_datasets output."""
+    identifier = _first_attr(dataset, ('permId', 'code', 'identifier'), "N/A")
+    dataset_type = getattr(dataset, 'type', None) or "UNKNOWN"
+    try:
+        attached_to = _dataset_owner(dataset)
+    except (AttributeError, KeyError, TypeError) as e:
+        # If anything fails, just don't show attachment info
+        logger.debug("Could not get dataset attachment info: %s", e)
+        attached_to = ""
+    return f"{number}. {identifier} ({dataset_type}){attached_to}\n"
+
+
+def _format_date_filter(date_filters: Dict[str, Any]) -> str:
+    """Describe a date filter for tool output, e.g. " from February 2024"."""
+    if 'month' in date_filters and 'year' in date_filters:
+        return f" from {_MONTH_NAMES[date_filters['month']]} {date_filters['year']}"
+    if 'year' in date_filters:
+        return f" from {date_filters['year']}"
+    return ""
+
+# Entity kinds handled by the generic entity action tools:
+# kind -> (display label, Openbis getter, identifier parameter)
+ENTITY_KINDS = {
+    "sample": ("Sample", "get_sample", "identifier"),
+    "dataset": ("Dataset", "get_dataset", "identifier"),
+    "experiment": ("Experiment", "get_experiment", "identifier"),
+    "project": ("Project", "get_project", "identifier"),
+    "space": ("Space", "get_space", "space_code"),
+}
+
+# Fields shown by the get_<kind> tools:
+# kind -> (title attribute, (label, attribute) lines shown when set, list properties)
+ENTITY_DETAIL_FIELDS = {
+    "space": ("code", (
+        ("Description", "description"),
+        ("Registrator", "registrator"),
+        ("Registration Date", "registrationDate"),
+    ), False),
+    "project": ("identifier", (
+        ("Code", "code"),
+        ("Space", "space"),
+        ("Description", "description"),
+        ("Registrator", "registrator"),
+        ("Registration Date", "registrationDate"),
+    ), False),
+    "experiment": ("identifier", (
+        ("Type", "type"),
+        ("Project", "project"),
+    ), True),
+    "sample": ("identifier", (
+        ("Type", "type"),
+        ("Space", "space"),
+    ), True),
+    "dataset": ("code", (
+        ("Type", "type"),
+    ), True),
+}
+
+# Optional fields shown by the other detail tools, as (label, attribute)
+SAMPLE_TYPE_FIELDS = (
+    ("Description", "description"),
+    ("Generated Code Prefix", "generatedCodePrefix"),
+    ("Auto Generated Code", "autoGeneratedCode"),
+)
+VOCABULARY_FIELDS = (("Description", "description"),)
+SERVER_INFO_FIELDS = (
+    ("API Version", "api_version"),
+    ("Project Samples Enabled", "project_samples_enabled"),
+)
+PLUGIN_FIELDS = (("Type", "pluginType"), ("Description", "description"))
+EXTERNAL_DMS_FIELDS = (("Label", "label"), ("Address", "address"), ("Address Type", "addressType"))
+PERSON_FIELDS = (("First Name", "firstName"), ("Last Name", "lastName"), ("Email", "email"), ("Space", "space"))
+GROUP_FIELDS = (
+    ("Description", "description"),
+    ("Registrator", "registrator"),
+    ("Registration Date", "registrationDate"),
+)
+TAG_FIELDS = (("Description", "description"), ("Owner", "owner"))
+
+# Actions that fetch an entity and call one of its methods without arguments
+# (other than those built by "kwargs"). Messages are formatted with the
+# entity kind and identifier; "log" uses %-style arguments so the logger
+# only formats it when INFO is enabled.
+ENTITY_ACTIONS = {
+    "delete": {
+        "kwargs": lambda params: {
+            "reason": params.get('reason', 'Deleted via chatBIS'),
+            "permanently": params.get('permanently', False),
+        },
+        "log": "Deleted %s: %s",
+        "success": "Successfully deleted {kind}: {identifier}",
+        "error": "Error deleting {kind}",
+    },
+    "mark_to_be_deleted": {
+        # pybis only flags the local object and its save() ignores the flag;
+        # the *_save tool sends the deletion for a staged, marked entity
+        "stage": True,
+        "log": "Marked %s for deletion: %s",
+        "success": "Successfully marked {kind} '{identifier}' for deletion.",
+        "error": "Error marking {kind} for deletion",
+    },
+    "unmark_to_be_deleted": {
+        "stage": True,
+        "log": "Unmarked %s for deletion: %s",
+        "success": "Successfully unmarked {kind} '{identifier}' for deletion.",
+        "error": "Error unmarking {kind} for deletion",
+    },
+    "save": {
+        "log": "Saved %s: %s",
+        "success": "Successfully saved {kind}: {identifier}",
+        "error": "Error saving {kind}",
+    },
+}
+
+# Tools that only read from openBIS. They have no side effects on the server,
+# so they are safe to run concurrently.
+READ_ONLY_TOOLS = frozenset({
+    "check_openbis_connection",
+    "list_spaces", "get_space",
+    "list_projects", "get_project",
+    "list_experiments", "get_experiment",
+    "list_samples", "list_samples_detailed", "get_sample",
+    "list_datasets", "get_dataset",
+    "list_sample_types", "get_sample_type", "list_experiment_types",
+    "list_dataset_types", "list_property_types",
+    "list_vocabularies", "get_vocabulary",
+    "openbis_get_server_information", "openbis_get_session_info",
+    "openbis_is_session_active", "openbis_get_datastores",
+    "openbis_get_plugins", "openbis_get_plugin",
+    "openbis_get_external_data_management_systems",
+    "openbis_get_external_data_management_system",
+    "openbis_get_persons", "openbis_get_person",
+    "openbis_get_groups", "openbis_get_group",
+    "openbis_get_role_assignments", "openbis_get_tags", "openbis_get_tag",
+    "sample_get_datasets", "sample_get_projects", "sample_is_marked_to_be_deleted",
+    "dataset_get_file_list", "dataset_get_files", "dataset_is_marked_to_be_deleted",
+    "dataset_download_status",
+    "experiment_get_datasets", "experiment_get_samples", "experiment_get_projects",
+    "experiment_is_marked_to_be_deleted",
+    "project_get_experiments", "project_get_datasets", "project_get_samples", "project_get_contents",
+    "project_get_sample", "project_is_marked_to_be_deleted",
+    "space_get_experiments", "space_get_samples", "space_get_projects",
+    "space_is_marked_to_be_deleted",
+})
+
+
+# DataFrame columns read by the listing tools
+SAMPLE_LIST_COLUMNS = ['identifier', 'type', 'registrationDate']
+EXPERIMENT_LIST_COLUMNS = ['identifier', 'type', 'registrationDate']
+CODE_LIST_COLUMNS = ['code', 'description']
+PROPERTY_TYPE_LIST_COLUMNS = ['code', 'dataType', 'description']
+DATASTORE_LIST_COLUMNS = ['code', 'downloadUrl']
+PLUGIN_LIST_COLUMNS = ['name', 'pluginType', 'description']
+EXTERNAL_DMS_LIST_COLUMNS = ['code', 'label', 'address']
+PERSON_LIST_COLUMNS = ['userId', 'firstName', 'lastName', 'email']
+
+
+def _to_records(items, columns: List[str]) -> List[Any]:
+    """Return the rows of a pybis result as plain dicts.
+
+    pybis ``Things`` are backed by a DataFrame, so the needed columns are
+    extracted in a single ``to_dict('records')`` call instead of building an
+    entity object per row. For most listings pybis would fetch each of those
+    objects from the server again. Plain DataFrames (e.g. data stores) are
+    read the same way, with missing values as None. Anything else is returned
+    as a list of items.
+    """
+    df = getattr(items, 'df', items) if PANDAS_AVAILABLE else None
+    if hasattr(df, 'columns') and all(column in df.columns for column in columns):
+        rows = df[columns]
+        return rows.astype(object).where(rows.notna(), None).to_dict('records')
+    return list(items)
+
+
+def _field(item, name: str, default=None):
+    """Read a field from either a record dict or a pybis entity object."""
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+def _first_attr(obj, names, default=None):
+    """Return the first truthy attribute of ``obj`` among ``names``."""
+    for name in names:
+        value = getattr(obj, name, None)
+        if value:
+            return value
+    return default
+
+
+def _label_getter(probe, names):
+    """Return a getter for the first truthy attribute of ``probe`` among ``names``.
+
+    Rows of one listing share a type, so the attribute is chosen on the first
+    row instead of being probed again on every row. Falls back to ``str``.
+    """
+    for name in names:
+        if getattr(probe, name, None):
+            return operator.attrgetter(name)
+    return str
+
+
+def _clean_ref(ref) -> str:
+    """Return the last path segment of an openBIS identifier, or '' if unset."""
+    return str(ref).rpartition('/')[2] if ref else ''
+
+
+# Parameters of openbis_get_role_assignments passed on to pybis
+ROLE_ASSIGNMENT_FILTERS = ('person', 'group', 'space', 'project')
+
+# Optional role assignment fields, as (label, attribute)
+ROLE_ASSIGNMENT_FIELDS = (('User', 'user'), ('Group', 'authorizationGroup'), ('Space', 'space'), ('Project', 'project'))
+
+# Entities a dataset can hang off, in the order they are reported:
+# (attribute, attribute holding the already loaded reference, output prefix)
+DATASET_OWNER_KINDS = (
+    ('sample', '_sample', " → Sample: "),
+    ('experiment', '_experiment', " → Experiment: "),
+    ('project', '_project', " → Project: "),
+)
+
+
+def _date_mask(dates, date_filters: Dict[str, Any]):
+    """Return a boolean mask of the registration dates matching year/month filters.
+
+    The whole column is parsed and compared in one vectorized pandas pass;
+    unparseable dates never match.
+    """
+    import pandas as pd
+
+    parsed = pd.to_datetime(pd.Series(dates), format='ISO8601', errors='coerce')
+    mask = parsed.notna()
+    if 'year' in date_filters:
+        mask &= parsed.dt.year == date_filters['year']
+    if 'month' in date_filters:
+        mask &= parsed.dt.month == date_filters['month']
+    return mask.to_numpy()
+
+
+def _split_pairs(input_str: str) -> List[str]:
+    """Split tool input on commas, keeping the commas of quoted values.
+
+    Quotes only group when they wrap a whole value, right after its ``=``.
+    Any other quote or apostrophe, as in free-text descriptions, is part of
+    the value, which ends at the next comma.
+    """
+    pairs = []
+    pos = 0
+    while pos <= len(input_str):
+        match = _QUOTED_PAIR_PATTERN.match(input_str, pos)
+        if match:
+            end = match.end()
+        else:
+            end = input_str.find(',', pos)
+            if end == -1:
+                end = len(input_str)
+        pairs.append(input_str[pos:end])
+        pos = end + 1
+    return pairs
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_params(input_str: str) -> Tuple[Tuple[str, Any], ...]:
+    """Parse the key=value pairs and flags of a tool input string.
+
+    Agents often repeat the same input, so results are cached. They are
+    returned as an immutable tuple of pairs, which callers turn into a dict.
+    """
+    params = {}
+    try:
+        # Handle both key=value pairs and natural language descriptions;
+        # check for special requests without lower-casing the whole input
+        if _PROPERTIES_PATTERN.search(input_str):
+            params['show_properties'] = True
+
+        if _DATES_PATTERN.search(input_str):
+            params['show_dates'] = True
+
+        # Parse key=value pairs if present
+        for pair in _split_pairs(input_str):
+            if '=' in pair:
+                key, value = pair.split('=', 1)
+                key = key.strip()
+                value = value.strip()
+
+                # Try to convert to appropriate type
+                if value.lower() in ['true', 'false']:
+                    params[key] = value.lower() == 'true'
+                elif value.isdigit():
+                    params[key] = int(value)
+                else:
+                    # Remove quotes if present
+                    if value.startswith('"') and value.endswith('"'):
+                        value = value[1:-1]
+                    elif value.startswith("'") and value.endswith("'"):
+                        value = value[1:-1]
+                    params[key] = value
+
+    except (AttributeError, TypeError) as e:
+        logger.error("Error parsing tool input '%s': %s", input_str, e)
+
+    return tuple(params.items())
+
+
+def _registration_date_key(item) -> str:
+    """Sort key for the most recent entities; missing dates sort last.
+
+    heapq.nlargest evaluates it once per item, so each date is read once.
+    """
+    return _field(item, 'registrationDate') or ''
+
+
+def _make_coroutine(func):
+    """Wrap a blocking tool function so it runs in the default executor.
+
+    pybis is synchronous, so the awaitable simply moves the HTTP round-trip
+    off the event loop; several of them can then be awaited concurrently.
+    """
+    async def coroutine(input_str: str = "") -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, input_str)
+
+    return coroutine
+
+
+# Errors a pybis call raises when the server rejects a request or cannot be
+# reached (pybis reports server-side errors as ValueError)
+OPENBIS_ERRORS = (ValueError, KeyError, AttributeError, requests.RequestException)
+
+# Number of entities requested per page when a listing is paged
+PAGE_SIZE = 500
+
+# Entries formatted by the masterdata and related-entity listings; the
+# header still reports the full count
+LIST_DISPLAY_LIMIT = 50
+# Dataset file listings are longer per entry, so fewer are shown
+FILE_DISPLAY_LIMIT = 20
+
+# Columns of DataSet.get_files(); pybis renames the v3 API fields
+FILE_PATH_COLUMNS = ('pathInDataSet', 'path')
+FILE_SIZE_COLUMNS = ('fileSize', 'size')
+
+# Worker threads used to fetch several entities concurrently
+MAX_FETCH_WORKERS = 8
+
+# Worker threads for dataset downloads started with wait_until_finished=false;
+# separate from the fetch workers so long downloads never block lookups
+MAX_DOWNLOAD_WORKERS = 2
+
+# Number of permIds requested from the server at once
+PERMID_BATCH_SIZE = 256
+
+# Seconds that rarely changing catalog data (types, vocabularies, ...) is cached
+CATALOG_CACHE_TTL = 300
+
+# Seconds that entity lookups and listings (spaces, samples, ...) are cached
+ENTITY_CACHE_TTL = 60
+
+# Entity objects (samples, datasets, ...) kept for tools that look up the same
+# entity again, including samples from detailed listings
+OBJECT_CACHE_SIZE = 5000
+
+# Seconds a batch loader waits for further keys before fetching, and the
+# largest number of keys it sends in one request
+BATCH_WINDOW = 0.005
+BATCH_MAX_SIZE = 100
+
+# Seconds a positive session-active check is trusted before asking again
+SESSION_CHECK_TTL = 30
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Tuple[bool, Any]:
+        """Return ``(True, value)`` for a live entry, ``(False, None)`` otherwise."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl: float = None):
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def purge(self, *scope):
+        """Drop the entries whose key starts with ``scope``, or all of them.
+
+        Entries kept outside this process are dropped as well. Keys are
+        tuples, e.g. (server_url, username, ...) for the tool caches.
+        """
+        if not scope:
+            self.clear()
+            return
+        with self._lock:
+            for key in [key for key in self._data if key[:len(scope)] == scope]:
+                del self._data[key]
+
+
+class BatchLoader:
+    """Coalesce concurrent single-key lookups into one batched fetch.
+
+    Inside a ``batching()`` block, the first caller of a batch waits
+    ``window`` seconds for other threads to add their keys, then calls
+    ``fetch_many`` once with all of them. Outside of one there is nobody to
+    wait for, so loads are fetched right away. A batch is sent early once it
+    reaches ``max_batch_size`` keys.
+    """
+
+    def __init__(self, fetch_many, window: float = BATCH_WINDOW, max_batch_size: int = BATCH_MAX_SIZE):
+        self.fetch_many = fetch_many
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Any, Future] = {}
+        self._batching = 0
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def batching(self):
+        """Let loads wait for each other while the block runs, e.g. during a fan-out."""
+        with self._lock:
+            self._batching += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batching -= 1
+
+    def load(self, key):
+        """Return the value for ``key``, fetched together with concurrent loads."""
+        with self._lock:
+            future = self._pending.get(key)
+            leader = send_now = False
+            if future is None:
+                future = Future()
+                self._pending[key] = future
+                leader = len(self._pending) == 1
+                send_now = len(self._pending) >= self.max_batch_size or not self._batching
+        if send_now:
+            self._dispatch()
+        elif leader:
+            time.sleep(self.window)
+            self._dispatch()
+        return future.result()
+
+    def _dispatch(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        try:
+            results = self.fetch_many(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for key, future in batch.items():
+            future.set_result(results.get(key))
+
+
+class PersistentTTLCache(TTLCache):
+    """TTLCache that also keeps its entries in a SQLite file.
+
+    Entries survive process restarts until they expire. Keys must be
+    JSON-serializable and values strings. ``clear`` only drops the in-memory
+    layer; entries on disk are keyed by server and user and simply expire.
+    ``purge`` also deletes the entries on disk, limited to a server and user
+    when given. Each cache uses its own table, so several caches can share
+    one file.
+
+    Entries are tool output kept unencrypted, so the file is only readable by
+    its owner.
+    """
+
+    def __init__(self, path: str, ttl: float, maxsize: int = 128, table: str = "tool_cache"):
+        super().__init__(ttl, maxsize)
+        self._table = table
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(path, 0o600)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        with self._db_lock, self._db:
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, expires REAL, value TEXT)"
+            )
+            self._db.execute(f"DELETE FROM {table} WHERE expires <= ?", (time.time(),))
+
+    def get(self, key) -> Tuple[bool, Any]:
+        """Return a live entry from memory, falling back to the SQLite file."""
+        hit, value = super().get(key)
+        if hit:
+            return hit, value
+        with self._db_lock:
+            row = self._db.execute(
+                f"SELECT expires, value FROM {self._table} WHERE key = ?", (json.dumps(key),)
+            ).fetchone()
+        if row is None:
+            return False, None
+        remaining = row[0] - time.time()
+        if remaining <= 0:
+            return False, None
+        super().set(key, row[1], ttl=remaining)
+        return True, row[1]
+
+    def set(self, key, value, ttl: float = None):
+        """Store a value in memory and in the SQLite file."""
+        ttl = self.ttl if ttl is None else ttl
+        super().set(key, value, ttl=ttl)
+        with self._db_lock, self._db:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self._table} (key, expires, value) VALUES (?, ?, ?)",
+                (json.dumps(key), time.time() + ttl, value)
+            )
+
+    def purge(self, *scope):
+        """Drop the entries whose key starts with ``scope`` from memory and from the SQLite file."""
+        super().purge(*scope)
+        with self._db_lock, self._db:
+            if not scope:
+                self._db.execute(f"DELETE FROM {self._table}")
+                return
+            # Keys are stored as JSON arrays, so a scope is a text prefix
+            prefix = json.dumps(list(scope))[:-1] + ", "
+            self._db.execute(
+                f"DELETE FROM {self._table} WHERE substr(key, 1, length(?)) = ?", (prefix, prefix)
+            )
+
+
+def _cached_on(cache_name: str):
+    """Cache a read-only tool's output on one of the connection's caches.
+
+    Results are keyed by server, user, tool and raw input. Error messages are
+    not cached, so a failing call is retried on the next invocation.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, input_str: str = "") -> str:
+            cache = getattr(self.connection, cache_name)
+            key = (self.connection.server_url, self.connection.username, method.__name__, input_str)
+            hit, result = cache.get(key)
+            if hit:
+                return result
+            result = method(self, input_str)
+            if not result.startswith("Error"):
+                cache.set(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+# Masterdata listings, kept until the catalog TTL expires
+_cached_tool = _cached_on("catalog_cache")
+
+# Entity lookups and listings, dropped whenever a tool modifies openBIS
+_entity_cached_tool = _cached_on("entity_cache")
+
+
+def _requires_connection(method):
+    """Make sure openBIS is connected before running a tool.
+
+    The connected case costs a single attribute check; otherwise an
+    auto-connection from the environment is attempted and a missing
+    connection is reported as the tool's result.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self.connection.is_connected:
+            try:
+                self._ensure_connected()
+            except ConnectionError as e:
+                return f"Error: {e}"
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _openbis_tool(error: str):
+    """Run a tool against a connected openBIS, turning exceptions into a message.
+
+    The decorated method receives the parsed tool input as a dict of
+    parameters rather than the raw input string.
+
+    Args:
+        error: prefix of the returned message, e.g. "Error listing projects"
+    """
+    def decorator(method):
+        @_requires_connection
+        @functools.wraps(method)
+        def wrapper(self, input_str: str = "") -> str:
+            try:
+                return method(self, self._parse_tool_input(input_str))
+            except Exception as e:
+                return f"{error}: {e}"
+
+        return wrapper
+
+    return decorator
+
+
+# Attributes tried, in order, to label the rows of related-entity listings
+RELATED_LISTING_LABELS = {
+    "datasets": ('code', 'permId'),
+    "samples": ('identifier',),
+    "experiments": ('identifier',),
+    "projects": ('identifier',),
+}
+
+
+# Related listings backed by a pybis search that pages on the server:
+# (kind, related) -> (search keyword, entity attribute passed to it). The
+# projects of a sample or experiment are read through the entity instead.
+RELATED_SEARCHES = {
+    ("sample", "datasets"): ("sample", "permId"),
+    ("experiment", "datasets"): ("experiment", "permId"),
+    ("experiment", "samples"): ("experiment", "permId"),
+    ("project", "experiments"): ("project", "permId"),
+    ("project", "samples"): ("project", "permId"),
+    ("project", "datasets"): ("project", "permId"),
+    ("space", "experiments"): ("space", "code"),
+    ("space", "samples"): ("space", "code"),
+    ("space", "projects"): ("space", "code"),
+}
+
+
+def _format_related_listing(items, total: int, kind: str, related: str, preposition: str,
+                            identifier: str, offset: int = 0, filter_desc: str = "",
+                            as_json: bool = False) -> str:
+    """Format one page of the ``related`` entities of an entity.
+
+    Args:
+        items: the entities of the page, at most LIST_DISPLAY_LIMIT, or the
+            DataFrame rows of the page
+        total: number of related entities on the server
+        offset: position of the first entity of the page
+        filter_desc: description of the date filter, see _format_date_filter
+        as_json: return a compact JSON object instead of numbered lines
+    """
+    if not total:
+        if as_json:
+            return json.dumps({kind: identifier, related: [], "total": 0}, separators=(',', ':'))
+        return f"No {related} found{filter_desc} {preposition} {kind} '{identifier}'."
+
+    names = RELATED_LISTING_LABELS[related]
+    # Read labels from the search result's DataFrame when it has them; pybis
+    # builds entity objects when iterating, fetching experiments and
+    # projects again one request per row
+    df = getattr(items, 'df', items) if PANDAS_AVAILABLE else None
+    column = next((name for name in names if name in getattr(df, 'columns', ())), None)
+    if column is not None:
+        labels = df[column].tolist()
+    else:
+        shown = list(items)
+        labels = map(_label_getter(shown[0], names), shown) if shown else ()
+
+    if as_json:
+        return json.dumps({kind: identifier, related: list(labels), "total": total, "offset": offset},
+                          separators=(',', ':'))
+
+    parts = [f"Found {total} {related}{filter_desc} {preposition} {kind} '{identifier}':\n"]
+    for idx, item_label in enumerate(labels, offset + 1):
+        parts.append(f"{idx}. {item_label}\n")
+
+    end = offset + len(items)
+    if end < total:
+        next_page = offset // LIST_DISPLAY_LIMIT + 2
+        parts.append(f"... (showing {offset + 1}-{end} of {total} results; use page={next_page} for more)\n")
+
+    return "".join(parts)
+
+
+def _related_listing_tool(kind: str, related: str, preposition: str):
+    """Build the tool method listing the ``related`` entities of an entity.
+
+    For example ``_related_listing_tool("sample", "datasets", "for")`` builds
+    ``_sample_get_datasets_tool``, which lists the datasets of a sample. Long
+    listings are paged with the tool's ``page`` parameter.
+    """
+    label, _, id_param = ENTITY_KINDS[kind]
+    # Messages without per-call values are built once, with the tool
+    missing_id = f"Error: {id_param} parameter is required."
+
+    def tool(self, params: Dict[str, Any]) -> str:
+        identifier = params.get(id_param)
+        if not identifier:
+            return missing_id
+
+        entity = self._get_entity(kind, identifier)
+        if entity is None:
+            return f"{label} '{identifier}' not found."
+
+        offset = (max(int(params.get('page', 1)), 1) - 1) * LIST_DISPLAY_LIMIT
+        date_filters = {k: v for k, v in params.items() if k in _DATE_KEYS}
+        items, total = self._fetch_related(kind, entity, related, offset, date_filters)
+        logger.info("Retrieved %s %s for %s: %s", total, related, kind, identifier)
+        return _format_related_listing(items, total, kind, related, preposition, identifier, offset,
+                                       _format_date_filter(date_filters), params.get('format') == 'json')
+
+    tool.__name__ = f"_{kind}_get_{related}_tool"
+    tool.__doc__ = f"Tool function for getting the {related} of a {kind}."
+    return _entity_cached_tool(_openbis_tool(f"Error getting {related} for {kind}")(tool))
+
+
+def _deletion_status_tool(kind: str):
+    """Build the tool method reporting whether an entity is marked for deletion."""
+    label, _, id_param = ENTITY_KINDS[kind]
+    missing_id = f"Error: {id_param} parameter is required."
+
+    def tool(self, params: Dict[str, Any]) -> str:
+        identifier = params.get(id_param)
+        if not identifier:
+            return missing_id
+
+        # A mark only exists on the object it was set on until it is saved;
+        # a freshly fetched entity is never marked
+        _, entity = self._get_staged_entity(kind, identifier)
+        if entity is None:
+            entity = self._get_entity(kind, identifier)
+        if entity is None:
+            return f"{label} '{identifier}' not found."
+
+        is_marked = entity.is_marked_to_be_deleted()
+        logger.info("%s %s deletion status: %s", label, identifier, is_marked)
+        return f"{label} '{identifier}' is {'marked' if is_marked else 'not marked'} for deletion."
+
+    tool.__name__ = f"_{kind}_is_marked_to_be_deleted_tool"
+    tool.__doc__ = f"Tool function for checking whether a {kind} is marked for deletion."
+    return _openbis_tool(f"Error checking {kind} deletion status")(tool)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_env():
+    """Load variables from a .env file once, on first use."""
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # dotenv not available, continue without it
+
+
+@functools.lru_cache(maxsize=None)
+def _env_credentials() -> Tuple[Any, Any, Any]:
+    """Read the openBIS URL, username and password from the environment once."""
+    _load_env()
+    return os.getenv('OPENBIS_URL'), os.getenv('OPENBIS_USERNAME'), os.getenv('OPENBIS_PASSWORD')
+
+
+def _persistent_cache_path():
+    """Return the SQLite file for the catalog and entity caches, if one is configured."""
+    _load_env()
+    path = os.getenv('CHATBIS_CACHE_PATH')
+    return os.path.expanduser(path) if path else None
+
+
+# urllib3 only decodes brotli bodies when one of these packages is installed
+BROTLI_AVAILABLE = any(
+    importlib.util.find_spec(name) is not None for name in ("brotli", "brotlicffi")
+)
+
+
+def _create_http_session() -> requests.Session:
+    """Create a keep-alive HTTP session with a connection pool for pybis.
+
+    Only connection failures are retried; JSON-RPC calls are POSTs that may
+    not be idempotent. Compressed responses are requested explicitly since
+    entity listings repeat the same property names in every row.
+    """
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = "br, gzip, deflate" if BROTLI_AVAILABLE else "gzip, deflate"
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, read=0, status=0, backoff_factor=0.2)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class _PooledRequests:
+    """Stand-in for the ``requests`` module that pybis sends JSON-RPC calls with.
+
+    pybis posts each call with ``requests.post``, opening a new connection
+    every time; this sends them through one pooled keep-alive session. The
+    response and error handling stay pybis' own.
+    """
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+    def post(self, *args, **kwargs):
+        return self.session.post(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def _install_pooled_transport(pybis_module) -> requests.Session:
+    """Route pybis' JSON-RPC calls through a shared pooled session.
+
+    The session is created once per process and kept across reconnects.
+    Relies on ``Openbis._post_request_full_url`` posting with the
+    ``requests`` module of ``pybis.pybis``, which the pinned pybis does.
+    """
+    client = pybis_module.pybis
+    if not isinstance(client.requests, _PooledRequests):
+        client.requests = _PooledRequests(_create_http_session())
+    return client.requests.session
 
 
 class PyBISConnection:
     """Manages pybis connection state."""
 
+    __slots__ = ("openbis", "is_connected", "server_url", "username",
+                 "catalog_cache", "entity_cache", "object_cache", "staged_entities", "http_session", "permid_pool",
+                 "_session_checked_at")
+
     def __init__(self):
         self.openbis = None
         self.is_connected = False
         self.server_url = None
         self.username = None
+        self.catalog_cache = TTLCache(ttl=CATALOG_CACHE_TTL)
+        self.entity_cache = TTLCache(ttl=ENTITY_CACHE_TTL, maxsize=512)
+        self.object_cache = TTLCache(ttl=ENTITY_CACHE_TTL, maxsize=OBJECT_CACHE_SIZE)
+        # Entities with property changes or a deletion mark waiting for an
+        # explicit *_save call
+        self.staged_entities = {}
+        self.http_session = None
+        self.permid_pool = deque()
+        self._session_checked_at = None
 
     def connect(self, server_url: str, username: str, password: str, verify_certificates: bool = True) -> bool:
         """Connect to openBIS server."""
         if not PYBIS_AVAILABLE:
             raise ImportError("pybis package not available")
 
-        try:
-            self.openbis = pybis.Openbis(server_url, verify_certificates=verify_certificates)
+        # Only the read-mostly catalog is kept on disk; entity results must
+        # not outlive a write made by another process
+        if not isinstance(self.catalog_cache, PersistentTTLCache) and _persistent_cache_path():
+            self.catalog_cache = PersistentTTLCache(_persistent_cache_path(), ttl=CATALOG_CACHE_TTL)
+        self.catalog_cache.clear()
+        self.entity_cache.clear()
+        self.object_cache.clear()
+        self.staged_entities.clear()
+        self.permid_pool.clear()
+        self._session_checked_at = None
+        try:
+            self.openbis = _get_pybis().Openbis(server_url, verify_certificates=verify_certificates)
+            # Send all JSON-RPC calls through one pooled keep-alive session
+            self.http_session = _install_pooled_transport(_get_pybis())
             self.openbis.login(username, password)
             self.is_connected = True
             self.server_url = server_url
             self.username = username
-            logger.info(f"Successfully connected to openBIS at {server_url} as {username}")
+            logger.info("Successfully connected to openBIS at %s as %s", server_url, username)
             return True
         except Exception as e:
-            logger.error(f"Failed to connect to openBIS: {e}")
+            logger.error("Failed to connect to openBIS: %s", e)
             self.is_connected = False
             return False
 
     def disconnect(self):
         """Disconnect from openBIS server."""
+        self.catalog_cache.clear()
+        self.entity_cache.clear()
+        self.object_cache.clear()
+        self.staged_entities.clear()
+        self.permid_pool.clear()
+        self._session_checked_at = None
         if self.openbis and self.is_connected:
             try:
                 self.openbis.logout()
                 self.is_connected = False
                 logger.info("Disconnected from openBIS")
             except Exception as e:
-                logger.error(f"Error during disconnect: {e}")
+                logger.error("Error during disconnect: %s", e)
+
+    def is_session_active(self) -> bool:
+        """Check whether the openBIS session is still valid.
+
+        An active session is remembered for SESSION_CHECK_TTL seconds, so
+        repeated checks within one conversation turn skip the round-trip.
+        Inactive results are never cached.
+        """
+        now = time.monotonic()
+        if self._session_checked_at is not None and now - self._session_checked_at < SESSION_CHECK_TTL:
+            return True
+        is_active = self.openbis.is_session_active()
+        self._session_checked_at = now if is_active else None
+        return is_active
+
+    def create_perm_id(self) -> str:
+        """Return a new permId, fetching them from the server in batches.
+
+        pybis' create_permId() asks for a single permId per request; the
+        server's createPermIdStrings accepts a count, so a batch is fetched
+        and handed out locally.
+        """
+        if not self.permid_pool:
+            perm_ids = self.openbis._post_request(self.openbis.as_v3, {
+                "method": "createPermIdStrings",
+                "params": [self.openbis.token, PERMID_BATCH_SIZE],
+            })
+            if not perm_ids:
+                raise ValueError("Could not create permId")
+            self.permid_pool.extend(perm_ids)
+        return self.permid_pool.popleft()
 
 
 # Global connection instance
@@ -87,10 +1097,19 @@ _connection = PyBISConnection()
 class PyBISToolManager:
     """Manages pybis tools and connection state."""
 
+    __slots__ = ("connection", "tools", "_auto_connect_attempted", "_user_space", "_executor",
+                 "_sample_loader", "_download_executor", "_downloads")
+
     def __init__(self):
         self.connection = _connection
         self.tools = self._create_tools()
         self._auto_connect_attempted = False
+        self._user_space = None
+        self._executor = None
+        self._sample_loader = BatchLoader(self._fetch_samples)
+        self._download_executor = None
+        # Background downloads by upper-case dataset identifier
+        self._downloads = {}
 
     def connect(self, server_url: str, username: str, password: str, verify_certificates: bool = True) -> bool:
         """Connect to openBIS server."""
@@ -98,6 +1117,7 @@ class PyBISToolManager:
 
     def disconnect(self):
         """Disconnect from openBIS server."""
+        self._user_space = None
         self.connection.disconnect()
 
     def is_connected(self) -> bool:
@@ -108,6 +1128,37 @@ class PyBISToolManager:
         """Get list of available tools."""
         return self.tools
 
+    async def arun_tools(self, calls: List[Tuple[str, str]]) -> List[str]:
+        """Run several read-only tools concurrently.
+
+        Args:
+            calls: (tool_name, input_str) pairs
+
+        Returns:
+            Tool outputs in the same order as ``calls``
+        """
+        tools_by_name = {tool.name: tool for tool in self.tools}
+        # Keep the number of requests in flight against openBIS bounded
+        semaphore = asyncio.Semaphore(MAX_FETCH_WORKERS)
+
+        async def run(name: str, input_str: str) -> str:
+            tool = tools_by_name.get(name)
+            if tool is None:
+                return f"Error: unknown tool '{name}'."
+            if name not in READ_ONLY_TOOLS:
+                return f"Error: tool '{name}' modifies openBIS and cannot run concurrently."
+            async with semaphore:
+                return await tool.coroutine(input_str)
+
+        # Connect once up front so concurrent calls do not race to auto-connect
+        try:
+            self._ensure_connected()
+        except ConnectionError:
+            pass
+
+        with self._sample_loader.batching():
+            return list(await asyncio.gather(*(run(name, input_str) for name, input_str in calls)))
+
     def _create_tools(self) -> List[Tool]:
         """Create comprehensive LangChain Tool objects for all major pybis functions."""
         tools = []
@@ -215,7 +1266,7 @@ class PyBISToolManager:
 
         tools.append(Tool(
             name="list_samples_detailed",
-            description="List ALL samples with detailed information including properties and registration dates. Shows ALL samples by default unless user specifies a limit (e.g., 'show me 20 samples'). Use this when user specifically asks for 'properties', 'detailed info', or 'all information'. Supports date filtering: 'samples in February 2024', 'samples from 2023', etc. Optional parameters: sample_type (string), project (string), experiment (string), limit (integer, only when user specifies), show_properties (boolean, default True).",
+            description="List ALL samples with detailed information including properties and registration dates. Shows ALL samples by default unless user specifies a limit (e.g., 'show me 20 samples'). Use this when user specifically asks for 'properties', 'detailed info', or 'all information'. Supports date filtering: 'samples in February 2024', 'samples from 2023', etc. Optional parameters: sample_type (string), project (string), experiment (string), limit (integer, only when user specifies), show_properties (boolean, default True), fields (string, space-separated property codes to fetch, e.g. 'NAME DESCRIPTION'; defaults to all properties).",
             func=self._list_samples_detailed_tool
         ))
 
@@ -385,18 +1436,18 @@ class PyBISToolManager:
         tools.append(Tool(
             name="sample_delete",
             description="Delete a sample. Parameters: identifier (string, sample identifier), reason (string), permanently (boolean, default False).",
-            func=self._sample_delete_tool
+            func=functools.partial(self._entity_action_tool, "sample", "delete")
         ))
 
         tools.append(Tool(
             name="sample_get_datasets",
-            description="Get datasets associated with a sample. Parameters: identifier (string, sample identifier).",
+            description="Get datasets associated with a sample. Parameters: identifier (string, sample identifier), page (integer, default 1), format (string, 'json' for a JSON reply).",
             func=self._sample_get_datasets_tool
         ))
 
         tools.append(Tool(
             name="sample_get_projects",
-            description="Get projects associated with a sample. Parameters: identifier (string, sample identifier).",
+            description="Get projects associated with a sample. Parameters: identifier (string, sample identifier), page (integer, default 1), format (string, 'json' for a JSON reply).",
             func=self._sample_get_projects_tool
         ))
 
@@ -408,25 +1459,25 @@ class PyBISToolManager:
 
         tools.append(Tool(
             name="sample_mark_to_be_deleted",
-            description="Mark a sample for deletion. Parameters: identifier (string, sample identifier).",
-            func=self._sample_mark_to_be_deleted_tool
+            description="Mark a sample for deletion. The mark is only kept locally until sample_save moves the sample to the openBIS trash. Parameters: identifier (string, sample identifier).",
+            func=functools.partial(self._entity_action_tool, "sample", "mark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="sample_unmark_to_be_deleted",
             description="Unmark a sample for deletion. Parameters: identifier (string, sample identifier).",
-            func=self._sample_unmark_to_be_deleted_tool
+            func=functools.partial(self._entity_action_tool, "sample", "unmark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="sample_save",
-            description="Save changes to a sample. Parameters: identifier (string, sample identifier).",
-            func=self._sample_save_tool
+            description="Save changes to a sample. Parameters: identifier (string, sample identifier), reason (string, used when the sample was marked for deletion).",
+            func=functools.partial(self._entity_action_tool, "sample", "save")
         ))
 
         tools.append(Tool(
             name="sample_set_properties",
-            description="Set properties on a sample. Parameters: identifier (string, sample identifier), properties (dict of property names and values).",
+            description="Set properties on a sample and save them. Parameters: identifier (string, sample identifier), properties (dict of property names and values), save (boolean, default true; false only stages the changes for a later sample_save).",
             func=self._sample_set_properties_tool
         ))
 
@@ -434,15 +1485,21 @@ class PyBISToolManager:
         tools.append(Tool(
             name="dataset_delete",
             description="Delete a dataset. Parameters: identifier (string, dataset permId), reason (string), permanently (boolean, default False).",
-            func=self._dataset_delete_tool
+            func=functools.partial(self._entity_action_tool, "dataset", "delete")
         ))
 
         tools.append(Tool(
             name="dataset_download",
-            description="Download dataset files. Parameters: identifier (string, dataset permId), files (list, optional), destination (string, optional), create_default_folders (boolean, default True), wait_until_finished (boolean, default True).",
+            description="Download dataset files. Parameters: identifier (string, dataset permId), files (list, optional), destination (string, optional), create_default_folders (boolean, default True), wait_until_finished (boolean, default True; false starts the download in the background, check it with dataset_download_status).",
             func=self._dataset_download_tool
         ))
 
+        tools.append(Tool(
+            name="dataset_download_status",
+            description="Check a dataset download started with wait_until_finished=false. Parameters: identifier (string, dataset permId).",
+            func=self._dataset_download_status_tool
+        ))
+
         tools.append(Tool(
             name="dataset_get_file_list",
             description="Get list of files in a dataset. Parameters: identifier (string, dataset permId), recursive (boolean, default True), start_folder (string, default '/').",
@@ -463,25 +1520,25 @@ class PyBISToolManager:
 
         tools.append(Tool(
             name="dataset_mark_to_be_deleted",
-            description="Mark a dataset for deletion. Parameters: identifier (string, dataset permId).",
-            func=self._dataset_mark_to_be_deleted_tool
+            description="Mark a dataset for deletion. The mark is only kept locally until dataset_save moves the dataset to the openBIS trash. Parameters: identifier (string, dataset permId).",
+            func=functools.partial(self._entity_action_tool, "dataset", "mark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="dataset_unmark_to_be_deleted",
             description="Unmark a dataset for deletion. Parameters: identifier (string, dataset permId).",
-            func=self._dataset_unmark_to_be_deleted_tool
+            func=functools.partial(self._entity_action_tool, "dataset", "unmark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="dataset_save",
-            description="Save changes to a dataset. Parameters: identifier (string, dataset permId).",
-            func=self._dataset_save_tool
+            description="Save changes to a dataset. Parameters: identifier (string, dataset permId), reason (string, used when the dataset was marked for deletion).",
+            func=functools.partial(self._entity_action_tool, "dataset", "save")
         ))
 
         tools.append(Tool(
             name="dataset_set_properties",
-            description="Set properties on a dataset. Parameters: identifier (string, dataset permId), properties (dict of property names and values).",
+            description="Set properties on a dataset and save them. Parameters: identifier (string, dataset permId), properties (dict of property names and values), save (boolean, default true; false only stages the changes for a later dataset_save).",
             func=self._dataset_set_properties_tool
         ))
 
@@ -501,36 +1558,36 @@ class PyBISToolManager:
         tools.append(Tool(
             name="experiment_delete",
             description="Delete an experiment. Parameters: identifier (string, experiment identifier), reason (string), permanently (boolean, default False).",
-            func=self._experiment_delete_tool
+            func=functools.partial(self._entity_action_tool, "experiment", "delete")
         ))
 
         tools.append(Tool(
             name="experiment_get_datasets",
-            description="Get datasets associated with an experiment. Parameters: identifier (string, experiment identifier).",
+            description="Get datasets associated with an experiment. Parameters: identifier (string, experiment identifier), page (integer, default 1), format (string, 'json' for a JSON reply).",
             func=self._experiment_get_datasets_tool
         ))
 
         tools.append(Tool(
             name="experiment_get_samples",
-            description="Get samples associated with an experiment. Parameters: identifier (string, experiment identifier).",
+            description="Get samples associated with an experiment. Parameters: identifier (string, experiment identifier), page (integer, default 1), format (string, 'json' for a JSON reply).",
             func=self._experiment_get_samples_tool
         ))
 
         tools.append(Tool(
             name="experiment_get_projects",
-            description="Get projects associated with an experiment. Parameters: identifier (string, experiment identifier).",
+            description="Get projects associated with an experiment. Parameters: identifier (string, experiment identifier), page (integer, default 1), format (string, 'json' for a JSON reply).",
             func=self._experiment_get_projects_tool
         ))
 
         tools.append(Tool(
             name="experiment_add_samples",
-            description="Add samples to an experiment. Parameters: identifier (string, experiment identifier), samples (list of sample identifiers).",
+            description="Add samples to an experiment. Parameters: identifier (string, experiment identifier), samples (space-separated sample identifiers).",
             func=self._experiment_add_samples_tool
         ))
 
         tools.append(Tool(
             name="experiment_del_samples",
-            description="Remove samples from an experiment. Parameters: identifier (string, experiment identifier), samples (list of sample identifiers).",
+            description="Remove samples from an experiment. Parameters: identifier (string, experiment identifier), samples (space-separated sample identifiers).",
             func=self._experiment_del_samples_tool
         ))
 
@@ -542,25 +1599,25 @@ class PyBISToolManager:
 
         tools.append(Tool(
             name="experiment_mark_to_be_deleted",
-            description="Mark an experiment for deletion. Parameters: identifier (string, experiment identifier).",
-            func=self._experiment_mark_to_be_deleted_tool
+            description="Mark an experiment for deletion. The mark is only kept locally until experiment_save moves the experiment to the openBIS trash. Parameters: identifier (string, experiment identifier).",
+            func=functools.partial(self._entity_action_tool, "experiment", "mark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="experiment_unmark_to_be_deleted",
             description="Unmark an experiment for deletion. Parameters: identifier (string, experiment identifier).",
-            func=self._experiment_unmark_to_be_deleted_tool
+            func=functools.partial(self._entity_action_tool, "experiment", "unmark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="experiment_save",
-            description="Save changes to an experiment. Parameters: identifier (string, experiment identifier).",
-            func=self._experiment_save_tool
+            description="Save changes to an experiment. Parameters: identifier (string, experiment identifier), reason (string, used when the experiment was marked for deletion).",
+            func=functools.partial(self._entity_action_tool, "experiment", "save")
         ))
 
         tools.append(Tool(
             name="experiment_set_properties",
-            description="Set properties on an experiment. Parameters: identifier (string, experiment identifier), properties (dict of property names and values).",
+            description="Set properties on an experiment and save them. Parameters: identifier (string, experiment identifier), properties (dict of property names and values), save (boolean, default true; false only stages the changes for a later experiment_save).",
             func=self._experiment_set_properties_tool
         ))
 
@@ -568,27 +1625,33 @@ class PyBISToolManager:
         tools.append(Tool(
             name="project_delete",
             description="Delete a project. Parameters: identifier (string, project identifier), reason (string), permanently (boolean, default False).",
-            func=self._project_delete_tool
+            func=functools.partial(self._entity_action_tool, "project", "delete")
         ))
 
         tools.append(Tool(
             name="project_get_experiments",
-            description="Get experiments in a project. Parameters: identifier (string, project identifier).",
+            description="Get experiments in a project. Parameters: identifier (string, project identifier), page (integer, default 1), format (string, 'json' for a JSON reply). Supports date filtering: 'experiments in February 2024', 'experiments from 2023', etc.",
             func=self._project_get_experiments_tool
         ))
 
         tools.append(Tool(
             name="project_get_datasets",
-            description="Get datasets in a project. Parameters: identifier (string, project identifier).",
+            description="Get datasets in a project. Parameters: identifier (string, project identifier), page (integer, default 1), format (string, 'json' for a JSON reply). Supports date filtering: 'datasets in February 2024', 'datasets from 2023', etc.",
             func=self._project_get_datasets_tool
         ))
 
         tools.append(Tool(
             name="project_get_samples",
-            description="Get samples in a project. Parameters: identifier (string, project identifier).",
+            description="Get samples in a project. Parameters: identifier (string, project identifier), page (integer, default 1), format (string, 'json' for a JSON reply). Supports date filtering: 'samples in February 2024', 'samples from 2023', etc.",
             func=self._project_get_samples_tool
         ))
 
+        tools.append(Tool(
+            name="project_get_contents",
+            description="Get the experiments, samples and datasets in a project in one call. Prefer this over several project_get_* calls when more than one kind is needed. Parameters: identifier (string, project identifier).",
+            func=self._project_get_contents_tool
+        ))
+
         tools.append(Tool(
             name="project_get_sample",
             description="Get a specific sample in a project. Parameters: identifier (string, project identifier), sample_code (string).",
@@ -603,44 +1666,44 @@ class PyBISToolManager:
 
         tools.append(Tool(
             name="project_mark_to_be_deleted",
-            description="Mark a project for deletion. Parameters: identifier (string, project identifier).",
-            func=self._project_mark_to_be_deleted_tool
+            description="Mark a project for deletion. The mark is only kept locally until project_save moves the project to the openBIS trash. Parameters: identifier (string, project identifier).",
+            func=functools.partial(self._entity_action_tool, "project", "mark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="project_unmark_to_be_deleted",
             description="Unmark a project for deletion. Parameters: identifier (string, project identifier).",
-            func=self._project_unmark_to_be_deleted_tool
+            func=functools.partial(self._entity_action_tool, "project", "unmark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="project_save",
-            description="Save changes to a project. Parameters: identifier (string, project identifier).",
-            func=self._project_save_tool
+            description="Save changes to a project. Parameters: identifier (string, project identifier), reason (string, used when the project was marked for deletion).",
+            func=functools.partial(self._entity_action_tool, "project", "save")
         ))
 
         # Space methods
         tools.append(Tool(
             name="space_delete",
             description="Delete a space. Parameters: space_code (string), reason (string), permanently (boolean, default False).",
-            func=self._space_delete_tool
+            func=functools.partial(self._entity_action_tool, "space", "delete")
         ))
 
         tools.append(Tool(
             name="space_get_experiments",
-            description="Get experiments in a space. Parameters: space_code (string).",
+            description="Get experiments in a space. Parameters: space_code (string), page (integer, default 1), format (string, 'json' for a JSON reply). Supports date filtering: 'experiments in February 2024', 'experiments from 2023', etc.",
             func=self._space_get_experiments_tool
         ))
 
         tools.append(Tool(
             name="space_get_samples",
-            description="Get samples in a space. Parameters: space_code (string).",
+            description="Get samples in a space. Parameters: space_code (string), page (integer, default 1), format (string, 'json' for a JSON reply). Supports date filtering: 'samples in February 2024', 'samples from 2023', etc.",
             func=self._space_get_samples_tool
         ))
 
         tools.append(Tool(
             name="space_get_projects",
-            description="Get projects in a space. Parameters: space_code (string).",
+            description="Get projects in a space. Parameters: space_code (string), page (integer, default 1), format (string, 'json' for a JSON reply). Supports date filtering: 'projects in February 2024', 'projects from 2023', etc.",
             func=self._space_get_projects_tool
         ))
 
@@ -652,57 +1715,244 @@ class PyBISToolManager:
 
         tools.append(Tool(
             name="space_mark_to_be_deleted",
-            description="Mark a space for deletion. Parameters: space_code (string).",
-            func=self._space_mark_to_be_deleted_tool
+            description="Mark a space for deletion. The mark is only kept locally until space_save moves the space to the openBIS trash. Parameters: space_code (string).",
+            func=functools.partial(self._entity_action_tool, "space", "mark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="space_unmark_to_be_deleted",
             description="Unmark a space for deletion. Parameters: space_code (string).",
-            func=self._space_unmark_to_be_deleted_tool
+            func=functools.partial(self._entity_action_tool, "space", "unmark_to_be_deleted")
         ))
 
         tools.append(Tool(
             name="space_save",
-            description="Save changes to a space. Parameters: space_code (string).",
-            func=self._space_save_tool
+            description="Save changes to a space. Parameters: space_code (string), reason (string, used when the space was marked for deletion).",
+            func=functools.partial(self._entity_action_tool, "space", "save")
         ))
 
+        # Give read-only tools an async entry point so LangChain's async path
+        # can run parallel tool calls concurrently
+        for tool in tools:
+            if tool.name in READ_ONLY_TOOLS:
+                tool.coroutine = _make_coroutine(tool.func)
+            else:
+                tool.func = self._clearing_entity_cache(tool.func)
+
         return tools
 
+    def _clearing_entity_cache(self, func):
+        """Wrap a tool that modifies openBIS so cached entity results are dropped."""
+        @functools.wraps(func)
+        def wrapper(input_str: str = "") -> str:
+            try:
+                return func(input_str)
+            finally:
+                self.connection.entity_cache.purge(self.connection.server_url, self.connection.username)
+                self.connection.object_cache.clear()
+
+        return wrapper
+
+    def get_entities(self, kind: str, identifiers: List[str]) -> List[Any]:
+        """Fetch several entities of one kind concurrently.
+
+        Args:
+            kind: entity kind from ENTITY_KINDS, e.g. "sample"
+            identifiers: identifiers or permIds to fetch
+
+        Returns:
+            The entities in the order of ``identifiers`` (None where not found)
+        """
+        getter = getattr(self.connection.openbis, ENTITY_KINDS[kind][1])
+        if len(identifiers) <= 1:
+            return [getter(identifier) for identifier in identifiers]
+
+        return list(self._fetch_pool().map(getter, identifiers))
+
+    def _fetch_related(self, kind: str, entity, related: str, offset: int = 0,
+                       date_filters: Optional[Dict[str, Any]] = None) -> Tuple[Any, int]:
+        """Fetch one page of the ``related`` entities of an entity.
+
+        Listings in RELATED_SEARCHES ask the server for just that page, or
+        with a date filter for the entities registered from its start.
+
+        Returns:
+            The entities of the page and the total number of related entities
+        """
+        search = RELATED_SEARCHES.get((kind, related))
+        if search is None:
+            items = getattr(entity, f"get_{related}")() or []
+            if date_filters:
+                return self._page_by_date(items, date_filters, offset)
+            return list(itertools.islice(items, offset, offset + LIST_DISPLAY_LIMIT)), len(items)
+
+        keyword, attr = search
+        fetch = getattr(self.connection.openbis, f"get_{related}")
+        criteria = {keyword: getattr(entity, attr)}
+        if date_filters:
+            # The end of the range cannot be searched for, so every match is
+            # fetched and filtered before the page is cut; pybis has no date
+            # criteria for projects at all
+            if related != "projects":
+                criteria.update(_registration_date_criteria(date_filters))
+            return self._page_by_date(fetch(**criteria), date_filters, offset)
+
+        page = fetch(**criteria, start_with=offset, count=LIST_DISPLAY_LIMIT)
+        total = getattr(page, 'totalCount', None)
+        if not isinstance(total, int):
+            total = offset + len(page)
+        return page, total
+
+    def _page_by_date(self, items, date_filters: Dict[str, Any], offset: int) -> Tuple[Any, int]:
+        """Filter related entities by registration date and cut one page.
+
+        pybis results are filtered and paged on their DataFrame; iterating
+        them would fetch experiments and projects again one request per match.
+
+        Returns:
+            The rows of the page and the number of matching entities
+        """
+        df = getattr(items, 'df', None) if PANDAS_AVAILABLE else None
+        if df is not None and 'registrationDate' in df.columns:
+            df = df[_date_mask(df['registrationDate'].to_numpy(), date_filters)]
+            return df.iloc[offset:offset + LIST_DISPLAY_LIMIT], len(df)
+        items = self._filter_by_date(items, date_filters)
+        return items[offset:offset + LIST_DISPLAY_LIMIT], len(items)
+
+    def _fetch_pool(self) -> ThreadPoolExecutor:
+        """Return the worker pool for concurrent fetches, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS,
+                                                thread_name_prefix="pybis-fetch")
+        return self._executor
+
+    def _fetch_samples(self, identifiers: List[str]) -> Dict[str, Any]:
+        """Fetch samples in one request, keyed by the identifiers asked for.
+
+        Samples already held from a recent detailed listing are not fetched again.
+        """
+        openbis = self.connection.openbis
+        samples = {}
+        missing = []
+        for identifier in identifiers:
+            hit, sample = self.connection.object_cache.get(('sample', identifier.upper()))
+            if hit:
+                samples[identifier] = sample
+            else:
+                missing.append(identifier)
+
+        if len(missing) == 1:
+            samples[missing[0]] = openbis.get_sample(missing[0])
+        elif missing:
+            found = {}
+            for sample in openbis.get_sample(missing):
+                found[str(sample.identifier).upper()] = sample
+                found[str(sample.permId).upper()] = sample
+            for identifier in missing:
+                samples[identifier] = found.get(identifier.upper())
+        return samples
+
+    def _get_entity(self, kind: str, identifier: str):
+        """Fetch one entity, reusing the object fetched by a recent tool call.
+
+        Samples go through the batch loader, so concurrent lookups share one
+        request. The cache is cleared whenever a tool modifies openBIS.
+        """
+        key = (kind, str(identifier).upper())
+        hit, entity = self.connection.object_cache.get(key)
+        if hit:
+            return entity
+        if kind == "sample":
+            entity = self._sample_loader.load(identifier)
+        else:
+            entity = getattr(self.connection.openbis, ENTITY_KINDS[kind][1])(identifier)
+        if entity is not None:
+            self.connection.object_cache.set(key, entity)
+        return entity
+
+    def _get_staged_entity(self, kind: str, identifier: str):
+        """Return the key and entity staged for ``identifier``, or (None, None).
+
+        Staged entities are keyed by permId, so a change staged under the
+        identifier is found again by the permId and the other way round.
+        """
+        wanted = str(identifier).upper()
+        for key, entity in self.connection.staged_entities.items():
+            if key[0] == kind and wanted in (key[1], str(getattr(entity, 'identifier', '')).upper()):
+                return key, entity
+        return None, None
+
+    def _stage_entity(self, kind: str, entity) -> None:
+        """Keep an entity with unsaved changes for the matching *_save tool."""
+        self.connection.staged_entities[(kind, str(entity.permId).upper())] = entity
+
+    def _resolve_samples(self, identifiers: List[str]) -> Tuple[List[Any], str]:
+        """Fetch samples in one request for the experiment sample tools.
+
+        Returns the samples found and a note naming any identifiers that were
+        not, to append to the tool's reply. Repeated identifiers are fetched
+        and passed on once; openBIS codes are case-insensitive.
+        """
+        unique = {}
+        for identifier in identifiers:
+            unique.setdefault(identifier.upper(), identifier)
+        identifiers = list(unique.values())
+
+        found = self._fetch_samples(identifiers)
+        samples = [found[identifier] for identifier in identifiers if found.get(identifier)]
+        missing = [identifier for identifier in identifiers if not found.get(identifier)]
+        if missing:
+            logger.info("Samples not found: %s", missing)
+            return samples, f" (not found: {', '.join(missing)})"
+        return samples, ""
+
+    def _remember_samples(self, samples):
+        """Keep fully loaded sample objects so get_sample can skip the server."""
+        for sample in samples:
+            self.connection.object_cache.set(('sample', str(sample.identifier).upper()), sample)
+            self.connection.object_cache.set(('sample', str(sample.permId).upper()), sample)
+
     def _auto_connect_from_env(self):
-        """Attempt to auto-connect using environment variables."""
+        """Attempt to auto-connect using environment variables.
+
+        A failed attempt is retried on the next tool call, with the
+        environment and .env file read again, since the shared manager of
+        get_available_tools lives as long as the process.
+        """
         if self._auto_connect_attempted:
             return False
 
         self._auto_connect_attempted = True
 
         # Get credentials from environment variables
-        server_url = os.getenv('OPENBIS_URL')
-        username = os.getenv('OPENBIS_USERNAME')
-        password = os.getenv('OPENBIS_PASSWORD')
+        server_url, username, password = _env_credentials()
 
-        if not all([server_url, username, password]):
+        if not (server_url and username and password):
             logger.warning("openBIS credentials not found in environment variables. "
                          "Set OPENBIS_URL, OPENBIS_USERNAME, and OPENBIS_PASSWORD to enable auto-connection.")
-            return False
-
-        logger.info(f"Attempting auto-connection to openBIS at {server_url} as {username}")
-        success = self.connection.connect(server_url, username, password, verify_certificates=True)
-
-        if success:
-            logger.info("Auto-connection to openBIS successful")
+            success = False
         else:
-            logger.error("Auto-connection to openBIS failed")
+            logger.info("Attempting auto-connection to openBIS at %s as %s", server_url, username)
+            success = self.connection.connect(server_url, username, password, verify_certificates=True)
+            if success:
+                logger.info("Auto-connection to openBIS successful")
+            else:
+                logger.error("Auto-connection to openBIS failed")
+
+        if not success:
+            self._auto_connect_attempted = False
+            _load_env.cache_clear()
+            _env_credentials.cache_clear()
 
         return success
 
     def _get_user_space(self):
         """Get the user's space name from the username (uppercase)."""
-        username = os.getenv('OPENBIS_USERNAME')
-        if username:
-            return username.upper()
-        return None
+        if self._user_space is None:
+            username = _env_credentials()[1]
+            if username:
+                self._user_space = username.upper()
+        return self._user_space
 
     def _ensure_connected(self):
         """Ensure we're connected to openBIS, attempting auto-connection if needed."""
@@ -726,7 +1976,7 @@ class PyBISToolManager:
             password = params.get('password')
             verify_certificates = params.get('verify_certificates', True)
 
-            if not all([server_url, username, password]):
+            if not (server_url and username and password):
                 return "Error: Missing required parameters. Need server_url, username, and password."
 
             success = self.connection.connect(server_url, username, password, verify_certificates)
@@ -741,7 +1991,7 @@ class PyBISToolManager:
     def _disconnect_tool(self, input_str: str = "") -> str:
         """Tool function for disconnecting from openBIS."""
         try:
-            self.connection.disconnect()
+            self.disconnect()
             return "Disconnected from openBIS"
         except Exception as e:
             return f"Error disconnecting: {str(e)}"
@@ -755,370 +2005,424 @@ class PyBISToolManager:
 
     # === SPACE MANAGEMENT TOOLS ===
 
-    def _list_spaces_tool(self, input_str: str = "") -> str:
+    @_entity_cached_tool
+    @_openbis_tool("Error listing spaces")
+    def _list_spaces_tool(self, params: Dict[str, Any]) -> str:
         """Tool function for listing spaces."""
-        try:
-            self._ensure_connected()
-
-            spaces = self.connection.openbis.get_spaces()
+        spaces = self.connection.openbis.get_spaces()
 
-            if len(spaces) == 0:
-                return "No spaces found."
+        total = len(spaces)
+        if not total:
+            return "No spaces found."
 
-            result = f"Found {len(spaces)} spaces:\n"
-            for idx, space in enumerate(spaces):
-                result += f"{idx+1}. {space.code}"
-                if hasattr(space, 'description') and space.description:
-                    result += f" - {space.description}"
-                result += "\n"
+        parts = [f"Found {total} spaces:\n"]
+        for idx, space in enumerate(itertools.islice(_to_records(spaces, CODE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            description = _field(space, 'description')
+            parts.append(f"{idx}. {_field(space, 'code')}{f' - {description}' if description else ''}\n")
 
-            return result
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-        except Exception as e:
-            return f"Error listing spaces: {str(e)}"
+        return "".join(parts)
 
-    def _get_space_tool(self, input_str: str) -> str:
+    @_entity_cached_tool
+    @_openbis_tool("Error getting space")
+    def _get_space_tool(self, params: Dict[str, Any]) -> str:
         """Tool function for getting space details."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            space_code = params.get('space_code')
-            if not space_code:
-                return "Error: space_code parameter is required."
+        space_code = params.get('space_code')
+        if not space_code:
+            return "Error: space_code parameter is required."
 
-            space = self.connection.openbis.get_space(space_code)
+        space = self._get_entity("space", space_code)
 
-            if space is None:
-                return f"Space '{space_code}' not found."
+        if space is None:
+            return f"Space '{space_code}' not found."
 
-            # Format space information
-            result = f"Space: {space.code}\n"
-            if hasattr(space, 'description') and space.description:
-                result += f"Description: {space.description}\n"
-            if hasattr(space, 'registrator'):
-                result += f"Registrator: {space.registrator}\n"
-            if hasattr(space, 'registrationDate'):
-                result += f"Registration Date: {space.registrationDate}\n"
-
-            return result
-
-        except Exception as e:
-            return f"Error getting space: {str(e)}"
+        return _format_entity("space", space)
 
-    def _create_space_tool(self, input_str: str) -> str:
+    @_openbis_tool("Error creating space")
+    def _create_space_tool(self, params: Dict[str, Any]) -> str:
         """Tool function for creating a space."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            space_code = params.get('space_code')
-            description = params.get('description', '')
+        space_code = params.get('space_code')
+        description = params.get('description', '')
 
-            if not space_code:
-                return "Error: space_code parameter is required."
+        if not space_code:
+            return "Error: space_code parameter is required."
 
-            # Create space
-            space = self.connection.openbis.new_space(
-                code=space_code,
-                description=description
-            )
-
-            space.save()
+        # Create space
+        space = self.connection.openbis.new_space(
+            code=space_code,
+            description=description
+        )
 
-            return f"Successfully created space: {space.code}"
+        space.save()
 
-        except Exception as e:
-            return f"Error creating space: {str(e)}"
+        return f"Successfully created space: {space.code}"
 
     # === PROJECT MANAGEMENT TOOLS ===
 
-    def _list_projects_tool(self, input_str: str) -> str:
+    @_entity_cached_tool
+    @_openbis_tool("Error listing projects")
+    def _list_projects_tool(self, params: Dict[str, Any]) -> str:
         """Tool function for listing projects."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            # Always use the user's own space unless explicitly specified
-            space = params.get('space')
-            if not space:
-                space = self._get_user_space()
-
-            projects = self.connection.openbis.get_projects(space=space)
+        # Always use the user's own space unless explicitly specified
+        space = params.get('space')
+        if not space:
+            space = self._get_user_space()
+
+        projects = self.connection.openbis.get_projects(space=space)
+
+        # Apply date filtering if specified
+        date_filters = {k: v for k, v in params.items() if k in _DATE_KEYS}
+        if date_filters:
+            projects = self._filter_by_date(projects, date_filters)
+
+        if not projects:
+            filter_desc = _format_date_filter(date_filters)
+            return f"No projects found{filter_desc}{' in space ' + space if space else ''}."
+
+        total_count = len(projects)
+        filter_desc = _format_date_filter(date_filters)
+
+        parts = [f"Found {total_count} projects{filter_desc}{' in space ' + space if space else ''}:\n"]
+        for idx, project in enumerate(projects, 1):
+            parts.append(f"{idx}. {project.identifier}")
+            description = getattr(project, 'description', None)
+            if description:
+                parts.append(f" - {description}")
+            # Add registration date if filtering by date
+            if date_filters and hasattr(project, 'registrationDate'):
+                parts.append(f" (registered: {project.registrationDate})")
+            parts.append("\n")
+
+        return "".join(parts)
+
+    @_entity_cached_tool
+    @_openbis_tool("Error getting project")
+    def _get_project_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting project details."""
+        project_identifier = params.get('project_identifier')
+        if not project_identifier:
+            return "Error: project_identifier parameter is required."
 
-            # Apply date filtering if specified
-            date_filters = {k: v for k, v in params.items() if k in ['year', 'month']}
-            if date_filters:
-                projects = self._filter_by_date(projects, date_filters)
-
-            if len(projects) == 0:
-                filter_desc = ""
-                if date_filters:
-                    if 'month' in date_filters and 'year' in date_filters:
-                        month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June',
-                                     'July', 'August', 'September', 'October', 'November', 'December']
-                        filter_desc = f" from {month_names[date_filters['month']]} {date_filters['year']}"
-                    elif 'year' in date_filters:
-                        filter_desc = f" from {date_filters['year']}"
-                return f"No projects found{filter_desc}{' in space ' + space if space else ''}."
-
-            total_count = len(projects)
-            filter_desc = ""
-            if date_filters:
-                if 'month' in date_filters and 'year' in date_filters:
-                    month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June',
-                                 'July', 'August', 'September', 'October', 'November', 'December']
-                    filter_desc = f" from {month_names[date_filters['month']]} {date_filters['year']}"
-                elif 'year' in date_filters:
-                    filter_desc = f" from {date_filters['year']}"
-
-            result = f"Found {total_count} projects{filter_desc}{' in space ' + space if space else ''}:\n"
-            for idx, project in enumerate(projects):
-                result += f"{idx+1}. {project.identifier}"
-                if hasattr(project, 'description') and project.description:
-                    result += f" - {project.description}"
-                # Add registration date if filtering by date
-                if date_filters and hasattr(project, 'registrationDate'):
-                    result += f" (registered: {project.registrationDate})"
-                result += "\n"
+        project = self._get_entity("project", project_identifier)
 
-            return result
+        if project is None:
+            return f"Project '{project_identifier}' not found."
 
-        except Exception as e:
-            return f"Error listing projects: {str(e)}"
+        return _format_entity("project", project)
 
-    def _get_project_tool(self, input_str: str) -> str:
-        """Tool function for getting project details."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    @_openbis_tool("Error creating project")
+    def _create_project_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for creating a project."""
+        # Always use the user's own space unless explicitly specified
+        space = params.get('space')
+        if not space:
+            space = self._get_user_space()
 
-            project_identifier = params.get('project_identifier')
-            if not project_identifier:
-                return "Error: project_identifier parameter is required."
+        code = params.get('code')
+        description = params.get('description', '')
 
-            project = self.connection.openbis.get_project(project_identifier)
+        if not (space and code):
+            return "Error: space and code parameters are required."
 
-            if project is None:
-                return f"Project '{project_identifier}' not found."
+        # Create project
+        project = self.connection.openbis.new_project(
+            space=space,
+            code=code,
+            description=description
+        )
 
-            # Format project information
-            result = f"Project: {project.identifier}\n"
-            result += f"Code: {project.code}\n"
-            result += f"Space: {project.space}\n"
-            if hasattr(project, 'description') and project.description:
-                result += f"Description: {project.description}\n"
-            if hasattr(project, 'registrator'):
-                result += f"Registrator: {project.registrator}\n"
-            if hasattr(project, 'registrationDate'):
-                result += f"Registration Date: {project.registrationDate}\n"
+        project.save()
 
-            return result
+        return f"Successfully created project: {project.identifier}"
 
-        except Exception as e:
-            return f"Error getting project: {str(e)}"
+    # === EXPERIMENT MANAGEMENT TOOLS ===
 
-    def _create_project_tool(self, input_str: str) -> str:
-        """Tool function for creating a project."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    @_entity_cached_tool
+    @_openbis_tool("Error listing experiments")
+    def _list_experiments_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing experiments."""
+        # Always use the user's own space unless explicitly specified
+        space = params.get('space')
+        if not space:
+            space = self._get_user_space()
+
+        project = params.get('project')
+        experiment_type = params.get('experiment_type')
+        limit = params.get('limit')  # No default limit
+
+        date_filters = {k: v for k, v in params.items() if k in _DATE_KEYS}
+
+        # Get experiments
+        experiments = self.connection.openbis.get_experiments(
+            space=space,
+            project=project,
+            type=experiment_type,
+            **_registration_date_criteria(date_filters)
+        )
+
+        experiments_list = _to_records(experiments, EXPERIMENT_LIST_COLUMNS)
+
+        # Apply date filtering if specified
+        if date_filters:
+            experiments_list = self._filter_by_date(experiments_list, date_filters)
+
+        if not experiments_list:
+            filter_desc = _format_date_filter(date_filters)
+            return f"No experiments found{filter_desc} matching the criteria."
+
+        total_count = len(experiments_list)
+        experiments_to_show = experiments_list
+
+        # Apply limit only if explicitly requested
+        if limit is not None:
+            limit = int(limit)
+            if limit > 0:
+                # Sort by registration date (most recent first) when limiting
+                experiments_to_show = heapq.nlargest(limit, experiments_list,
+                                                     key=_registration_date_key)
+
+        # Format response
+        if limit is not None and limit > 0:
+            # When limiting, show the count of displayed items and include dates
+            displayed_count = len(experiments_to_show)
+            parts = [f"Showing {displayed_count} most recent experiments (out of {total_count} total):\n"]
+
+            for idx, experiment in enumerate(experiments_to_show, 1):
+                reg_date = _field(experiment, 'registrationDate', 'N/A')
+                parts.append(f"{idx}. {_field(experiment, 'identifier', 'N/A')} ({_field(experiment, 'type', 'N/A')}) - {reg_date}\n")
+        else:
+            # When showing all, just show the total count
+            parts = [f"Found {total_count} experiments:\n"]
 
-            # Always use the user's own space unless explicitly specified
-            space = params.get('space')
-            if not space:
-                space = self._get_user_space()
+            for idx, experiment in enumerate(experiments_to_show, 1):
+                parts.append(f"{idx}. {_field(experiment, 'identifier', 'N/A')} ({_field(experiment, 'type', 'N/A')})\n")
 
-            code = params.get('code')
-            description = params.get('description', '')
+        return "".join(parts)
 
-            if not all([space, code]):
-                return "Error: space and code parameters are required."
+    @_entity_cached_tool
+    @_openbis_tool("Error getting experiment")
+    def _get_experiment_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting experiment details."""
+        experiment_identifier = params.get('experiment_identifier')
+        if not experiment_identifier:
+            return "Error: experiment_identifier parameter is required."
 
-            # Create project
-            project = self.connection.openbis.new_project(
-                space=space,
-                code=code,
-                description=description
-            )
+        experiment = self._get_entity("experiment", experiment_identifier)
 
-            project.save()
+        if experiment is None:
+            return f"Experiment '{experiment_identifier}' not found."
 
-            return f"Successfully created project: {project.identifier}"
+        return _format_entity("experiment", experiment)
 
-        except Exception as e:
-            return f"Error creating project: {str(e)}"
+    @_openbis_tool("Error creating experiment")
+    def _create_experiment_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for creating an experiment."""
+        experiment_type = params.get('experiment_type')
+        project = params.get('project')
+        code = params.get('code')
+        properties = params.get('properties', {})
 
-    # === EXPERIMENT MANAGEMENT TOOLS ===
+        if not (experiment_type and project and code):
+            return "Error: experiment_type, project, and code parameters are required."
 
-    def _list_experiments_tool(self, input_str: str) -> str:
-        """Tool function for listing experiments."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        # Create experiment
+        experiment = self.connection.openbis.new_experiment(
+            type=experiment_type,
+            project=project,
+            code=code,
+            props=properties
+        )
 
-            # Always use the user's own space unless explicitly specified
-            space = params.get('space')
-            if not space:
-                space = self._get_user_space()
+        experiment.save()
 
-            project = params.get('project')
-            experiment_type = params.get('experiment_type')
-            limit = params.get('limit')  # No default limit
+        return f"Successfully created experiment: {experiment.identifier}"
 
-            # Get experiments
-            experiments = self.connection.openbis.get_experiments(
-                space=space,
-                project=project,
-                type=experiment_type
-            )
+    # === SAMPLE MANAGEMENT TOOLS ===
 
-            # Apply date filtering if specified
-            date_filters = {k: v for k, v in params.items() if k in ['year', 'month']}
-            if date_filters:
-                experiments = self._filter_by_date(experiments, date_filters)
-
-            if len(experiments) == 0:
-                filter_desc = ""
-                if date_filters:
-                    if 'month' in date_filters and 'year' in date_filters:
-                        month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June',
-                                     'July', 'August', 'September', 'October', 'November', 'December']
-                        filter_desc = f" from {month_names[date_filters['month']]} {date_filters['year']}"
-                    elif 'year' in date_filters:
-                        filter_desc = f" from {date_filters['year']}"
-                return f"No experiments found{filter_desc} matching the criteria."
-
-            total_count = len(experiments)
-            experiments_to_show = experiments
-
-            # Apply limit only if explicitly requested
-            if limit is not None:
-                limit = int(limit)
-                if limit > 0:
-                    # Sort by registration date (most recent first) when limiting
-                    if hasattr(experiments, 'df'):
-                        experiments_df = experiments.df.sort_values('registrationDate', ascending=False)
-                        experiments_to_show = experiments_df.head(limit)
-                    else:
-                        experiments_to_show = sorted(experiments,
-                                                   key=lambda x: getattr(x, 'registrationDate', ''),
-                                                   reverse=True)[:limit]
-
-            # Format response
-            if limit is not None and limit > 0:
-                # When limiting, show the count of displayed items and include dates
-                displayed_count = len(experiments_to_show) if hasattr(experiments_to_show, '__len__') else limit
-                result = f"Showing {displayed_count} most recent experiments (out of {total_count} total):\n"
-
-                if hasattr(experiments_to_show, 'iterrows'):
-                    for idx, (_, experiment_data) in enumerate(experiments_to_show.iterrows()):
-                        reg_date = experiment_data.get('registrationDate', 'N/A')
-                        result += f"{idx+1}. {experiment_data.get('identifier', 'N/A')} ({experiment_data.get('type', 'N/A')}) - {reg_date}\n"
-                else:
-                    for idx, experiment in enumerate(experiments_to_show):
-                        reg_date = getattr(experiment, 'registrationDate', 'N/A')
-                        result += f"{idx+1}. {experiment.identifier} ({experiment.type}) - {reg_date}\n"
+    @_entity_cached_tool
+    @_openbis_tool("Error listing samples")
+    def _list_samples_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing samples."""
+        sample_type = params.get('sample_type')
+        # Always use the user's own space unless explicitly specified
+        space = params.get('space')
+        if not space:
+            space = self._get_user_space()
+
+        project = params.get('project')
+        experiment = params.get('experiment')
+        limit = params.get('limit')  # No default limit
+
+        date_filters = {k: v for k, v in params.items() if k in _DATE_KEYS}
+
+        # Get samples
+        samples = self.connection.openbis.get_samples(
+            type=sample_type,
+            space=space,
+            project=project,
+            experiment=experiment,
+            **_registration_date_criteria(date_filters)
+        )
+
+        samples_list = _to_records(samples, SAMPLE_LIST_COLUMNS)
+
+        # Apply date filtering if specified
+        if date_filters:
+            samples_list = self._filter_by_date(samples_list, date_filters)
+
+        if not samples_list:
+            filter_desc = _format_date_filter(date_filters)
+            return f"No samples found{filter_desc} matching the criteria."
+
+        total_count = len(samples_list)
+        samples_to_show = samples_list
+
+        # Apply limit only if explicitly requested
+        if limit is not None:
+            limit = int(limit)
+            if limit > 0:
+                # Sort by registration date (most recent first) when limiting
+                samples_to_show = heapq.nlargest(limit, samples_list,
+                                                 key=_registration_date_key)
+
+        # Check if dates should be shown
+        show_dates = params.get('show_dates', False) or date_filters or (limit is not None and limit > 0)
+
+        # Format response
+        if limit is not None and limit > 0:
+            # When limiting, show the count of displayed items and include dates
+            displayed_count = len(samples_to_show)
+            parts = [f"Showing {displayed_count} most recent samples (out of {total_count} total):\n"]
+
+            for idx, sample in enumerate(samples_to_show, 1):
+                reg_date = _field(sample, 'registrationDate', 'N/A')
+                parts.append(f"{idx}. {_field(sample, 'identifier')} ({_field(sample, 'type')}) - {reg_date}\n")
+        else:
+            # When showing all, show dates if requested or if date filtering was applied
+            if show_dates:
+                parts = [f"Found {total_count} samples with registration dates:\n"]
+                for idx, sample in enumerate(samples_to_show, 1):
+                    reg_date = _field(sample, 'registrationDate', 'N/A')
+                    parts.append(f"{idx}. {_field(sample, 'identifier')} ({_field(sample, 'type')}) - {reg_date}\n")
             else:
-                # When showing all, just show the total count
-                result = f"Found {total_count} experiments:\n"
-
-                if hasattr(experiments_to_show, 'iterrows'):
-                    for idx, (_, experiment_data) in enumerate(experiments_to_show.iterrows()):
-                        result += f"{idx+1}. {experiment_data.get('identifier', 'N/A')} ({experiment_data.get('type', 'N/A')})\n"
-                else:
-                    for idx, experiment in enumerate(experiments_to_show):
-                        result += f"{idx+1}. {experiment.identifier} ({experiment.type})\n"
-
-            return result
+                parts = [f"Found {total_count} samples:\n"]
+                for idx, sample in enumerate(samples_to_show, 1):
+                    parts.append(f"{idx}. {_field(sample, 'identifier')} ({_field(sample, 'type')})\n")
 
-        except Exception as e:
-            return f"Error listing experiments: {str(e)}"
+        return "".join(parts)
 
-    def _get_experiment_tool(self, input_str: str) -> str:
-        """Tool function for getting experiment details."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    @_entity_cached_tool
+    @_openbis_tool("Error getting sample")
+    def _get_sample_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting sample details."""
+        sample_identifier = params.get('sample_identifier')
+        if not sample_identifier:
+            return "Error: sample_identifier parameter is required."
 
-            experiment_identifier = params.get('experiment_identifier')
-            if not experiment_identifier:
-                return "Error: experiment_identifier parameter is required."
+        sample = self._get_entity("sample", sample_identifier)
 
-            experiment = self.connection.openbis.get_experiment(experiment_identifier)
+        if sample is None:
+            return f"Sample '{sample_identifier}' not found."
 
-            if experiment is None:
-                return f"Experiment '{experiment_identifier}' not found."
+        return _format_entity("sample", sample)
 
-            # Format experiment information
-            result = f"Experiment: {experiment.identifier}\n"
-            result += f"Type: {experiment.type}\n"
-            result += f"Project: {experiment.project}\n"
+    @_openbis_tool("Error creating sample")
+    def _create_sample_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for creating a sample."""
+        sample_type = params.get('sample_type')
+        # Always use the user's own space unless explicitly specified
+        space = params.get('space')
+        if not space:
+            space = self._get_user_space()
 
-            if hasattr(experiment, 'properties') and experiment.properties:
-                result += "Properties:\n"
-                for key, value in experiment.properties.items():
-                    result += f"  {key}: {value}\n"
+        code = params.get('code')
+        properties = params.get('properties', {})
 
-            return result
+        if not (sample_type and space and code):
+            return "Error: sample_type, space, and code parameters are required."
 
-        except Exception as e:
-            return f"Error getting experiment: {str(e)}"
+        # Create sample
+        sample = self.connection.openbis.new_sample(
+            type=sample_type,
+            space=space,
+            code=code,
+            props=properties
+        )
 
-    def _create_experiment_tool(self, input_str: str) -> str:
-        """Tool function for creating an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        sample.save()
 
-            experiment_type = params.get('experiment_type')
-            project = params.get('project')
-            code = params.get('code')
-            properties = params.get('properties', {})
+        return f"Successfully created sample: {sample.identifier}"
 
-            if not all([experiment_type, project, code]):
-                return "Error: experiment_type, project, and code parameters are required."
+    @_openbis_tool("Error updating sample")
+    def _update_sample_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for updating a sample."""
+        sample_identifier = params.get('sample_identifier')
+        properties = params.get('properties', {})
 
-            # Create experiment
-            experiment = self.connection.openbis.new_experiment(
-                type=experiment_type,
-                project=project,
-                code=code,
-                props=properties
-            )
+        if not sample_identifier:
+            return "Error: sample_identifier parameter is required."
 
-            experiment.save()
+        # Get existing sample
+        sample = self._get_entity("sample", sample_identifier)
 
-            return f"Successfully created experiment: {experiment.identifier}"
+        if sample is None:
+            return f"Sample '{sample_identifier}' not found."
 
-        except Exception as e:
-            return f"Error creating experiment: {str(e)}"
+        # Update properties
+        for key, value in properties.items():
+            sample.props[key] = value
 
-    # === SAMPLE MANAGEMENT TOOLS ===
+        sample.save()
 
-    def _list_samples_tool(self, input_str: str) -> str:
-        """Tool function for listing samples."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        return f"Successfully updated sample: {sample.identifier}"
 
-            sample_type = params.get('sample_type')
-            # Always use the user's own space unless explicitly specified
-            space = params.get('space')
-            if not space:
-                space = self._get_user_space()
-
-            project = params.get('project')
-            experiment = params.get('experiment')
-            limit = params.get('limit')  # No default limit
-
-            # Get samples
-            samples = self.connection.openbis.get_samples(
-                type=sample_type,
-                space=space,
-                project=project,
-                experiment=experiment
-            )
+    @_entity_cached_tool
+    @_openbis_tool("Error listing samples with details")
+    def _list_samples_detailed_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing samples with detailed information."""
+        sample_type = params.get('sample_type')
+        # Always use the user's own space unless explicitly specified
+        space = params.get('space')
+        if not space:
+            space = self._get_user_space()
+
+        project = params.get('project')
+        experiment = params.get('experiment')
+        limit = params.get('limit')  # No default limit - show all unless user specifies
+        show_properties = params.get('show_properties', True)
+        fields = params.get('fields')
+
+        # Only ask pybis for the properties that will actually be shown:
+        # none when properties are hidden, the requested codes when given,
+        # otherwise all of them
+        if not show_properties:
+            props = None
+        elif fields:
+            props = str(fields).upper().split()
+        else:
+            props = "*"
+
+        date_filters = {k: v for k, v in params.items() if k in _DATE_KEYS}
+
+        fetch = functools.partial(
+            self.connection.openbis.get_samples,
+            type=sample_type,
+            space=space,
+            project=project,
+            experiment=experiment,
+            props=props,
+            **_registration_date_criteria(date_filters)
+        )
+
+        # Without a date filter only the first rows are shown, so only
+        # those are fetched from the server
+        total_count = None
+        if limit and limit > 0 and not date_filters:
+            samples_list, total_count = self._fetch_paged(fetch, int(limit))
+        else:
+            samples = fetch()
 
             # Convert to list if it's not already
             if hasattr(samples, '__iter__') and not isinstance(samples, list):
@@ -1126,2220 +2430,1025 @@ class PyBISToolManager:
             else:
                 samples_list = samples
 
-            # Apply date filtering if specified
-            date_filters = {k: v for k, v in params.items() if k in ['year', 'month']}
-            if date_filters:
-                samples_list = self._filter_by_date(samples_list, date_filters)
-
-            if len(samples_list) == 0:
-                filter_desc = ""
-                if date_filters:
-                    if 'month' in date_filters and 'year' in date_filters:
-                        month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June',
-                                     'July', 'August', 'September', 'October', 'November', 'December']
-                        filter_desc = f" from {month_names[date_filters['month']]} {date_filters['year']}"
-                    elif 'year' in date_filters:
-                        filter_desc = f" from {date_filters['year']}"
-                return f"No samples found{filter_desc} matching the criteria."
+        # With all properties loaded, these can answer follow-up get_sample calls
+        if props == "*":
+            self._remember_samples(samples_list)
+
+        # Apply date filtering if specified
+        if date_filters:
+            samples_list = self._filter_by_date(samples_list, date_filters)
 
+        if not samples_list:
+            filter_desc = _format_date_filter(date_filters)
+            return f"No samples found{filter_desc} matching the criteria."
+
+        if total_count is None:
             total_count = len(samples_list)
-            samples_to_show = samples_list
 
-            # Apply limit only if explicitly requested
-            if limit is not None:
-                limit = int(limit)
-                if limit > 0:
-                    # Sort by registration date (most recent first) when limiting
-                    samples_to_show = sorted(samples_list,
-                                           key=lambda x: getattr(x, 'registrationDate', ''),
-                                           reverse=True)[:limit]
-
-            # Check if dates should be shown
-            show_dates = params.get('show_dates', False) or date_filters or (limit is not None and limit > 0)
-
-            # Format response
-            if limit is not None and limit > 0:
-                # When limiting, show the count of displayed items and include dates
-                displayed_count = len(samples_to_show)
-                result = f"Showing {displayed_count} most recent samples (out of {total_count} total):\n"
-
-                for idx, sample in enumerate(samples_to_show):
-                    reg_date = getattr(sample, 'registrationDate', 'N/A')
-                    result += f"{idx+1}. {sample.identifier} ({sample.type}) - {reg_date}\n"
-            else:
-                # When showing all, show dates if requested or if date filtering was applied
-                if show_dates:
-                    result = f"Found {total_count} samples with registration dates:\n"
-                    for idx, sample in enumerate(samples_to_show):
-                        reg_date = getattr(sample, 'registrationDate', 'N/A')
-                        result += f"{idx+1}. {sample.identifier} ({sample.type}) - {reg_date}\n"
+        # Apply limit only if explicitly specified by user
+        if limit and limit > 0:
+            samples_to_show = samples_list[:int(limit)]
+            parts = [f"Found {total_count} samples (showing {len(samples_to_show)} with details):\n\n"]
+        else:
+            samples_to_show = samples_list
+            parts = [f"Found {total_count} samples with details:\n\n"]
+
+        for idx, sample in enumerate(samples_to_show, 1):
+            parts.append(f"{idx}. Sample: {sample.identifier}\n")
+            parts.append(f"   Type: {sample.type}\n")
+            parts.append(f"   Space: {sample.space}\n")
+
+            # Add registration date if available
+            registration_date = getattr(sample, 'registrationDate', None)
+            if registration_date:
+                parts.append(f"   Registration Date: {registration_date}\n")
+
+            # Add registrator if available
+            registrator = getattr(sample, 'registrator', None)
+            if registrator:
+                parts.append(f"   Registrator: {registrator}\n")
+
+            # Add properties if requested and available
+            if show_properties:
+                # Try different ways to access properties based on pybis documentation
+                properties = None
+                if getattr(sample, 'props', None):
+                    # Use .props attribute (recommended by pybis docs)
+                    try:
+                        properties = sample.props.all() if hasattr(sample.props, 'all') else sample.props
+                    except OPENBIS_ERRORS:
+                        properties = None
+                elif getattr(sample, 'p', None):
+                    # Use .p attribute (alternative in pybis docs)
+                    try:
+                        properties = sample.p() if callable(sample.p) else sample.p
+                    except OPENBIS_ERRORS:
+                        properties = None
+                elif getattr(sample, 'properties', None):
+                    # Fallback to .properties
+                    properties = sample.properties
+
+                if properties and isinstance(properties, dict) and len(properties) > 0:
+                    parts.append("   Properties: ")
+                    # Only show property names, not values (cleaner output)
+                    prop_names = [key for key in properties.keys() if properties[key] is not None and str(properties[key]).strip()]
+                    if isinstance(props, list):
+                        prop_names = [key for key in prop_names if key.upper() in props]
+                    if prop_names:
+                        parts.append(", ".join(prop_names) + "\n")
+                    else:
+                        parts.append("None\n")
                 else:
-                    result = f"Found {total_count} samples:\n"
-                    for idx, sample in enumerate(samples_to_show):
-                        result += f"{idx+1}. {sample.identifier} ({sample.type})\n"
+                    parts.append("   Properties: None\n")
 
-            return result
-
-        except Exception as e:
-            return f"Error listing samples: {str(e)}"
+            parts.append("\n")  # Add spacing between samples
 
-    def _get_sample_tool(self, input_str: str) -> str:
-        """Tool function for getting sample details."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        return "".join(parts)
 
-            sample_identifier = params.get('sample_identifier')
-            if not sample_identifier:
-                return "Error: sample_identifier parameter is required."
+    @_entity_cached_tool
+    @_openbis_tool("Error listing datasets")
+    def _list_datasets_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing datasets."""
+        dataset_type = params.get('dataset_type')
+        limit = params.get('limit', 50)  # Don't convert to int yet
+        fetch = functools.partial(self.connection.openbis.get_datasets, type=dataset_type)
 
-            sample = self.connection.openbis.get_sample(sample_identifier)
+        # Only fetch as many datasets as will be shown
+        if limit and int(limit) > 0:
+            datasets_to_show, total_count = self._fetch_paged(fetch, int(limit))
+        else:
+            # Walk all datasets page by page so only one page of dataset
+            # objects is held at a time
+            datasets_to_show = self._iter_paged(fetch)
+            total_count = None
 
-            if sample is None:
-                return f"Sample '{sample_identifier}' not found."
+        lines = [_format_dataset_row(number, dataset) for number, dataset in enumerate(datasets_to_show, 1)]
 
-            # Format sample information
-            result = f"Sample: {sample.identifier}\n"
-            result += f"Type: {sample.type}\n"
-            result += f"Space: {sample.space}\n"
+        if not lines:
+            return "No datasets found matching the criteria."
 
-            if hasattr(sample, 'properties') and sample.properties:
-                result += "Properties:\n"
-                for key, value in sample.properties.items():
-                    result += f"  {key}: {value}\n"
+        # Format response
+        if total_count is not None and total_count > len(lines):
+            header = f"Found {total_count} datasets (showing first {len(lines)}):\n"
+        else:
+            header = f"Found {len(lines)} datasets:\n"
+        return header + "".join(lines)
 
-            return result
+    @_entity_cached_tool
+    @_openbis_tool("Error getting dataset")
+    def _get_dataset_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting dataset details."""
+        dataset_identifier = params.get('dataset_identifier')
+        if not dataset_identifier:
+            return "Error: dataset_identifier parameter is required."
 
-        except Exception as e:
-            return f"Error getting sample: {str(e)}"
+        dataset = self._get_entity("dataset", dataset_identifier)
 
-    def _create_sample_tool(self, input_str: str) -> str:
-        """Tool function for creating a sample."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        if dataset is None:
+            return f"Dataset '{dataset_identifier}' not found."
 
-            sample_type = params.get('sample_type')
-            # Always use the user's own space unless explicitly specified
-            space = params.get('space')
-            if not space:
-                space = self._get_user_space()
+        return _format_entity("dataset", dataset)
 
-            code = params.get('code')
-            properties = params.get('properties', {})
+    @_openbis_tool("Error creating dataset")
+    def _create_dataset_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for creating a dataset."""
+        dataset_type = params.get('dataset_type')
+        sample = params.get('sample')
+        experiment = params.get('experiment')
+        files = params.get('files', [])
+        properties = params.get('properties', {})
 
-            if not all([sample_type, space, code]):
-                return "Error: sample_type, space, and code parameters are required."
+        if not dataset_type:
+            return "Error: dataset_type parameter is required."
 
-            # Create sample
-            sample = self.connection.openbis.new_sample(
-                type=sample_type,
-                space=space,
-                code=code,
-                props=properties
-            )
+        # Create dataset
+        dataset = self.connection.openbis.new_dataset(
+            type=dataset_type,
+            sample=sample,
+            experiment=experiment,
+            files=files,
+            props=properties
+        )
 
-            sample.save()
+        dataset.save()
 
-            return f"Successfully created sample: {sample.identifier}"
+        # Include the details so the agent does not need a get_dataset call
+        return f"Successfully created dataset: {dataset.code}\n{_format_entity('dataset', dataset)}"
 
-        except Exception as e:
-            return f"Error creating sample: {str(e)}"
+    # === MASTERDATA MANAGEMENT TOOLS ===
 
-    def _update_sample_tool(self, input_str: str) -> str:
-        """Tool function for updating a sample."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    @_cached_tool
+    @_openbis_tool("Error listing sample types")
+    def _list_sample_types_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing sample types."""
+        sample_types = self.connection.openbis.get_sample_types()
 
-            sample_identifier = params.get('sample_identifier')
-            properties = params.get('properties', {})
+        total = len(sample_types)
+        if not total:
+            return "No sample types found."
 
-            if not sample_identifier:
-                return "Error: sample_identifier parameter is required."
+        parts = [f"Found {total} sample types:\n"]
+        for idx, sample_type in enumerate(itertools.islice(_to_records(sample_types, CODE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            description = _field(sample_type, 'description')
+            parts.append(f"{idx}. {_field(sample_type, 'code')}{f' - {description}' if description else ''}\n")
 
-            # Get existing sample
-            sample = self.connection.openbis.get_sample(sample_identifier)
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            if sample is None:
-                return f"Sample '{sample_identifier}' not found."
+        return "".join(parts)
 
-            # Update properties
-            for key, value in properties.items():
-                sample.props[key] = value
+    @_cached_tool
+    @_openbis_tool("Error getting sample type")
+    def _get_sample_type_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting sample type details."""
+        sample_type_code = params.get('sample_type_code')
+        if not sample_type_code:
+            return "Error: sample_type_code parameter is required."
 
-            sample.save()
+        sample_type = self.connection.openbis.get_sample_type(sample_type_code)
 
-            return f"Successfully updated sample: {sample.identifier}"
+        if sample_type is None:
+            return f"Sample type '{sample_type_code}' not found."
 
-        except Exception as e:
-            return f"Error updating sample: {str(e)}"
+        # Format sample type information
+        parts = [f"Sample Type: {sample_type.code}\n"]
+        _append_fields(parts, sample_type, SAMPLE_TYPE_FIELDS, keep_falsy=True)
 
-    def _list_samples_detailed_tool(self, input_str: str) -> str:
-        """Tool function for listing samples with detailed information."""
+        # Get property assignments
         try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+            property_assignments = sample_type.get_property_assignments()
+            if property_assignments:
+                parts.append("Properties:\n")
+                for prop in property_assignments:
+                    parts.append(f"  - {prop.propertyType}\n")
+        except OPENBIS_ERRORS:
+            pass
 
-            sample_type = params.get('sample_type')
-            # Always use the user's own space unless explicitly specified
-            space = params.get('space')
-            if not space:
-                space = self._get_user_space()
-
-            project = params.get('project')
-            experiment = params.get('experiment')
-            limit = params.get('limit')  # No default limit - show all unless user specifies
-            show_properties = params.get('show_properties', True)
-
-            # Get samples - include properties in the request
-            samples = self.connection.openbis.get_samples(
-                type=sample_type,
-                space=space,
-                project=project,
-                experiment=experiment,
-                props="*"  # Get all properties
-            )
+        return "".join(parts)
 
-            # Convert to list if it's not already
-            if hasattr(samples, '__iter__') and not isinstance(samples, list):
-                samples_list = list(samples)
-            else:
-                samples_list = samples
+    @_cached_tool
+    @_openbis_tool("Error listing experiment types")
+    def _list_experiment_types_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing experiment types."""
+        experiment_types = self.connection.openbis.get_experiment_types()
 
-            # Apply date filtering if specified
-            date_filters = {k: v for k, v in params.items() if k in ['year', 'month']}
-            if date_filters:
-                samples_list = self._filter_by_date(samples_list, date_filters)
-
-            if len(samples_list) == 0:
-                filter_desc = ""
-                if date_filters:
-                    if 'month' in date_filters and 'year' in date_filters:
-                        month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June',
-                                     'July', 'August', 'September', 'October', 'November', 'December']
-                        filter_desc = f" from {month_names[date_filters['month']]} {date_filters['year']}"
-                    elif 'year' in date_filters:
-                        filter_desc = f" from {date_filters['year']}"
-                return f"No samples found{filter_desc} matching the criteria."
+        total = len(experiment_types)
+        if not total:
+            return "No experiment types found."
 
-            total_count = len(samples_list)
+        parts = [f"Found {total} experiment types:\n"]
+        for idx, experiment_type in enumerate(itertools.islice(_to_records(experiment_types, CODE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            description = _field(experiment_type, 'description')
+            parts.append(f"{idx}. {_field(experiment_type, 'code')}{f' - {description}' if description else ''}\n")
 
-            # Apply limit only if explicitly specified by user
-            if limit and limit > 0:
-                samples_to_show = samples_list[:int(limit)]
-                result = f"Found {total_count} samples (showing {len(samples_to_show)} with details):\n\n"
-            else:
-                samples_to_show = samples_list
-                result = f"Found {total_count} samples with details:\n\n"
-
-            for idx, sample in enumerate(samples_to_show):
-                result += f"{idx+1}. Sample: {sample.identifier}\n"
-                result += f"   Type: {sample.type}\n"
-                result += f"   Space: {sample.space}\n"
-
-                # Add registration date if available
-                if hasattr(sample, 'registrationDate') and sample.registrationDate:
-                    result += f"   Registration Date: {sample.registrationDate}\n"
-
-                # Add registrator if available
-                if hasattr(sample, 'registrator') and sample.registrator:
-                    result += f"   Registrator: {sample.registrator}\n"
-
-                # Add properties if requested and available
-                if show_properties:
-                    # Try different ways to access properties based on pybis documentation
-                    properties = None
-                    if hasattr(sample, 'props') and sample.props:
-                        # Use .props attribute (recommended by pybis docs)
-                        try:
-                            properties = sample.props.all() if hasattr(sample.props, 'all') else sample.props
-                        except Exception:
-                            properties = None
-                    elif hasattr(sample, 'p') and sample.p:
-                        # Use .p attribute (alternative in pybis docs)
-                        try:
-                            properties = sample.p() if callable(sample.p) else sample.p
-                        except Exception:
-                            properties = None
-                    elif hasattr(sample, 'properties') and sample.properties:
-                        # Fallback to .properties
-                        properties = sample.properties
-
-                    if properties and isinstance(properties, dict) and len(properties) > 0:
-                        result += "   Properties: "
-                        # Only show property names, not values (cleaner output)
-                        prop_names = [key for key in properties.keys() if properties[key] is not None and str(properties[key]).strip()]
-                        if prop_names:
-                            result += ", ".join(prop_names) + "\n"
-                        else:
-                            result += "None\n"
-                    else:
-                        result += "   Properties: None\n"
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-                result += "\n"  # Add spacing between samples
+        return "".join(parts)
 
-            return result
+    @_cached_tool
+    @_openbis_tool("Error listing dataset types")
+    def _list_dataset_types_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing dataset types."""
+        dataset_types = self.connection.openbis.get_dataset_types()
 
-        except Exception as e:
-            return f"Error listing samples with details: {str(e)}"
+        total = len(dataset_types)
+        if not total:
+            return "No dataset types found."
 
-    def _list_datasets_tool(self, input_str: str) -> str:
-        """Tool function for listing datasets."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        parts = [f"Found {total} dataset types:\n"]
+        for idx, dataset_type in enumerate(itertools.islice(_to_records(dataset_types, CODE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            description = _field(dataset_type, 'description')
+            parts.append(f"{idx}. {_field(dataset_type, 'code')}{f' - {description}' if description else ''}\n")
 
-            dataset_type = params.get('dataset_type')
-            limit = params.get('limit', 50)  # Don't convert to int yet
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            # Get datasets
-            datasets = self.connection.openbis.get_datasets(type=dataset_type)
+        return "".join(parts)
 
-            # Convert to list if it's not already
-            if hasattr(datasets, '__iter__') and not isinstance(datasets, list):
-                datasets_list = list(datasets)
-            else:
-                datasets_list = datasets
+    @_cached_tool
+    @_openbis_tool("Error listing property types")
+    def _list_property_types_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing property types."""
+        property_types = self.connection.openbis.get_property_types()
 
-            if len(datasets_list) == 0:
-                return "No datasets found matching the criteria."
+        total = len(property_types)
+        if not total:
+            return "No property types found."
 
-            # Apply limit
-            if limit and limit > 0:
-                limit_int = int(limit)
-                datasets_to_show = datasets_list[:limit_int]
-            else:
-                datasets_to_show = datasets_list
-
-            # Format response
-            result = f"Found {len(datasets_to_show)} datasets:\n"
-            for idx, dataset in enumerate(datasets_to_show):
-                # Try to get the best identifier available
-                identifier = "N/A"
-                if hasattr(dataset, 'permId') and dataset.permId:
-                    identifier = dataset.permId
-                elif hasattr(dataset, 'code') and dataset.code:
-                    identifier = dataset.code
-                elif hasattr(dataset, 'identifier') and dataset.identifier:
-                    identifier = dataset.identifier
-
-                # Get dataset type
-                dataset_type_str = "UNKNOWN"
-                if hasattr(dataset, 'type') and dataset.type:
-                    dataset_type_str = dataset.type
-
-                # Get what the dataset is attached to (clean format)
-                # Use internal attributes to avoid lazy loading that causes hangs
-                attached_to = ""
-                try:
-                    # Check internal attributes first to avoid lazy loading
-                    if hasattr(dataset, '_sample') and dataset._sample:
-                        # Use the internal sample reference to avoid API call
-                        sample_identifier = dataset._sample.get('identifier', '')
-                        if sample_identifier:
-                            sample_name = sample_identifier.split('/')[-1]  # Get just the name part
-                            attached_to = f" → Sample: {sample_name}"
-                    elif hasattr(dataset, '_experiment') and dataset._experiment:
-                        # Use the internal experiment reference to avoid API call
-                        exp_identifier = dataset._experiment.get('identifier', '')
-                        if exp_identifier:
-                            exp_name = exp_identifier.split('/')[-1]  # Get just the name part
-                            attached_to = f" → Experiment: {exp_name}"
-                    elif hasattr(dataset, '_project') and dataset._project:
-                        # Use the internal project reference to avoid API call
-                        proj_identifier = dataset._project.get('identifier', '')
-                        if proj_identifier:
-                            proj_name = proj_identifier.split('/')[-1]  # Get just the name part
-                            attached_to = f" → Project: {proj_name}"
-
-                    # Fallback: try to get attachment info from dataset attributes without lazy loading
-                    if not attached_to:
-                        # Check if dataset has any reference attributes we can use
-                        if hasattr(dataset, 'attrs') and hasattr(dataset.attrs, 'all'):
-                            attrs = dataset.attrs.all()
-                            if 'sample' in attrs and attrs['sample']:
-                                sample_id = str(attrs['sample']).split('/')[-1]
-                                attached_to = f" → Sample: {sample_id}"
-                            elif 'experiment' in attrs and attrs['experiment']:
-                                exp_id = str(attrs['experiment']).split('/')[-1]
-                                attached_to = f" → Experiment: {exp_id}"
-                            elif 'project' in attrs and attrs['project']:
-                                proj_id = str(attrs['project']).split('/')[-1]
-                                attached_to = f" → Project: {proj_id}"
-
-                except Exception as e:
-                    # If anything fails, just don't show attachment info
-                    logger.debug(f"Could not get dataset attachment info: {e}")
-                    attached_to = ""
-
-                result += f"{idx+1}. {identifier} ({dataset_type_str}){attached_to}\n"
+        parts = [f"Found {total} property types:\n"]
+        for idx, property_type in enumerate(itertools.islice(_to_records(property_types, PROPERTY_TYPE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            description = _field(property_type, 'description')
+            parts.append(f"{idx}. {_field(property_type, 'code')} ({_field(property_type, 'dataType')}){f' - {description}' if description else ''}\n")
 
-            return result
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-        except Exception as e:
-            return f"Error listing datasets: {str(e)}"
+        return "".join(parts)
 
-    def _get_dataset_tool(self, input_str: str) -> str:
-        """Tool function for getting dataset details."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    @_cached_tool
+    @_openbis_tool("Error listing vocabularies")
+    def _list_vocabularies_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing vocabularies."""
+        vocabularies = self.connection.openbis.get_vocabularies()
 
-            dataset_identifier = params.get('dataset_identifier')
-            if not dataset_identifier:
-                return "Error: dataset_identifier parameter is required."
+        total = len(vocabularies)
+        if not total:
+            return "No vocabularies found."
 
-            dataset = self.connection.openbis.get_dataset(dataset_identifier)
+        parts = [f"Found {total} vocabularies:\n"]
+        for idx, vocabulary in enumerate(itertools.islice(_to_records(vocabularies, CODE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            description = _field(vocabulary, 'description')
+            parts.append(f"{idx}. {_field(vocabulary, 'code')}{f' - {description}' if description else ''}\n")
 
-            if dataset is None:
-                return f"Dataset '{dataset_identifier}' not found."
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            # Format dataset information
-            result = f"Dataset: {dataset.code}\n"
-            result += f"Type: {dataset.type}\n"
+        return "".join(parts)
 
-            if hasattr(dataset, 'properties') and dataset.properties:
-                result += "Properties:\n"
-                for key, value in dataset.properties.items():
-                    result += f"  {key}: {value}\n"
+    @_cached_tool
+    @_openbis_tool("Error getting vocabulary")
+    def _get_vocabulary_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting vocabulary details."""
+        vocabulary_code = params.get('vocabulary_code')
+        if not vocabulary_code:
+            return "Error: vocabulary_code parameter is required."
+
+        vocabulary = self.connection.openbis.get_vocabulary(vocabulary_code)
+
+        if vocabulary is None:
+            return f"Vocabulary '{vocabulary_code}' not found."
+
+        # Format vocabulary information
+        parts = [f"Vocabulary: {vocabulary.code}\n"]
+        _append_fields(parts, vocabulary, VOCABULARY_FIELDS)
+
+        # Get terms
+        try:
+            terms = vocabulary.get_terms()
+            if terms:
+                parts.append(f"Terms ({len(terms)}):\n")
+                for idx, (term_code, term) in enumerate(terms.items(), 1):
+                    parts.append(f"  {idx}. {term_code}")
+                    label = getattr(term, 'label', None)
+                    if label:
+                        parts.append(f" - {label}")
+                    parts.append("\n")
+                    if idx >= 10:  # Limit display to first 10 terms
+                        parts.append("  ... (showing first 10 terms)\n")
+                        break
+        except OPENBIS_ERRORS:
+            pass
+
+        return "".join(parts)
 
-            return result
+    # === ADDITIONAL PYBIS TOOL IMPLEMENTATIONS ===
 
-        except Exception as e:
-            return f"Error getting dataset: {str(e)}"
+    # Session-level Openbis methods
+    @_openbis_tool("Error getting server information")
+    def _openbis_get_server_information_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting server information."""
+        info = self.connection.openbis.get_server_information()
+        logger.info("Retrieved server information")
 
-    def _create_dataset_tool(self, input_str: str) -> str:
-        """Tool function for creating a dataset."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        parts = ["Server Information:\n"]
+        major_version = getattr(info, 'major_version', None)
+        if major_version is not None:
+            parts.append(f"Version: {major_version}.{info.minor_version}\n")
+        _append_fields(parts, info, SERVER_INFO_FIELDS, keep_falsy=True)
 
-            dataset_type = params.get('dataset_type')
-            sample = params.get('sample')
-            experiment = params.get('experiment')
-            files = params.get('files', [])
-            properties = params.get('properties', {})
-
-            if not dataset_type:
-                return "Error: dataset_type parameter is required."
-
-            # Create dataset
-            dataset = self.connection.openbis.new_dataset(
-                type=dataset_type,
-                sample=sample,
-                experiment=experiment,
-                files=files,
-                props=properties
-            )
+        return "".join(parts)
 
-            dataset.save()
+    @_openbis_tool("Error getting session information")
+    def _openbis_get_session_info_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting session information."""
+        info = self.connection.openbis.get_session_info()
+        logger.info("Retrieved session information")
 
-            return f"Successfully created dataset: {dataset.code}"
+        parts = ["Session Information:\n"]
+        _append_fields(parts, info, (("User", "userName"),), keep_falsy=True)
+        session_token = getattr(info, 'sessionToken', None)
+        if session_token is not None:
+            parts.append(f"Session Token: {session_token!s:.20}...\n")
+        _append_fields(parts, info, (("Home Group", "homeGroupCode"),), keep_falsy=True)
 
-        except Exception as e:
-            return f"Error creating dataset: {str(e)}"
+        return "".join(parts)
 
-    # === MASTERDATA MANAGEMENT TOOLS ===
+    @_openbis_tool("Error checking session status")
+    def _openbis_is_session_active_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for checking if session is active."""
+        is_active = self.connection.is_session_active()
+        logger.info("Session active status: %s", is_active)
+        return f"Session is {'active' if is_active else 'not active'}"
 
-    def _list_sample_types_tool(self, input_str: str = "") -> str:
-        """Tool function for listing sample types."""
-        try:
-            self._ensure_connected()
-
-            sample_types = self.connection.openbis.get_sample_types()
-
-            if len(sample_types) == 0:
-                return "No sample types found."
-
-            result = f"Found {len(sample_types)} sample types:\n"
-            for idx, sample_type in enumerate(sample_types):
-                result += f"{idx+1}. {sample_type.code}"
-                if hasattr(sample_type, 'description') and sample_type.description:
-                    result += f" - {sample_type.description}"
-                result += "\n"
-
-            return result
-
-        except Exception as e:
-            return f"Error listing sample types: {str(e)}"
-
-    def _get_sample_type_tool(self, input_str: str) -> str:
-        """Tool function for getting sample type details."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            sample_type_code = params.get('sample_type_code')
-            if not sample_type_code:
-                return "Error: sample_type_code parameter is required."
-
-            sample_type = self.connection.openbis.get_sample_type(sample_type_code)
-
-            if sample_type is None:
-                return f"Sample type '{sample_type_code}' not found."
-
-            # Format sample type information
-            result = f"Sample Type: {sample_type.code}\n"
-            if hasattr(sample_type, 'description') and sample_type.description:
-                result += f"Description: {sample_type.description}\n"
-            if hasattr(sample_type, 'generatedCodePrefix'):
-                result += f"Generated Code Prefix: {sample_type.generatedCodePrefix}\n"
-            if hasattr(sample_type, 'autoGeneratedCode'):
-                result += f"Auto Generated Code: {sample_type.autoGeneratedCode}\n"
-
-            # Get property assignments
-            try:
-                property_assignments = sample_type.get_property_assignments()
-                if property_assignments:
-                    result += "Properties:\n"
-                    for prop in property_assignments:
-                        result += f"  - {prop.propertyType}\n"
-            except Exception:
-                pass
-
-            return result
-
-        except Exception as e:
-            return f"Error getting sample type: {str(e)}"
-
-    def _list_experiment_types_tool(self, input_str: str = "") -> str:
-        """Tool function for listing experiment types."""
-        try:
-            self._ensure_connected()
-
-            experiment_types = self.connection.openbis.get_experiment_types()
-
-            if len(experiment_types) == 0:
-                return "No experiment types found."
-
-            result = f"Found {len(experiment_types)} experiment types:\n"
-            for idx, experiment_type in enumerate(experiment_types):
-                result += f"{idx+1}. {experiment_type.code}"
-                if hasattr(experiment_type, 'description') and experiment_type.description:
-                    result += f" - {experiment_type.description}"
-                result += "\n"
-
-            return result
-
-        except Exception as e:
-            return f"Error listing experiment types: {str(e)}"
-
-    def _list_dataset_types_tool(self, input_str: str = "") -> str:
-        """Tool function for listing dataset types."""
-        try:
-            self._ensure_connected()
-
-            dataset_types = self.connection.openbis.get_dataset_types()
-
-            if len(dataset_types) == 0:
-                return "No dataset types found."
-
-            result = f"Found {len(dataset_types)} dataset types:\n"
-            for idx, dataset_type in enumerate(dataset_types):
-                result += f"{idx+1}. {dataset_type.code}"
-                if hasattr(dataset_type, 'description') and dataset_type.description:
-                    result += f" - {dataset_type.description}"
-                result += "\n"
-
-            return result
-
-        except Exception as e:
-            return f"Error listing dataset types: {str(e)}"
-
-    def _list_property_types_tool(self, input_str: str = "") -> str:
-        """Tool function for listing property types."""
-        try:
-            self._ensure_connected()
-
-            property_types = self.connection.openbis.get_property_types()
-
-            if len(property_types) == 0:
-                return "No property types found."
-
-            result = f"Found {len(property_types)} property types:\n"
-            for idx, property_type in enumerate(property_types):
-                result += f"{idx+1}. {property_type.code} ({property_type.dataType})"
-                if hasattr(property_type, 'description') and property_type.description:
-                    result += f" - {property_type.description}"
-                result += "\n"
-                if idx >= 19:  # Limit display to first 20
-                    result += "... (showing first 20 results)\n"
-                    break
-
-            return result
-
-        except Exception as e:
-            return f"Error listing property types: {str(e)}"
-
-    def _list_vocabularies_tool(self, input_str: str = "") -> str:
-        """Tool function for listing vocabularies."""
-        try:
-            self._ensure_connected()
-
-            vocabularies = self.connection.openbis.get_vocabularies()
-
-            if len(vocabularies) == 0:
-                return "No vocabularies found."
-
-            result = f"Found {len(vocabularies)} vocabularies:\n"
-            for idx, vocabulary in enumerate(vocabularies):
-                result += f"{idx+1}. {vocabulary.code}"
-                if hasattr(vocabulary, 'description') and vocabulary.description:
-                    result += f" - {vocabulary.description}"
-                result += "\n"
-
-            return result
-
-        except Exception as e:
-            return f"Error listing vocabularies: {str(e)}"
-
-    def _get_vocabulary_tool(self, input_str: str) -> str:
-        """Tool function for getting vocabulary details."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            vocabulary_code = params.get('vocabulary_code')
-            if not vocabulary_code:
-                return "Error: vocabulary_code parameter is required."
-
-            vocabulary = self.connection.openbis.get_vocabulary(vocabulary_code)
-
-            if vocabulary is None:
-                return f"Vocabulary '{vocabulary_code}' not found."
-
-            # Format vocabulary information
-            result = f"Vocabulary: {vocabulary.code}\n"
-            if hasattr(vocabulary, 'description') and vocabulary.description:
-                result += f"Description: {vocabulary.description}\n"
-
-            # Get terms
-            try:
-                terms = vocabulary.get_terms()
-                if terms:
-                    result += f"Terms ({len(terms)}):\n"
-                    for idx, (term_code, term) in enumerate(terms.items()):
-                        result += f"  {idx+1}. {term_code}"
-                        if hasattr(term, 'label') and term.label:
-                            result += f" - {term.label}"
-                        result += "\n"
-                        if idx >= 9:  # Limit display to first 10 terms
-                            result += "  ... (showing first 10 terms)\n"
-                            break
-            except Exception:
-                pass
-
-            return result
-
-        except Exception as e:
-            return f"Error getting vocabulary: {str(e)}"
-
-    # === ADDITIONAL PYBIS TOOL IMPLEMENTATIONS ===
-
-    # Session-level Openbis methods
-    def _openbis_get_server_information_tool(self, input_str: str = "") -> str:
-        """Tool function for getting server information."""
-        try:
-            self._ensure_connected()
-            info = self.connection.openbis.get_server_information()
-            logger.info("Retrieved server information")
-
-            result = "Server Information:\n"
-            if hasattr(info, 'major_version'):
-                result += f"Version: {info.major_version}.{info.minor_version}\n"
-            if hasattr(info, 'api_version'):
-                result += f"API Version: {info.api_version}\n"
-            if hasattr(info, 'project_samples_enabled'):
-                result += f"Project Samples Enabled: {info.project_samples_enabled}\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting server information: {str(e)}"
-
-    def _openbis_get_session_info_tool(self, input_str: str = "") -> str:
-        """Tool function for getting session information."""
-        try:
-            self._ensure_connected()
-            info = self.connection.openbis.get_session_info()
-            logger.info("Retrieved session information")
-
-            result = "Session Information:\n"
-            if hasattr(info, 'userName'):
-                result += f"User: {info.userName}\n"
-            if hasattr(info, 'sessionToken'):
-                result += f"Session Token: {info.sessionToken[:20]}...\n"
-            if hasattr(info, 'homeGroupCode'):
-                result += f"Home Group: {info.homeGroupCode}\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting session information: {str(e)}"
-
-    def _openbis_is_session_active_tool(self, input_str: str = "") -> str:
-        """Tool function for checking if session is active."""
-        try:
-            self._ensure_connected()
-            is_active = self.connection.openbis.is_session_active()
-            logger.info(f"Session active status: {is_active}")
-            return f"Session is {'active' if is_active else 'not active'}"
-        except Exception as e:
-            return f"Error checking session status: {str(e)}"
-
-    def _openbis_create_permid_tool(self, input_str: str = "") -> str:
-        """Tool function for creating a new permanent ID."""
-        try:
-            self._ensure_connected()
-            perm_id = self.connection.openbis.create_permId()
-            logger.info(f"Created new permId: {perm_id}")
-            return f"Generated new permanent ID: {perm_id}"
-        except Exception as e:
-            return f"Error creating permanent ID: {str(e)}"
-
-    def _openbis_get_datastores_tool(self, input_str: str = "") -> str:
-        """Tool function for getting all data stores."""
-        try:
-            self._ensure_connected()
-            datastores = self.connection.openbis.get_datastores()
-            logger.info(f"Retrieved {len(datastores)} data stores")
-
-            if len(datastores) == 0:
-                return "No data stores found."
-
-            result = f"Found {len(datastores)} data stores:\n"
-            for idx, ds in enumerate(datastores):
-                result += f"{idx+1}. {ds.code}"
-                if hasattr(ds, 'label') and ds.label:
-                    result += f" - {ds.label}"
-                if hasattr(ds, 'downloadUrl') and ds.downloadUrl:
-                    result += f" ({ds.downloadUrl})"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting data stores: {str(e)}"
-
-    def _openbis_get_plugins_tool(self, input_str: str) -> str:
-        """Tool function for getting plugins."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            plugin_type = params.get('plugin_type')
-            plugins = self.connection.openbis.get_plugins(plugin_type=plugin_type)
-            logger.info(f"Retrieved {len(plugins)} plugins")
-
-            if len(plugins) == 0:
-                return "No plugins found."
-
-            result = f"Found {len(plugins)} plugins:\n"
-            for idx, plugin in enumerate(plugins):
-                result += f"{idx+1}. {plugin.name}"
-                if hasattr(plugin, 'pluginType'):
-                    result += f" ({plugin.pluginType})"
-                if hasattr(plugin, 'description') and plugin.description:
-                    result += f" - {plugin.description}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting plugins: {str(e)}"
-
-    def _openbis_get_plugin_tool(self, input_str: str) -> str:
-        """Tool function for getting a specific plugin."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            plugin_name = params.get('plugin_name')
-            if not plugin_name:
-                return "Error: plugin_name parameter is required."
-
-            plugin = self.connection.openbis.get_plugin(plugin_name)
-            logger.info(f"Retrieved plugin: {plugin_name}")
-
-            if plugin is None:
-                return f"Plugin '{plugin_name}' not found."
-
-            result = f"Plugin: {plugin.name}\n"
-            if hasattr(plugin, 'pluginType'):
-                result += f"Type: {plugin.pluginType}\n"
-            if hasattr(plugin, 'description') and plugin.description:
-                result += f"Description: {plugin.description}\n"
-            if hasattr(plugin, 'script') and plugin.script:
-                result += f"Script: {plugin.script[:100]}...\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting plugin: {str(e)}"
-
-    def _openbis_get_external_data_management_systems_tool(self, input_str: str = "") -> str:
-        """Tool function for getting external data management systems."""
-        try:
-            self._ensure_connected()
-            systems = self.connection.openbis.get_external_data_management_systems()
-            logger.info(f"Retrieved {len(systems)} external DMS")
-
-            if len(systems) == 0:
-                return "No external data management systems found."
-
-            result = f"Found {len(systems)} external data management systems:\n"
-            for idx, system in enumerate(systems):
-                result += f"{idx+1}. {system.code}"
-                if hasattr(system, 'label') and system.label:
-                    result += f" - {system.label}"
-                if hasattr(system, 'address') and system.address:
-                    result += f" ({system.address})"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting external data management systems: {str(e)}"
-
-    def _openbis_get_external_data_management_system_tool(self, input_str: str) -> str:
-        """Tool function for getting a specific external DMS."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            dms_id = params.get('dms_id')
-            if not dms_id:
-                return "Error: dms_id parameter is required."
-
-            system = self.connection.openbis.get_external_data_management_system(dms_id)
-            logger.info(f"Retrieved external DMS: {dms_id}")
-
-            if system is None:
-                return f"External DMS '{dms_id}' not found."
-
-            result = f"External DMS: {system.code}\n"
-            if hasattr(system, 'label') and system.label:
-                result += f"Label: {system.label}\n"
-            if hasattr(system, 'address') and system.address:
-                result += f"Address: {system.address}\n"
-            if hasattr(system, 'addressType') and system.addressType:
-                result += f"Address Type: {system.addressType}\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting external DMS: {str(e)}"
-
-    def _openbis_get_persons_tool(self, input_str: str = "") -> str:
-        """Tool function for getting all persons."""
-        try:
-            self._ensure_connected()
-            persons = self.connection.openbis.get_persons()
-            logger.info(f"Retrieved {len(persons)} persons")
-
-            if len(persons) == 0:
-                return "No persons found."
-
-            result = f"Found {len(persons)} persons:\n"
-            for idx, person in enumerate(persons):
-                result += f"{idx+1}. {person.userId}"
-                if hasattr(person, 'firstName') and person.firstName:
-                    result += f" ({person.firstName}"
-                    if hasattr(person, 'lastName') and person.lastName:
-                        result += f" {person.lastName}"
-                    result += ")"
-                if hasattr(person, 'email') and person.email:
-                    result += f" - {person.email}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting persons: {str(e)}"
-
-    def _openbis_get_person_tool(self, input_str: str) -> str:
-        """Tool function for getting a specific person."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            person_id = params.get('person_id')
-            if not person_id:
-                return "Error: person_id parameter is required."
-
-            person = self.connection.openbis.get_person(person_id)
-            logger.info(f"Retrieved person: {person_id}")
-
-            if person is None:
-                return f"Person '{person_id}' not found."
-
-            result = f"Person: {person.userId}\n"
-            if hasattr(person, 'firstName') and person.firstName:
-                result += f"First Name: {person.firstName}\n"
-            if hasattr(person, 'lastName') and person.lastName:
-                result += f"Last Name: {person.lastName}\n"
-            if hasattr(person, 'email') and person.email:
-                result += f"Email: {person.email}\n"
-            if hasattr(person, 'space') and person.space:
-                result += f"Space: {person.space}\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting person: {str(e)}"
-
-    def _openbis_get_groups_tool(self, input_str: str = "") -> str:
-        """Tool function for getting all groups."""
-        try:
-            self._ensure_connected()
-            groups = self.connection.openbis.get_groups()
-            logger.info(f"Retrieved {len(groups)} groups")
-
-            if len(groups) == 0:
-                return "No groups found."
-
-            result = f"Found {len(groups)} groups:\n"
-            for idx, group in enumerate(groups):
-                result += f"{idx+1}. {group.code}"
-                if hasattr(group, 'description') and group.description:
-                    result += f" - {group.description}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting groups: {str(e)}"
-
-    def _openbis_get_group_tool(self, input_str: str) -> str:
-        """Tool function for getting a specific group."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            group_code = params.get('group_code')
-            if not group_code:
-                return "Error: group_code parameter is required."
-
-            group = self.connection.openbis.get_group(group_code)
-            logger.info(f"Retrieved group: {group_code}")
-
-            if group is None:
-                return f"Group '{group_code}' not found."
-
-            result = f"Group: {group.code}\n"
-            if hasattr(group, 'description') and group.description:
-                result += f"Description: {group.description}\n"
-            if hasattr(group, 'registrator') and group.registrator:
-                result += f"Registrator: {group.registrator}\n"
-            if hasattr(group, 'registrationDate') and group.registrationDate:
-                result += f"Registration Date: {group.registrationDate}\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting group: {str(e)}"
-
-    def _openbis_get_role_assignments_tool(self, input_str: str) -> str:
-        """Tool function for getting role assignments."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            person = params.get('person')
-            group = params.get('group')
-            space = params.get('space')
-            project = params.get('project')
-
-            role_assignments = self.connection.openbis.get_role_assignments(
-                person=person, group=group, space=space, project=project
-            )
-            logger.info(f"Retrieved {len(role_assignments)} role assignments")
-
-            if len(role_assignments) == 0:
-                return "No role assignments found."
-
-            result = f"Found {len(role_assignments)} role assignments:\n"
-            for idx, assignment in enumerate(role_assignments):
-                result += f"{idx+1}. Role: {assignment.role}"
-                if hasattr(assignment, 'user') and assignment.user:
-                    result += f", User: {assignment.user}"
-                if hasattr(assignment, 'authorizationGroup') and assignment.authorizationGroup:
-                    result += f", Group: {assignment.authorizationGroup}"
-                if hasattr(assignment, 'space') and assignment.space:
-                    result += f", Space: {assignment.space}"
-                if hasattr(assignment, 'project') and assignment.project:
-                    result += f", Project: {assignment.project}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting role assignments: {str(e)}"
-
-    def _openbis_get_tags_tool(self, input_str: str = "") -> str:
-        """Tool function for getting all tags."""
-        try:
-            self._ensure_connected()
-            tags = self.connection.openbis.get_tags()
-            logger.info(f"Retrieved {len(tags)} tags")
-
-            if len(tags) == 0:
-                return "No tags found."
-
-            result = f"Found {len(tags)} tags:\n"
-            for idx, tag in enumerate(tags):
-                result += f"{idx+1}. {tag.code}"
-                if hasattr(tag, 'description') and tag.description:
-                    result += f" - {tag.description}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting tags: {str(e)}"
-
-    def _openbis_get_tag_tool(self, input_str: str) -> str:
-        """Tool function for getting a specific tag."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            tag_code = params.get('tag_code')
-            if not tag_code:
-                return "Error: tag_code parameter is required."
-
-            tag = self.connection.openbis.get_tag(tag_code)
-            logger.info(f"Retrieved tag: {tag_code}")
-
-            if tag is None:
-                return f"Tag '{tag_code}' not found."
-
-            result = f"Tag: {tag.code}\n"
-            if hasattr(tag, 'description') and tag.description:
-                result += f"Description: {tag.description}\n"
-            if hasattr(tag, 'owner') and tag.owner:
-                result += f"Owner: {tag.owner}\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting tag: {str(e)}"
-
-    # === ENTITY-SPECIFIC METHODS ===
-
-    # Sample methods
-    def _sample_delete_tool(self, input_str: str) -> str:
-        """Tool function for deleting a sample."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            reason = params.get('reason', 'Deleted via chatBIS')
-            permanently = params.get('permanently', False)
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            sample = self.connection.openbis.get_sample(identifier)
-            if sample is None:
-                return f"Sample '{identifier}' not found."
-
-            sample.delete(reason=reason, permanently=permanently)
-            logger.info(f"Deleted sample: {identifier}")
-            return f"Successfully deleted sample: {identifier}"
-        except Exception as e:
-            return f"Error deleting sample: {str(e)}"
-
-    def _sample_get_datasets_tool(self, input_str: str) -> str:
-        """Tool function for getting datasets associated with a sample."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            sample = self.connection.openbis.get_sample(identifier)
-            if sample is None:
-                return f"Sample '{identifier}' not found."
-
-            datasets = sample.get_datasets()
-            logger.info(f"Retrieved {len(datasets)} datasets for sample: {identifier}")
-
-            if len(datasets) == 0:
-                return f"No datasets found for sample '{identifier}'."
-
-            result = f"Found {len(datasets)} datasets for sample '{identifier}':\n"
-            for idx, dataset in enumerate(datasets):
-                if hasattr(dataset, 'code'):
-                    result += f"{idx+1}. {dataset.code}"
-                elif hasattr(dataset, 'permId'):
-                    result += f"{idx+1}. {dataset.permId}"
-                else:
-                    result += f"{idx+1}. {str(dataset)}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting datasets for sample: {str(e)}"
-
-    def _sample_get_projects_tool(self, input_str: str) -> str:
-        """Tool function for getting projects associated with a sample."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            sample = self.connection.openbis.get_sample(identifier)
-            if sample is None:
-                return f"Sample '{identifier}' not found."
-
-            projects = sample.get_projects()
-            logger.info(f"Retrieved {len(projects)} projects for sample: {identifier}")
-
-            if len(projects) == 0:
-                return f"No projects found for sample '{identifier}'."
-
-            result = f"Found {len(projects)} projects for sample '{identifier}':\n"
-            for idx, project in enumerate(projects):
-                if hasattr(project, 'identifier'):
-                    result += f"{idx+1}. {project.identifier}"
-                else:
-                    result += f"{idx+1}. {str(project)}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting projects for sample: {str(e)}"
-
-    def _sample_is_marked_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for checking if a sample is marked for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            sample = self.connection.openbis.get_sample(identifier)
-            if sample is None:
-                return f"Sample '{identifier}' not found."
-
-            is_marked = sample.is_marked_to_be_deleted()
-            logger.info(f"Sample {identifier} deletion status: {is_marked}")
-            return f"Sample '{identifier}' is {'marked' if is_marked else 'not marked'} for deletion."
-        except Exception as e:
-            return f"Error checking sample deletion status: {str(e)}"
-
-    def _sample_mark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for marking a sample for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            sample = self.connection.openbis.get_sample(identifier)
-            if sample is None:
-                return f"Sample '{identifier}' not found."
-
-            sample.mark_to_be_deleted()
-            logger.info(f"Marked sample for deletion: {identifier}")
-            return f"Successfully marked sample '{identifier}' for deletion."
-        except Exception as e:
-            return f"Error marking sample for deletion: {str(e)}"
-
-    def _sample_unmark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for unmarking a sample for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            sample = self.connection.openbis.get_sample(identifier)
-            if sample is None:
-                return f"Sample '{identifier}' not found."
-
-            sample.unmark_to_be_deleted()
-            logger.info(f"Unmarked sample for deletion: {identifier}")
-            return f"Successfully unmarked sample '{identifier}' for deletion."
-        except Exception as e:
-            return f"Error unmarking sample for deletion: {str(e)}"
-
-    def _sample_save_tool(self, input_str: str) -> str:
-        """Tool function for saving changes to a sample."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            sample = self.connection.openbis.get_sample(identifier)
-            if sample is None:
-                return f"Sample '{identifier}' not found."
-
-            sample.save()
-            logger.info(f"Saved sample: {identifier}")
-            return f"Successfully saved sample: {identifier}"
-        except Exception as e:
-            return f"Error saving sample: {str(e)}"
-
-    def _sample_set_properties_tool(self, input_str: str) -> str:
-        """Tool function for setting properties on a sample."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            properties = params.get('properties', {})
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            sample = self.connection.openbis.get_sample(identifier)
-            if sample is None:
-                return f"Sample '{identifier}' not found."
-
-            sample.set_properties(properties)
-            logger.info(f"Set properties on sample: {identifier}")
-            return f"Successfully set properties on sample: {identifier}"
-        except Exception as e:
-            return f"Error setting sample properties: {str(e)}"
-
-    # Dataset methods
-    def _dataset_delete_tool(self, input_str: str) -> str:
-        """Tool function for deleting a dataset."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            reason = params.get('reason', 'Deleted via chatBIS')
-            permanently = params.get('permanently', False)
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            dataset.delete(reason=reason, permanently=permanently)
-            logger.info(f"Deleted dataset: {identifier}")
-            return f"Successfully deleted dataset: {identifier}"
-        except Exception as e:
-            return f"Error deleting dataset: {str(e)}"
-
-    def _dataset_download_tool(self, input_str: str) -> str:
-        """Tool function for downloading dataset files."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            files = params.get('files')
-            destination = params.get('destination')
-            create_default_folders = params.get('create_default_folders', True)
-            wait_until_finished = params.get('wait_until_finished', True)
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            dataset.download(
-                files=files,
-                destination=destination,
-                create_default_folders=create_default_folders,
-                wait_until_finished=wait_until_finished
-            )
-            logger.info(f"Downloaded dataset: {identifier}")
-            return f"Successfully downloaded dataset: {identifier}"
-        except Exception as e:
-            return f"Error downloading dataset: {str(e)}"
-
-    def _dataset_get_file_list_tool(self, input_str: str) -> str:
-        """Tool function for getting file list from a dataset."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            recursive = params.get('recursive', True)
-            start_folder = params.get('start_folder', '/')
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            file_list = dataset.get_file_list(recursive=recursive, start_folder=start_folder)
-            logger.info(f"Retrieved file list for dataset: {identifier}")
-
-            if len(file_list) == 0:
-                return f"No files found in dataset '{identifier}'."
-
-            result = f"Found {len(file_list)} files in dataset '{identifier}':\n"
-            for idx, file_path in enumerate(file_list):
-                result += f"{idx+1}. {file_path}\n"
-                if idx >= 19:  # Limit display to first 20 files
-                    result += "... (showing first 20 files)\n"
-                    break
-
-            return result
-        except Exception as e:
-            return f"Error getting file list: {str(e)}"
-
-    def _dataset_get_files_tool(self, input_str: str) -> str:
-        """Tool function for getting files DataFrame from a dataset."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            start_folder = params.get('start_folder', '/')
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            files_df = dataset.get_files(start_folder=start_folder)
-            logger.info(f"Retrieved files DataFrame for dataset: {identifier}")
-
-            if len(files_df) == 0:
-                return f"No files found in dataset '{identifier}'."
-
-            result = f"Found {len(files_df)} files in dataset '{identifier}':\n"
-            for idx, (_, file_info) in enumerate(files_df.iterrows()):
-                result += f"{idx+1}. {file_info.get('path', 'N/A')}"
-                if 'size' in file_info:
-                    result += f" ({file_info['size']} bytes)"
-                result += "\n"
-                if idx >= 19:  # Limit display to first 20 files
-                    result += "... (showing first 20 files)\n"
-                    break
-
-            return result
-        except Exception as e:
-            return f"Error getting files: {str(e)}"
-
-    def _dataset_is_marked_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for checking if a dataset is marked for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            is_marked = dataset.is_marked_to_be_deleted()
-            logger.info(f"Dataset {identifier} deletion status: {is_marked}")
-            return f"Dataset '{identifier}' is {'marked' if is_marked else 'not marked'} for deletion."
-        except Exception as e:
-            return f"Error checking dataset deletion status: {str(e)}"
-
-    def _dataset_mark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for marking a dataset for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            dataset.mark_to_be_deleted()
-            logger.info(f"Marked dataset for deletion: {identifier}")
-            return f"Successfully marked dataset '{identifier}' for deletion."
-        except Exception as e:
-            return f"Error marking dataset for deletion: {str(e)}"
-
-    def _dataset_unmark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for unmarking a dataset for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            dataset.unmark_to_be_deleted()
-            logger.info(f"Unmarked dataset for deletion: {identifier}")
-            return f"Successfully unmarked dataset '{identifier}' for deletion."
-        except Exception as e:
-            return f"Error unmarking dataset for deletion: {str(e)}"
-
-    def _dataset_save_tool(self, input_str: str) -> str:
-        """Tool function for saving changes to a dataset."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            dataset.save()
-            logger.info(f"Saved dataset: {identifier}")
-            return f"Successfully saved dataset: {identifier}"
-        except Exception as e:
-            return f"Error saving dataset: {str(e)}"
-
-    def _dataset_set_properties_tool(self, input_str: str) -> str:
-        """Tool function for setting properties on a dataset."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            properties = params.get('properties', {})
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            dataset.set_properties(properties)
-            logger.info(f"Set properties on dataset: {identifier}")
-            return f"Successfully set properties on dataset: {identifier}"
-        except Exception as e:
-            return f"Error setting dataset properties: {str(e)}"
-
-    def _dataset_archive_tool(self, input_str: str) -> str:
-        """Tool function for archiving a dataset."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            remove_from_data_store = params.get('remove_from_data_store', True)
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            dataset.archive(remove_from_data_store=remove_from_data_store)
-            logger.info(f"Archived dataset: {identifier}")
-            return f"Successfully archived dataset: {identifier}"
-        except Exception as e:
-            return f"Error archiving dataset: {str(e)}"
-
-    def _dataset_unarchive_tool(self, input_str: str) -> str:
-        """Tool function for unarchiving a dataset."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            dataset = self.connection.openbis.get_dataset(identifier)
-            if dataset is None:
-                return f"Dataset '{identifier}' not found."
-
-            dataset.unarchive()
-            logger.info(f"Unarchived dataset: {identifier}")
-            return f"Successfully unarchived dataset: {identifier}"
-        except Exception as e:
-            return f"Error unarchiving dataset: {str(e)}"
-
-    # Experiment methods
-    def _experiment_delete_tool(self, input_str: str) -> str:
-        """Tool function for deleting an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            reason = params.get('reason', 'Deleted via chatBIS')
-            permanently = params.get('permanently', False)
-
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
-
-            experiment.delete(reason=reason, permanently=permanently)
-            logger.info(f"Deleted experiment: {identifier}")
-            return f"Successfully deleted experiment: {identifier}"
-        except Exception as e:
-            return f"Error deleting experiment: {str(e)}"
-
-    def _experiment_get_datasets_tool(self, input_str: str) -> str:
-        """Tool function for getting datasets associated with an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
-
-            datasets = experiment.get_datasets()
-            logger.info(f"Retrieved {len(datasets)} datasets for experiment: {identifier}")
-
-            if len(datasets) == 0:
-                return f"No datasets found for experiment '{identifier}'."
-
-            result = f"Found {len(datasets)} datasets for experiment '{identifier}':\n"
-            for idx, dataset in enumerate(datasets):
-                if hasattr(dataset, 'code'):
-                    result += f"{idx+1}. {dataset.code}"
-                elif hasattr(dataset, 'permId'):
-                    result += f"{idx+1}. {dataset.permId}"
-                else:
-                    result += f"{idx+1}. {str(dataset)}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting datasets for experiment: {str(e)}"
-
-    def _experiment_get_samples_tool(self, input_str: str) -> str:
-        """Tool function for getting samples associated with an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
-
-            samples = experiment.get_samples()
-            logger.info(f"Retrieved {len(samples)} samples for experiment: {identifier}")
-
-            if len(samples) == 0:
-                return f"No samples found for experiment '{identifier}'."
-
-            result = f"Found {len(samples)} samples for experiment '{identifier}':\n"
-            for idx, sample in enumerate(samples):
-                if hasattr(sample, 'identifier'):
-                    result += f"{idx+1}. {sample.identifier}"
-                else:
-                    result += f"{idx+1}. {str(sample)}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting samples for experiment: {str(e)}"
-
-    def _experiment_get_projects_tool(self, input_str: str) -> str:
-        """Tool function for getting projects associated with an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
-
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
-
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
-
-            projects = experiment.get_projects()
-            logger.info(f"Retrieved {len(projects)} projects for experiment: {identifier}")
-
-            if len(projects) == 0:
-                return f"No projects found for experiment '{identifier}'."
-
-            result = f"Found {len(projects)} projects for experiment '{identifier}':\n"
-            for idx, project in enumerate(projects):
-                if hasattr(project, 'identifier'):
-                    result += f"{idx+1}. {project.identifier}"
-                else:
-                    result += f"{idx+1}. {str(project)}"
-                result += "\n"
-
-            return result
-        except Exception as e:
-            return f"Error getting projects for experiment: {str(e)}"
-
-    def _experiment_add_samples_tool(self, input_str: str) -> str:
-        """Tool function for adding samples to an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    @_openbis_tool("Error creating permanent ID")
+    def _openbis_create_permid_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for creating a new permanent ID."""
+        perm_id = self.connection.create_perm_id()
+        logger.info("Created new permId: %s", perm_id)
+        return f"Generated new permanent ID: {perm_id}"
 
-            identifier = params.get('identifier')
-            samples = params.get('samples', [])
+    @_cached_tool
+    @_openbis_tool("Error getting data stores")
+    def _openbis_get_datastores_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting all data stores."""
+        datastores = self.connection.openbis.get_datastores()
+        total = len(datastores)
+        logger.info("Retrieved %s data stores", total)
 
-            if not identifier:
-                return "Error: identifier parameter is required."
-            if not samples:
-                return "Error: samples parameter is required."
-
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
-
-            # Convert sample identifiers to sample objects
-            sample_objects = []
-            for sample_id in samples:
-                sample = self.connection.openbis.get_sample(sample_id)
-                if sample:
-                    sample_objects.append(sample)
-
-            experiment.add_samples(*sample_objects)
-            logger.info(f"Added {len(sample_objects)} samples to experiment: {identifier}")
-            return f"Successfully added {len(sample_objects)} samples to experiment: {identifier}"
-        except Exception as e:
-            return f"Error adding samples to experiment: {str(e)}"
+        if not total:
+            return "No data stores found."
 
-    def _experiment_del_samples_tool(self, input_str: str) -> str:
-        """Tool function for removing samples from an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        parts = [f"Found {total} data stores:\n"]
+        for idx, ds in enumerate(itertools.islice(_to_records(datastores, DATASTORE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            label = _field(ds, 'label')
+            download_url = _field(ds, 'downloadUrl')
+            parts.append(f"{idx}. {_field(ds, 'code')}{f' - {label}' if label else ''}{f' ({download_url})' if download_url else ''}\n")
 
-            identifier = params.get('identifier')
-            samples = params.get('samples', [])
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            if not identifier:
-                return "Error: identifier parameter is required."
-            if not samples:
-                return "Error: samples parameter is required."
-
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
-
-            # Convert sample identifiers to sample objects
-            sample_objects = []
-            for sample_id in samples:
-                sample = self.connection.openbis.get_sample(sample_id)
-                if sample:
-                    sample_objects.append(sample)
-
-            experiment.del_samples(sample_objects)
-            logger.info(f"Removed {len(sample_objects)} samples from experiment: {identifier}")
-            return f"Successfully removed {len(sample_objects)} samples from experiment: {identifier}"
-        except Exception as e:
-            return f"Error removing samples from experiment: {str(e)}"
+        return "".join(parts)
 
-    def _experiment_is_marked_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for checking if an experiment is marked for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    @_cached_tool
+    @_openbis_tool("Error getting plugins")
+    def _openbis_get_plugins_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting plugins."""
+        plugin_type = params.get('plugin_type')
+        plugins = self.connection.openbis.get_plugins(plugin_type=plugin_type)
+        total = len(plugins)
+        logger.info("Retrieved %s plugins", total)
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+        if not total:
+            return "No plugins found."
 
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
+        parts = [f"Found {total} plugins:\n"]
+        for idx, plugin in enumerate(itertools.islice(_to_records(plugins, PLUGIN_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            plugin_type = _field(plugin, 'pluginType')
+            description = _field(plugin, 'description')
+            parts.append(f"{idx}. {_field(plugin, 'name')}{f' ({plugin_type})' if plugin_type is not None else ''}{f' - {description}' if description else ''}\n")
 
-            is_marked = experiment.is_marked_to_be_deleted()
-            logger.info(f"Experiment {identifier} deletion status: {is_marked}")
-            return f"Experiment '{identifier}' is {'marked' if is_marked else 'not marked'} for deletion."
-        except Exception as e:
-            return f"Error checking experiment deletion status: {str(e)}"
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-    def _experiment_mark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for marking an experiment for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        return "".join(parts)
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+    @_cached_tool
+    @_openbis_tool("Error getting plugin")
+    def _openbis_get_plugin_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting a specific plugin."""
+        plugin_name = params.get('plugin_name')
+        if not plugin_name:
+            return "Error: plugin_name parameter is required."
 
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
+        plugin = self.connection.openbis.get_plugin(plugin_name)
+        logger.info("Retrieved plugin: %s", plugin_name)
 
-            experiment.mark_to_be_deleted()
-            logger.info(f"Marked experiment for deletion: {identifier}")
-            return f"Successfully marked experiment '{identifier}' for deletion."
-        except Exception as e:
-            return f"Error marking experiment for deletion: {str(e)}"
+        if plugin is None:
+            return f"Plugin '{plugin_name}' not found."
 
-    def _experiment_unmark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for unmarking an experiment for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        parts = [f"Plugin: {plugin.name}\n"]
+        _append_fields(parts, plugin, PLUGIN_FIELDS, keep_falsy=True)
+        script = getattr(plugin, 'script', None)
+        if script:
+            parts.append(f"Script: {script!s:.100}...\n")
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+        return "".join(parts)
 
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
+    @_cached_tool
+    @_openbis_tool("Error getting external data management systems")
+    def _openbis_get_external_data_management_systems_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting external data management systems."""
+        systems = self.connection.openbis.get_external_data_management_systems()
+        total = len(systems)
+        logger.info("Retrieved %s external DMS", total)
 
-            experiment.unmark_to_be_deleted()
-            logger.info(f"Unmarked experiment for deletion: {identifier}")
-            return f"Successfully unmarked experiment '{identifier}' for deletion."
-        except Exception as e:
-            return f"Error unmarking experiment for deletion: {str(e)}"
+        if not total:
+            return "No external data management systems found."
 
-    def _experiment_save_tool(self, input_str: str) -> str:
-        """Tool function for saving changes to an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        parts = [f"Found {total} external data management systems:\n"]
+        for idx, system in enumerate(itertools.islice(_to_records(systems, EXTERNAL_DMS_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            label = _field(system, 'label')
+            address = _field(system, 'address')
+            parts.append(f"{idx}. {_field(system, 'code')}{f' - {label}' if label else ''}{f' ({address})' if address else ''}\n")
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
+        return "".join(parts)
 
-            experiment.save()
-            logger.info(f"Saved experiment: {identifier}")
-            return f"Successfully saved experiment: {identifier}"
-        except Exception as e:
-            return f"Error saving experiment: {str(e)}"
+    @_cached_tool
+    @_openbis_tool("Error getting external DMS")
+    def _openbis_get_external_data_management_system_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting a specific external DMS."""
+        dms_id = params.get('dms_id')
+        if not dms_id:
+            return "Error: dms_id parameter is required."
 
-    def _experiment_set_properties_tool(self, input_str: str) -> str:
-        """Tool function for setting properties on an experiment."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        system = self.connection.openbis.get_external_data_management_system(dms_id)
+        logger.info("Retrieved external DMS: %s", dms_id)
 
-            identifier = params.get('identifier')
-            properties = params.get('properties', {})
+        if system is None:
+            return f"External DMS '{dms_id}' not found."
 
-            if not identifier:
-                return "Error: identifier parameter is required."
+        parts = [f"External DMS: {system.code}\n"]
+        _append_fields(parts, system, EXTERNAL_DMS_FIELDS)
 
-            experiment = self.connection.openbis.get_experiment(identifier)
-            if experiment is None:
-                return f"Experiment '{identifier}' not found."
+        return "".join(parts)
 
-            experiment.set_properties(properties)
-            logger.info(f"Set properties on experiment: {identifier}")
-            return f"Successfully set properties on experiment: {identifier}"
-        except Exception as e:
-            return f"Error setting experiment properties: {str(e)}"
+    @_entity_cached_tool
+    @_openbis_tool("Error getting persons")
+    def _openbis_get_persons_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting all persons."""
+        persons = self.connection.openbis.get_persons()
+        total = len(persons)
+        logger.info("Retrieved %s persons", total)
 
-    # Project methods
-    def _project_delete_tool(self, input_str: str) -> str:
-        """Tool function for deleting a project."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        if not total:
+            return "No persons found."
 
-            identifier = params.get('identifier')
-            reason = params.get('reason', 'Deleted via chatBIS')
-            permanently = params.get('permanently', False)
+        parts = [f"Found {total} persons:\n"]
+        for idx, person in enumerate(itertools.islice(_to_records(persons, PERSON_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            first_name = _field(person, 'firstName')
+            last_name = _field(person, 'lastName') if first_name else None
+            name = f" ({first_name} {last_name})" if last_name else f" ({first_name})" if first_name else ""
+            email = _field(person, 'email')
+            parts.append(f"{idx}. {_field(person, 'userId')}{name}{f' - {email}' if email else ''}\n")
 
-            if not identifier:
-                return "Error: identifier parameter is required."
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
+        return "".join(parts)
 
-            project.delete(reason=reason, permanently=permanently)
-            logger.info(f"Deleted project: {identifier}")
-            return f"Successfully deleted project: {identifier}"
-        except Exception as e:
-            return f"Error deleting project: {str(e)}"
+    @_entity_cached_tool
+    @_openbis_tool("Error getting person")
+    def _openbis_get_person_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting a specific person."""
+        person_id = params.get('person_id')
+        if not person_id:
+            return "Error: person_id parameter is required."
 
-    def _project_get_experiments_tool(self, input_str: str) -> str:
-        """Tool function for getting experiments in a project."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        person = self.connection.openbis.get_person(person_id)
+        logger.info("Retrieved person: %s", person_id)
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+        if person is None:
+            return f"Person '{person_id}' not found."
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
+        parts = [f"Person: {person.userId}\n"]
+        _append_fields(parts, person, PERSON_FIELDS)
 
-            experiments = project.get_experiments()
-            logger.info(f"Retrieved {len(experiments)} experiments for project: {identifier}")
+        return "".join(parts)
 
-            if len(experiments) == 0:
-                return f"No experiments found in project '{identifier}'."
+    @_entity_cached_tool
+    @_openbis_tool("Error getting groups")
+    def _openbis_get_groups_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting all groups."""
+        groups = self.connection.openbis.get_groups()
+        total = len(groups)
+        logger.info("Retrieved %s groups", total)
 
-            result = f"Found {len(experiments)} experiments in project '{identifier}':\n"
-            for idx, experiment in enumerate(experiments):
-                if hasattr(experiment, 'identifier'):
-                    result += f"{idx+1}. {experiment.identifier}"
-                else:
-                    result += f"{idx+1}. {str(experiment)}"
-                result += "\n"
+        if not total:
+            return "No groups found."
 
-            return result
-        except Exception as e:
-            return f"Error getting experiments for project: {str(e)}"
+        parts = [f"Found {total} groups:\n"]
+        for idx, group in enumerate(itertools.islice(_to_records(groups, CODE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            description = _field(group, 'description')
+            parts.append(f"{idx}. {_field(group, 'code')}{f' - {description}' if description else ''}\n")
 
-    def _project_get_datasets_tool(self, input_str: str) -> str:
-        """Tool function for getting datasets in a project."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+        return "".join(parts)
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
+    @_entity_cached_tool
+    @_openbis_tool("Error getting group")
+    def _openbis_get_group_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting a specific group."""
+        group_code = params.get('group_code')
+        if not group_code:
+            return "Error: group_code parameter is required."
 
-            datasets = project.get_datasets()
-            logger.info(f"Retrieved {len(datasets)} datasets for project: {identifier}")
+        group = self.connection.openbis.get_group(group_code)
+        logger.info("Retrieved group: %s", group_code)
 
-            if len(datasets) == 0:
-                return f"No datasets found in project '{identifier}'."
+        if group is None:
+            return f"Group '{group_code}' not found."
 
-            result = f"Found {len(datasets)} datasets in project '{identifier}':\n"
-            for idx, dataset in enumerate(datasets):
-                if hasattr(dataset, 'code'):
-                    result += f"{idx+1}. {dataset.code}"
-                elif hasattr(dataset, 'permId'):
-                    result += f"{idx+1}. {dataset.permId}"
-                else:
-                    result += f"{idx+1}. {str(dataset)}"
-                result += "\n"
+        parts = [f"Group: {group.code}\n"]
+        _append_fields(parts, group, GROUP_FIELDS)
 
-            return result
-        except Exception as e:
-            return f"Error getting datasets for project: {str(e)}"
+        return "".join(parts)
 
-    def _project_get_samples_tool(self, input_str: str) -> str:
-        """Tool function for getting samples in a project."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    @_entity_cached_tool
+    @_openbis_tool("Error getting role assignments")
+    def _openbis_get_role_assignments_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting role assignments."""
+        filters = {key: params.get(key) for key in ROLE_ASSIGNMENT_FILTERS}
+        role_assignments = self.connection.openbis.get_role_assignments(**filters)
+        total = len(role_assignments)
+        logger.info("Retrieved %s role assignments", total)
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+        if not total:
+            return "No role assignments found."
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
+        parts = [f"Found {total} role assignments:\n"]
+        for idx, assignment in enumerate(itertools.islice(role_assignments, LIST_DISPLAY_LIMIT), 1):
+            values = ((label, getattr(assignment, attr, None)) for label, attr in ROLE_ASSIGNMENT_FIELDS)
+            details = "".join(f", {label}: {value}" for label, value in values if value)
+            parts.append(f"{idx}. Role: {assignment.role}{details}\n")
 
-            samples = project.get_samples()
-            logger.info(f"Retrieved {len(samples)} samples for project: {identifier}")
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            if len(samples) == 0:
-                return f"No samples found in project '{identifier}'."
+        return "".join(parts)
 
-            result = f"Found {len(samples)} samples in project '{identifier}':\n"
-            for idx, sample in enumerate(samples):
-                if hasattr(sample, 'identifier'):
-                    result += f"{idx+1}. {sample.identifier}"
-                else:
-                    result += f"{idx+1}. {str(sample)}"
-                result += "\n"
+    @_entity_cached_tool
+    @_openbis_tool("Error getting tags")
+    def _openbis_get_tags_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting all tags."""
+        tags = self.connection.openbis.get_tags()
+        total = len(tags)
+        logger.info("Retrieved %s tags", total)
 
-            return result
-        except Exception as e:
-            return f"Error getting samples for project: {str(e)}"
+        if not total:
+            return "No tags found."
 
-    def _project_get_sample_tool(self, input_str: str) -> str:
-        """Tool function for getting a specific sample in a project."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        parts = [f"Found {total} tags:\n"]
+        for idx, tag in enumerate(itertools.islice(_to_records(tags, CODE_LIST_COLUMNS), LIST_DISPLAY_LIMIT), 1):
+            description = _field(tag, 'description')
+            parts.append(f"{idx}. {_field(tag, 'code')}{f' - {description}' if description else ''}\n")
 
-            identifier = params.get('identifier')
-            sample_code = params.get('sample_code')
+        if total > LIST_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {LIST_DISPLAY_LIMIT} of {total} results)\n")
 
-            if not identifier:
-                return "Error: identifier parameter is required."
-            if not sample_code:
-                return "Error: sample_code parameter is required."
+        return "".join(parts)
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
+    @_entity_cached_tool
+    @_openbis_tool("Error getting tag")
+    def _openbis_get_tag_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting a specific tag."""
+        tag_code = params.get('tag_code')
+        if not tag_code:
+            return "Error: tag_code parameter is required."
 
-            sample = project.get_sample(sample_code)
-            logger.info(f"Retrieved sample {sample_code} for project: {identifier}")
+        tag = self.connection.openbis.get_tag(tag_code)
+        logger.info("Retrieved tag: %s", tag_code)
 
-            if sample is None:
-                return f"Sample '{sample_code}' not found in project '{identifier}'."
+        if tag is None:
+            return f"Tag '{tag_code}' not found."
 
-            result = f"Sample: {sample.identifier}\n"
-            result += f"Type: {sample.type}\n"
-            result += f"Space: {sample.space}\n"
+        parts = [f"Tag: {tag.code}\n"]
+        _append_fields(parts, tag, TAG_FIELDS)
 
-            if hasattr(sample, 'properties') and sample.properties:
-                result += "Properties:\n"
-                for key, value in sample.properties.items():
-                    result += f"  {key}: {value}\n"
+        return "".join(parts)
 
-            return result
-        except Exception as e:
-            return f"Error getting sample for project: {str(e)}"
+    # === ENTITY-SPECIFIC METHODS ===
 
-    def _project_is_marked_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for checking if a project is marked for deletion."""
+    @_requires_connection
+    def _entity_action_tool(self, kind: str, action: str, input_str: str) -> str:
+        """Tool function for the simple entity actions listed in ENTITY_ACTIONS."""
+        label, _, id_param = ENTITY_KINDS[kind]
+        spec = ENTITY_ACTIONS[action]
         try:
-            self._ensure_connected()
             params = self._parse_tool_input(input_str)
 
-            identifier = params.get('identifier')
+            identifier = params.get(id_param)
             if not identifier:
-                return "Error: identifier parameter is required."
+                return f"Error: {id_param} parameter is required."
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
-
-            is_marked = project.is_marked_to_be_deleted()
-            logger.info(f"Project {identifier} deletion status: {is_marked}")
-            return f"Project '{identifier}' is {'marked' if is_marked else 'not marked'} for deletion."
-        except Exception as e:
-            return f"Error checking project deletion status: {str(e)}"
+            # Act on the object holding staged changes, not a fresh copy
+            key, entity = self._get_staged_entity(kind, identifier)
+            if entity is None:
+                entity = self._get_entity(kind, identifier)
+            else:
+                del self.connection.staged_entities[key]
+            if entity is None:
+                return f"{label} '{identifier}' not found."
+
+            if action == "save" and entity.is_marked_to_be_deleted():
+                entity.delete(params.get('reason', 'Deleted via chatBIS'))
+                logger.info("Deleted %s marked for deletion: %s", kind, identifier)
+                return f"Successfully deleted {kind}: {identifier} (it was marked for deletion)"
+
+            kwargs = spec["kwargs"](params) if "kwargs" in spec else {}
+            getattr(entity, action)(**kwargs)
+            if spec.get("stage"):
+                self._stage_entity(kind, entity)
+            logger.info(spec["log"], kind, identifier)
+            return spec["success"].format(kind=kind, identifier=identifier)
+        except Exception as e:
+            return f"{spec['error'].format(kind=kind)}: {str(e)}"
+
+    def _set_entity_properties(self, kind: str, params: Dict[str, Any]) -> str:
+        """Set properties on an entity and save them in the same call.
+
+        With ``save=false`` the changes are only staged; the entity is kept
+        so that the matching *_save tool writes these changes instead of
+        fetching an unmodified copy. Further edits go to the staged entity,
+        so earlier staged changes and deletion marks are kept.
+        """
+        label = ENTITY_KINDS[kind][0]
+        identifier = params.get('identifier')
+        properties = params.get('properties', {})
+        save = params.get('save', True)
+
+        if not identifier:
+            return "Error: identifier parameter is required."
+
+        key, entity = self._get_staged_entity(kind, identifier)
+        if entity is None:
+            entity = self._get_entity(kind, identifier)
+        if entity is None:
+            return f"{label} '{identifier}' not found."
+
+        # pybis knows the entity type's properties by lower-case code and
+        # raises on the first unknown one after setting the ones before it;
+        # check all codes first so nothing is staged when one is wrong
+        properties = {str(code).lower(): value for code, value in properties.items()}
+        known = getattr(entity.p, '_property_names', None)
+        if isinstance(known, dict):
+            unknown = [code for code in properties if code not in known]
+            if unknown:
+                return (f"Error: unknown properties for {kind} '{identifier}': {', '.join(unknown)}. "
+                        f"Allowed properties are: {', '.join(known)}")
+
+        entity.set_properties(properties)
+        if not save:
+            self._stage_entity(kind, entity)
+            logger.info("Staged properties on %s: %s", kind, identifier)
+            return f"Set properties on {kind}: {identifier} (not saved yet, call {kind}_save to save them)"
+
+        entity.save()
+        # save() does not send a deletion mark; keep a marked entity staged
+        # so the *_save tool can still delete it
+        if key is not None and not entity.is_marked_to_be_deleted():
+            del self.connection.staged_entities[key]
+        logger.info("Set and saved properties on %s: %s", kind, identifier)
+        return f"Successfully set and saved properties on {kind}: {identifier}"
 
-    def _project_mark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for marking a project for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    # Sample methods
+    _sample_get_datasets_tool = _related_listing_tool("sample", "datasets", "for")
+    _sample_get_projects_tool = _related_listing_tool("sample", "projects", "for")
+    _sample_is_marked_to_be_deleted_tool = _deletion_status_tool("sample")
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+    @_openbis_tool("Error setting sample properties")
+    def _sample_set_properties_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for setting properties on a sample."""
+        return self._set_entity_properties("sample", params)
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
+    # Dataset methods
+    @_openbis_tool("Error downloading dataset")
+    def _dataset_download_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for downloading dataset files."""
+        identifier = params.get('identifier')
+        files = params.get('files')
+        destination = params.get('destination')
+        create_default_folders = params.get('create_default_folders', True)
+        wait_until_finished = params.get('wait_until_finished', True)
+
+        if not identifier:
+            return "Error: identifier parameter is required."
+
+        dataset = self._get_entity("dataset", identifier)
+        if dataset is None:
+            return f"Dataset '{identifier}' not found."
+
+        download = functools.partial(
+            dataset.download,
+            files=files,
+            destination=destination,
+            create_default_folders=create_default_folders,
+            wait_until_finished=True
+        )
+        if wait_until_finished:
+            download()
+            logger.info("Downloaded dataset: %s", identifier)
+            return f"Successfully downloaded dataset: {identifier}"
 
-            project.mark_to_be_deleted()
-            logger.info(f"Marked project for deletion: {identifier}")
-            return f"Successfully marked project '{identifier}' for deletion."
-        except Exception as e:
-            return f"Error marking project for deletion: {str(e)}"
+        key = str(identifier).upper()
+        running = self._downloads.get(key)
+        if running is not None and not running.done():
+            return f"Download of dataset '{identifier}' is already in progress."
+
+        if self._download_executor is None:
+            self._download_executor = ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS,
+                                                         thread_name_prefix="pybis-download")
+        self._downloads[key] = self._download_executor.submit(download)
+        logger.info("Started download of dataset: %s", identifier)
+        return f"Started downloading dataset: {identifier}. Use dataset_download_status to check on it."
+
+    @_openbis_tool("Error checking download status")
+    def _dataset_download_status_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for checking a background dataset download."""
+        identifier = params.get('identifier')
+        if not identifier:
+            return "Error: identifier parameter is required."
+
+        key = str(identifier).upper()
+        download = self._downloads.get(key)
+        if download is None:
+            return f"No download was started for dataset '{identifier}'."
+        if not download.done():
+            return f"Download of dataset '{identifier}' is in progress."
+
+        del self._downloads[key]
+        error = download.exception()
+        if error is not None:
+            return f"Download of dataset '{identifier}' failed: {error}"
+        return f"Download of dataset '{identifier}' finished: {download.result()}"
+
+    @_entity_cached_tool
+    @_openbis_tool("Error getting file list")
+    def _dataset_get_file_list_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting file list from a dataset."""
+        identifier = params.get('identifier')
+        recursive = params.get('recursive', True)
+        start_folder = params.get('start_folder', '/')
 
-    def _project_unmark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for unmarking a project for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        if not identifier:
+            return "Error: identifier parameter is required."
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+        dataset = self._get_entity("dataset", identifier)
+        if dataset is None:
+            return f"Dataset '{identifier}' not found."
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
+        file_list = dataset.get_file_list(recursive=recursive, start_folder=start_folder)
+        logger.info("Retrieved file list for dataset: %s", identifier)
 
-            project.unmark_to_be_deleted()
-            logger.info(f"Unmarked project for deletion: {identifier}")
-            return f"Successfully unmarked project '{identifier}' for deletion."
-        except Exception as e:
-            return f"Error unmarking project for deletion: {str(e)}"
+        total = len(file_list)
+        if not total:
+            return f"No files found in dataset '{identifier}'."
 
-    def _project_save_tool(self, input_str: str) -> str:
-        """Tool function for saving changes to a project."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        parts = [f"Found {total} files in dataset '{identifier}':\n"]
+        for idx, file_path in enumerate(itertools.islice(file_list, FILE_DISPLAY_LIMIT), 1):
+            parts.append(f"{idx}. {file_path}\n")
 
-            identifier = params.get('identifier')
-            if not identifier:
-                return "Error: identifier parameter is required."
+        if total > FILE_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {FILE_DISPLAY_LIMIT} of {total} files)\n")
 
-            project = self.connection.openbis.get_project(identifier)
-            if project is None:
-                return f"Project '{identifier}' not found."
+        return "".join(parts)
 
-            project.save()
-            logger.info(f"Saved project: {identifier}")
-            return f"Successfully saved project: {identifier}"
-        except Exception as e:
-            return f"Error saving project: {str(e)}"
+    @_openbis_tool("Error getting files")
+    def _dataset_get_files_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting files DataFrame from a dataset."""
+        identifier = params.get('identifier')
+        start_folder = params.get('start_folder', '/')
 
-    # Space methods
-    def _space_delete_tool(self, input_str: str) -> str:
-        """Tool function for deleting a space."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        if not identifier:
+            return "Error: identifier parameter is required."
 
-            space_code = params.get('space_code')
-            reason = params.get('reason', 'Deleted via chatBIS')
-            permanently = params.get('permanently', False)
+        dataset = self._get_entity("dataset", identifier)
+        if dataset is None:
+            return f"Dataset '{identifier}' not found."
 
-            if not space_code:
-                return "Error: space_code parameter is required."
+        files_df = dataset.get_files(start_folder=start_folder)
+        logger.info("Retrieved files DataFrame for dataset: %s", identifier)
 
-            space = self.connection.openbis.get_space(space_code)
-            if space is None:
-                return f"Space '{space_code}' not found."
+        path_column = next((c for c in FILE_PATH_COLUMNS if c in files_df.columns), None)
+        size_column = next((c for c in FILE_SIZE_COLUMNS if c in files_df.columns), None)
+        # A numeric folder name arrives as an int from the input parser
+        folder = str(start_folder).strip('/')
+        if folder and path_column:
+            # pybis accepts start_folder but returns every file of the dataset
+            paths = files_df[path_column]
+            files_df = files_df[(paths == folder) | paths.str.startswith(folder + '/')]
 
-            space.delete(reason=reason, permanently=permanently)
-            logger.info(f"Deleted space: {space_code}")
-            return f"Successfully deleted space: {space_code}"
-        except Exception as e:
-            return f"Error deleting space: {str(e)}"
+        total = len(files_df)
+        if not total:
+            return f"No files found in dataset '{identifier}'."
 
-    def _space_get_experiments_tool(self, input_str: str) -> str:
-        """Tool function for getting experiments in a space."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        parts = [f"Found {total} files in dataset '{identifier}':\n"]
+        # Read whole columns of the shown rows instead of a Series per row
+        shown = files_df.head(FILE_DISPLAY_LIMIT)
+        paths = shown[path_column] if path_column else ['N/A'] * len(shown)
+        sizes = shown[size_column] if size_column else [None] * len(shown)
+        for idx, (path, size) in enumerate(zip(paths, sizes), 1):
+            parts.append(f"{idx}. {path} ({size} bytes)\n" if size is not None else f"{idx}. {path}\n")
 
-            space_code = params.get('space_code')
-            if not space_code:
-                return "Error: space_code parameter is required."
+        if total > FILE_DISPLAY_LIMIT:
+            parts.append(f"... (showing first {FILE_DISPLAY_LIMIT} of {total} files)\n")
 
-            space = self.connection.openbis.get_space(space_code)
-            if space is None:
-                return f"Space '{space_code}' not found."
+        return "".join(parts)
 
-            experiments = space.get_experiments()
-            logger.info(f"Retrieved {len(experiments)} experiments for space: {space_code}")
+    _dataset_is_marked_to_be_deleted_tool = _deletion_status_tool("dataset")
 
-            if len(experiments) == 0:
-                return f"No experiments found in space '{space_code}'."
+    @_openbis_tool("Error setting dataset properties")
+    def _dataset_set_properties_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for setting properties on a dataset."""
+        return self._set_entity_properties("dataset", params)
 
-            result = f"Found {len(experiments)} experiments in space '{space_code}':\n"
-            for idx, experiment in enumerate(experiments):
-                if hasattr(experiment, 'identifier'):
-                    result += f"{idx+1}. {experiment.identifier}"
-                else:
-                    result += f"{idx+1}. {str(experiment)}"
-                result += "\n"
+    @_openbis_tool("Error archiving dataset")
+    def _dataset_archive_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for archiving a dataset."""
+        identifier = params.get('identifier')
+        remove_from_data_store = params.get('remove_from_data_store', True)
 
-            return result
-        except Exception as e:
-            return f"Error getting experiments for space: {str(e)}"
+        if not identifier:
+            return "Error: identifier parameter is required."
 
-    def _space_get_samples_tool(self, input_str: str) -> str:
-        """Tool function for getting samples in a space."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        dataset = self._get_entity("dataset", identifier)
+        if dataset is None:
+            return f"Dataset '{identifier}' not found."
 
-            space_code = params.get('space_code')
-            if not space_code:
-                return "Error: space_code parameter is required."
+        dataset.archive(remove_from_data_store=remove_from_data_store)
+        logger.info("Archived dataset: %s", identifier)
+        return f"Successfully archived dataset: {identifier}"
 
-            space = self.connection.openbis.get_space(space_code)
-            if space is None:
-                return f"Space '{space_code}' not found."
+    @_openbis_tool("Error unarchiving dataset")
+    def _dataset_unarchive_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for unarchiving a dataset."""
+        identifier = params.get('identifier')
+        if not identifier:
+            return "Error: identifier parameter is required."
 
-            samples = space.get_samples()
-            logger.info(f"Retrieved {len(samples)} samples for space: {space_code}")
+        dataset = self._get_entity("dataset", identifier)
+        if dataset is None:
+            return f"Dataset '{identifier}' not found."
 
-            if len(samples) == 0:
-                return f"No samples found in space '{space_code}'."
+        dataset.unarchive()
+        logger.info("Unarchived dataset: %s", identifier)
+        return f"Successfully unarchived dataset: {identifier}"
 
-            result = f"Found {len(samples)} samples in space '{space_code}':\n"
-            for idx, sample in enumerate(samples):
-                if hasattr(sample, 'identifier'):
-                    result += f"{idx+1}. {sample.identifier}"
-                else:
-                    result += f"{idx+1}. {str(sample)}"
-                result += "\n"
+    # Experiment methods
+    _experiment_get_datasets_tool = _related_listing_tool("experiment", "datasets", "for")
+    _experiment_get_samples_tool = _related_listing_tool("experiment", "samples", "for")
+    _experiment_get_projects_tool = _related_listing_tool("experiment", "projects", "for")
 
-            return result
-        except Exception as e:
-            return f"Error getting samples for space: {str(e)}"
+    @_openbis_tool("Error adding samples to experiment")
+    def _experiment_add_samples_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for adding samples to an experiment."""
+        identifier = params.get('identifier')
+        samples = params.get('samples', [])
 
-    def _space_get_projects_tool(self, input_str: str) -> str:
-        """Tool function for getting projects in a space."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        if not identifier:
+            return "Error: identifier parameter is required."
+        if not samples:
+            return "Error: samples parameter is required."
 
-            space_code = params.get('space_code')
-            if not space_code:
-                return "Error: space_code parameter is required."
+        experiment = self._get_entity("experiment", identifier)
+        if experiment is None:
+            return f"Experiment '{identifier}' not found."
 
-            space = self.connection.openbis.get_space(space_code)
-            if space is None:
-                return f"Space '{space_code}' not found."
+        if isinstance(samples, str):
+            samples = samples.split()
 
-            projects = space.get_projects()
-            logger.info(f"Retrieved {len(projects)} projects for space: {space_code}")
+        sample_objects, not_found = self._resolve_samples(samples)
 
-            if len(projects) == 0:
-                return f"No projects found in space '{space_code}'."
+        experiment.add_samples(*sample_objects)
+        logger.info("Added %s samples to experiment: %s", len(sample_objects), identifier)
+        return f"Successfully added {len(sample_objects)} samples to experiment: {identifier}{not_found}"
 
-            result = f"Found {len(projects)} projects in space '{space_code}':\n"
-            for idx, project in enumerate(projects):
-                if hasattr(project, 'identifier'):
-                    result += f"{idx+1}. {project.identifier}"
-                else:
-                    result += f"{idx+1}. {str(project)}"
-                result += "\n"
+    @_openbis_tool("Error removing samples from experiment")
+    def _experiment_del_samples_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for removing samples from an experiment."""
+        identifier = params.get('identifier')
+        samples = params.get('samples', [])
 
-            return result
-        except Exception as e:
-            return f"Error getting projects for space: {str(e)}"
+        if not identifier:
+            return "Error: identifier parameter is required."
+        if not samples:
+            return "Error: samples parameter is required."
 
-    def _space_is_marked_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for checking if a space is marked for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        experiment = self._get_entity("experiment", identifier)
+        if experiment is None:
+            return f"Experiment '{identifier}' not found."
 
-            space_code = params.get('space_code')
-            if not space_code:
-                return "Error: space_code parameter is required."
+        if isinstance(samples, str):
+            samples = samples.split()
 
-            space = self.connection.openbis.get_space(space_code)
-            if space is None:
-                return f"Space '{space_code}' not found."
+        sample_objects, not_found = self._resolve_samples(samples)
 
-            is_marked = space.is_marked_to_be_deleted()
-            logger.info(f"Space {space_code} deletion status: {is_marked}")
-            return f"Space '{space_code}' is {'marked' if is_marked else 'not marked'} for deletion."
-        except Exception as e:
-            return f"Error checking space deletion status: {str(e)}"
+        experiment.del_samples(sample_objects)
+        logger.info("Removed %s samples from experiment: %s", len(sample_objects), identifier)
+        return f"Successfully removed {len(sample_objects)} samples from experiment: {identifier}{not_found}"
 
-    def _space_mark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for marking a space for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+    _experiment_is_marked_to_be_deleted_tool = _deletion_status_tool("experiment")
 
-            space_code = params.get('space_code')
-            if not space_code:
-                return "Error: space_code parameter is required."
+    @_openbis_tool("Error setting experiment properties")
+    def _experiment_set_properties_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for setting properties on an experiment."""
+        return self._set_entity_properties("experiment", params)
 
-            space = self.connection.openbis.get_space(space_code)
-            if space is None:
-                return f"Space '{space_code}' not found."
+    # Project methods
+    _project_get_experiments_tool = _related_listing_tool("project", "experiments", "in")
+    _project_get_datasets_tool = _related_listing_tool("project", "datasets", "in")
+    _project_get_samples_tool = _related_listing_tool("project", "samples", "in")
+
+    @_entity_cached_tool
+    @_openbis_tool("Error getting contents of project")
+    def _project_get_contents_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for listing the experiments, samples and datasets of a project."""
+        identifier = params.get('identifier')
+        if not identifier:
+            return "Error: identifier parameter is required."
+
+        project = self._get_entity("project", identifier)
+        if project is None:
+            return f"Project '{identifier}' not found."
+
+        # The three searches are independent, so run them side by side
+        related = ("experiments", "samples", "datasets")
+        listings = list(self._fetch_pool().map(
+            lambda name: self._fetch_related("project", project, name), related
+        ))
+        logger.info("Retrieved contents of project: %s", identifier)
+        return "\n".join(
+            _format_related_listing(items, total, "project", name, "in", identifier)
+            for name, (items, total) in zip(related, listings)
+        )
+
+    @_openbis_tool("Error getting sample for project")
+    def _project_get_sample_tool(self, params: Dict[str, Any]) -> str:
+        """Tool function for getting a specific sample in a project."""
+        identifier = params.get('identifier')
+        sample_code = params.get('sample_code')
 
-            space.mark_to_be_deleted()
-            logger.info(f"Marked space for deletion: {space_code}")
-            return f"Successfully marked space '{space_code}' for deletion."
-        except Exception as e:
-            return f"Error marking space for deletion: {str(e)}"
+        if not identifier:
+            return "Error: identifier parameter is required."
+        if not sample_code:
+            return "Error: sample_code parameter is required."
 
-    def _space_unmark_to_be_deleted_tool(self, input_str: str) -> str:
-        """Tool function for unmarking a space for deletion."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        project = self._get_entity("project", identifier)
+        if project is None:
+            return f"Project '{identifier}' not found."
 
-            space_code = params.get('space_code')
-            if not space_code:
-                return "Error: space_code parameter is required."
+        sample = project.get_sample(sample_code)
+        logger.info("Retrieved sample %s for project: %s", sample_code, identifier)
 
-            space = self.connection.openbis.get_space(space_code)
-            if space is None:
-                return f"Space '{space_code}' not found."
+        if sample is None:
+            return f"Sample '{sample_code}' not found in project '{identifier}'."
 
-            space.unmark_to_be_deleted()
-            logger.info(f"Unmarked space for deletion: {space_code}")
-            return f"Successfully unmarked space '{space_code}' for deletion."
-        except Exception as e:
-            return f"Error unmarking space for deletion: {str(e)}"
+        parts = [f"Sample: {sample.identifier}\n", f"Type: {sample.type}\n", f"Space: {sample.space}\n"]
 
-    def _space_save_tool(self, input_str: str) -> str:
-        """Tool function for saving changes to a space."""
-        try:
-            self._ensure_connected()
-            params = self._parse_tool_input(input_str)
+        if getattr(sample, 'properties', None):
+            parts.append("Properties:\n")
+            for key, value in sample.properties.items():
+                parts.append(f"  {key}: {value}\n")
 
-            space_code = params.get('space_code')
-            if not space_code:
-                return "Error: space_code parameter is required."
+        return "".join(parts)
 
-            space = self.connection.openbis.get_space(space_code)
-            if space is None:
-                return f"Space '{space_code}' not found."
+    _project_is_marked_to_be_deleted_tool = _deletion_status_tool("project")
 
-            space.save()
-            logger.info(f"Saved space: {space_code}")
-            return f"Successfully saved space: {space_code}"
-        except Exception as e:
-            return f"Error saving space: {str(e)}"
+    # Space methods
+    _space_get_experiments_tool = _related_listing_tool("space", "experiments", "in")
+    _space_get_samples_tool = _related_listing_tool("space", "samples", "in")
+    _space_get_projects_tool = _related_listing_tool("space", "projects", "in")
+    _space_is_marked_to_be_deleted_tool = _deletion_status_tool("space")
 
     def _parse_tool_input(self, input_str: str) -> Dict[str, Any]:
         """Parse tool input string into parameters dictionary."""
-        params = {}
         if not input_str.strip():
-            return params
+            return {}
 
-        try:
-            # Handle both key=value pairs and natural language descriptions
-            input_lower = input_str.lower()
-
-            # Check for special requests
-            if 'properties' in input_lower or 'property' in input_lower:
-                params['show_properties'] = True
-
-            if 'creation date' in input_lower or 'registration date' in input_lower:
-                params['show_dates'] = True
-
-            # Parse key=value pairs if present
-            for pair in input_str.split(','):
-                if '=' in pair:
-                    key, value = pair.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-
-                    # Try to convert to appropriate type
-                    if value.lower() in ['true', 'false']:
-                        params[key] = value.lower() == 'true'
-                    elif value.isdigit():
-                        params[key] = int(value)
-                    else:
-                        # Remove quotes if present
-                        if value.startswith('"') and value.endswith('"'):
-                            value = value[1:-1]
-                        elif value.startswith("'") and value.endswith("'"):
-                            value = value[1:-1]
-                        params[key] = value
+        params = dict(_parse_params(input_str))
 
-        except Exception as e:
-            logger.error(f"Error parsing tool input '{input_str}': {e}")
+        # A single key=value token, the most common input, holds no date
+        # phrase; the digits of permIds such as "20240101-1" are no filter
+        if _SINGLE_PAIR_PATTERN.fullmatch(input_str.strip()):
+            return params
 
-        # Parse date filters from the input string
+        # Parse date filters from the input string; relative phrases such as
+        # "last month" depend on today's date, so these are never cached
         params.update(self._parse_date_filters(input_str))
 
         return params
@@ -3348,49 +3457,34 @@ class PyBISToolManager:
         """Parse date-related filters from input string."""
         filters = {}
         input_lower = input_str.lower()
+        if not _DATE_HINT_PATTERN.search(input_lower):
+            return filters
 
-        # Parse month/year patterns like "February 2024", "Feb 2024", "2024-02"
-        month_year_patterns = [
-            r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{4})',
-            r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{4})',
-            r'(\d{4})-(\d{1,2})',
-            r'(\d{1,2})/(\d{4})'
-        ]
-
-        for pattern in month_year_patterns:
-            match = re.search(pattern, input_lower)
+        for pattern, year_first in _MONTH_YEAR_PATTERNS:
+            match = pattern.search(input_lower)
             if match:
-                if pattern.startswith(r'(\d{4})'):  # Year-month format
-                    year, month = match.groups()
-                    filters['year'] = int(year)
-                    filters['month'] = int(month)
-                elif pattern.endswith(r'(\d{4})'):  # Month-year format
+                if year_first:
+                    year, month_str = match.groups()
+                else:
                     month_str, year = match.groups()
-                    filters['year'] = int(year)
-                    if month_str.isdigit():
-                        filters['month'] = int(month_str)
-                    else:
-                        # Convert month name to number
-                        month_names = {
-                            'january': 1, 'jan': 1, 'february': 2, 'feb': 2,
-                            'march': 3, 'mar': 3, 'april': 4, 'apr': 4,
-                            'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
-                            'august': 8, 'aug': 8, 'september': 9, 'sep': 9,
-                            'october': 10, 'oct': 10, 'november': 11, 'nov': 11,
-                            'december': 12, 'dec': 12
-                        }
-                        filters['month'] = month_names.get(month_str, None)
+                filters['year'] = int(year)
+                if month_str.isdigit():
+                    filters['month'] = int(month_str)
+                else:
+                    filters['month'] = _MONTH_NUMBERS.get(month_str)
                 break
 
-        # Parse year-only patterns like "2024", "in 2023"
         if 'year' not in filters:
-            year_match = re.search(r'\b(20\d{2})\b', input_lower)
+            year_match = _YEAR_PATTERN.search(input_lower)
             if year_match:
                 filters['year'] = int(year_match.group(1))
 
         # Parse relative date patterns like "last month", "this year"
+        if 'month' not in input_lower and 'year' not in input_lower:
+            return filters
+
+        now = datetime.now()
         if 'last month' in input_lower:
-            now = datetime.now()
             if now.month == 1:
                 filters['year'] = now.year - 1
                 filters['month'] = 12
@@ -3399,18 +3493,59 @@ class PyBISToolManager:
                 filters['month'] = now.month - 1
 
         if 'this month' in input_lower:
-            now = datetime.now()
             filters['year'] = now.year
             filters['month'] = now.month
 
         if 'this year' in input_lower:
-            filters['year'] = datetime.now().year
+            filters['year'] = now.year
 
         if 'last year' in input_lower:
-            filters['year'] = datetime.now().year - 1
+            filters['year'] = now.year - 1
 
         return filters
 
+    def _iter_paged(self, fetch, page_size: int = PAGE_SIZE):
+        """Yield every entity of a pybis list call, fetching one page at a time.
+
+        Args:
+            fetch: pybis list call accepting ``start_with`` and ``count``
+            page_size: number of entities requested per call
+        """
+        start_with = 0
+        while True:
+            page_items = list(fetch(start_with=start_with, count=page_size))
+            yield from page_items
+            if len(page_items) < page_size:
+                return
+            start_with += len(page_items)
+
+    def _fetch_paged(self, fetch, limit: int, page_size: int = PAGE_SIZE) -> Tuple[List[Any], int]:
+        """Fetch at most ``limit`` entities using server-side paging.
+
+        Args:
+            fetch: pybis list call accepting ``start_with`` and ``count``
+            limit: maximum number of entities to fetch
+            page_size: maximum number of entities requested per call
+
+        Returns:
+            The fetched entities and the total number of matches on the server
+        """
+        items = []
+        total_count = None
+        while len(items) < limit:
+            count = min(page_size, limit - len(items))
+            page = fetch(start_with=len(items), count=count)
+            if total_count is None:
+                total_count = getattr(page, 'totalCount', None)
+            page_items = list(page)
+            items.extend(page_items)
+            if len(page_items) < count:
+                break
+
+        if not isinstance(total_count, int):
+            total_count = len(items)
+        return items, max(total_count, len(items))
+
     def _filter_by_date(self, items, date_filters: Dict[str, Any]):
         """Filter items by registration date based on parsed date filters."""
         if not date_filters or not items:
@@ -3428,25 +3563,28 @@ class PyBISToolManager:
             if not items_list:
                 return items
 
+            if PANDAS_AVAILABLE:
+                # Use the DataFrame pybis already built when it lines up with the items
+                df = getattr(items, 'df', None)
+                if df is not None and 'registrationDate' in df.columns and len(df) == len(items_list):
+                    dates = df['registrationDate'].to_numpy()
+                else:
+                    dates = [_field(item, 'registrationDate') for item in items_list]
+                mask = _date_mask(dates, date_filters)
+                return [item for item, keep in zip(items_list, mask) if keep]
+
             # Filter items by date
             filtered_items = []
             for item in items_list:
                 try:
-                    reg_date_str = getattr(item, 'registrationDate', None)
+                    reg_date_str = _field(item, 'registrationDate')
                     if not reg_date_str:
                         continue
 
                     # Parse the registration date
                     if isinstance(reg_date_str, str):
-                        # Handle different date formats
-                        if 'T' in reg_date_str:
-                            # ISO format: 2024-07-08T13:45:35 or 2024-07-08 13:45:35
-                            date_part = reg_date_str.split('T')[0] if 'T' in reg_date_str else reg_date_str.split(' ')[0]
-                        else:
-                            date_part = reg_date_str.split(' ')[0]
-
-                        # Parse YYYY-MM-DD format
-                        year, month, _ = map(int, date_part.split('-'))
+                        # Dates start with YYYY-MM-DD, followed by 'T' or ' ' and the time
+                        year, month = int(reg_date_str[:4]), int(reg_date_str[5:7])
 
                         # Check year filter
                         if 'year' in date_filters and year != date_filters['year']:
@@ -3459,22 +3597,37 @@ class PyBISToolManager:
                         # Item passed all filters
                         filtered_items.append(item)
 
-                except Exception as e:
-                    # If we can't parse the date, skip this item
-                    logger.debug(f"Could not parse date for item {getattr(item, 'identifier', 'unknown')}: {e}")
+                except (ValueError, TypeError) as e:
+                    # If we can't parse the date, skip this item; the identifier
+                    # is only looked up when the message is logged
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Could not parse date for item %s: %s", _field(item, 'identifier', 'unknown'), e)
                     continue
 
             return filtered_items
 
-        except Exception as e:
-            logger.warning(f"Date filtering failed: {e}")
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Date filtering failed: %s", e)
             return items
 
 
+@functools.lru_cache(maxsize=1)
+def _shared_manager() -> PyBISToolManager:
+    """Return the tool manager behind get_available_tools, created on first use."""
+    return PyBISToolManager()
+
+
 def get_available_tools() -> List[Tool]:
-    """Get list of available pybis tools."""
+    """Get list of available pybis tools.
+
+    The tools are built once and shared by later calls.
+    """
     if not PYBIS_AVAILABLE:
         return []
 
-    manager = PyBISToolManager()
-    return manager.get_tools()
+    return _shared_manager().get_tools()
+
+
+def reset_tools() -> None:
+    """Drop the shared tool manager so the next get_available_tools call builds a new one."""
+    _shared_manager.cache_clear()
@@ -6,6 +6,7 @@ Flask web application for chatBIS.
 import os
 import logging
 from pathlib import Path
+from dotenv import load_dotenv
 from flask import Flask, render_template, request, jsonify, session
 
 from chatBIS.query.query import RAGQueryEngine
@@ -30,6 +31,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Load environment variables
+load_dotenv()
+
 # Default paths
 DEFAULT_DATA_DIR = os.path.join(os.getcwd(), "data", "processed")
 
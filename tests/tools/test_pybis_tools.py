@@ -0,0 +1,1045 @@
+"""
+Unit tests for the PyBISToolManager class.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from src.chatBIS.tools.pybis_tools import (
+    BatchLoader,
+    FILE_DISPLAY_LIMIT,
+    LIST_DISPLAY_LIMIT,
+    MAX_FETCH_WORKERS,
+    PersistentTTLCache,
+    PyBISConnection,
+    PyBISToolManager,
+    READ_ONLY_TOOLS,
+    TTLCache,
+    _create_http_session,
+    _env_credentials,
+    _format_date_filter,
+    _install_pooled_transport,
+    get_available_tools,
+    reset_tools,
+)
+
+
+@pytest.fixture
+def manager():
+    """Create a tool manager with a mocked, already connected openBIS connection."""
+    manager = PyBISToolManager()
+    manager.connection = PyBISConnection()
+    manager.connection.openbis = MagicMock()
+    manager.connection.is_connected = True
+    manager.connection.server_url = "https://openbis.example.com"
+    manager.connection.username = "tester"
+    return manager
+
+
+class TestPyBISToolManager:
+    """Tests for the PyBISToolManager class."""
+
+    def test_read_only_tools_have_coroutines(self, manager):
+        """Test that only read-only tools get an async entry point."""
+        for tool in manager.get_tools():
+            if tool.name in READ_ONLY_TOOLS:
+                assert tool.coroutine is not None
+            else:
+                assert tool.coroutine is None
+
+    def test_available_tools_built_once(self):
+        """Test that get_available_tools reuses its tools until they are reset."""
+        reset_tools()
+        tools = get_available_tools()
+
+        assert get_available_tools() is tools
+        reset_tools()
+        assert get_available_tools() is not tools
+
+    def test_arun_tools(self, manager):
+        """Test running several read-only tools concurrently."""
+        space = MagicMock(code="LAB", description="")
+        manager.connection.openbis.get_spaces.return_value = [space]
+
+        results = asyncio.run(manager.arun_tools([
+            ("list_spaces", ""),
+            ("check_openbis_connection", ""),
+        ]))
+
+        assert results == [
+            "Found 1 spaces:\n1. LAB\n",
+            "Connected to openBIS at https://openbis.example.com as tester",
+        ]
+
+    def test_arun_tools_bounds_concurrency(self, manager):
+        """Test that no more than MAX_FETCH_WORKERS tools run at the same time."""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def get_spaces():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+            return []
+
+        manager.connection.openbis.get_spaces.side_effect = get_spaces
+
+        async def run_all():
+            # Give the loop more threads than the cap so the semaphore is what limits
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=4 * MAX_FETCH_WORKERS))
+            return await manager.arun_tools([("list_spaces", f"page={i}") for i in range(3 * MAX_FETCH_WORKERS)])
+
+        asyncio.run(run_all())
+
+        assert max(peak) <= MAX_FETCH_WORKERS
+
+    def test_arun_tools_rejects_write_tools(self, manager):
+        """Test that tools with side effects are not run concurrently."""
+        results = asyncio.run(manager.arun_tools([("create_space", "space_code=LAB")]))
+
+        assert "cannot run concurrently" in results[0]
+        manager.connection.openbis.new_space.assert_not_called()
+
+    def test_catalog_tools_are_cached(self, manager):
+        """Test that masterdata listings are fetched once and then served from cache."""
+        sample_type = MagicMock(code="EXPERIMENTAL_STEP", description="")
+        manager.connection.openbis.get_sample_types.return_value = [sample_type]
+
+        first = manager._list_sample_types_tool("")
+        second = manager._list_sample_types_tool("")
+
+        assert first == second == "Found 1 sample types:\n1. EXPERIMENTAL_STEP\n"
+        manager.connection.openbis.get_sample_types.assert_called_once()
+
+    def test_masterdata_lookups_are_cached_per_argument(self, manager):
+        """Test that single masterdata lookups are cached per requested code."""
+        manager.connection.openbis.get_vocabulary.return_value = None
+
+        manager._get_vocabulary_tool("vocabulary_code=UNITS")
+        manager._get_vocabulary_tool("vocabulary_code=UNITS")
+        manager._get_vocabulary_tool("vocabulary_code=COLORS")
+
+        assert manager.connection.openbis.get_vocabulary.call_count == 2
+
+    def test_catalog_cache_cleared_on_disconnect(self, manager):
+        """Test that disconnecting drops cached catalog results."""
+        manager.connection.openbis.get_sample_types.return_value = []
+        manager._list_sample_types_tool("")
+
+        manager.disconnect()
+        manager.connection.is_connected = True
+        manager._list_sample_types_tool("")
+
+        assert manager.connection.openbis.get_sample_types.call_count == 2
+
+    def test_write_tools_clear_entity_cache(self, manager):
+        """Test that entity listings are cached until a tool modifies openBIS."""
+        manager.connection.openbis.get_spaces.return_value = []
+        tools = {tool.name: tool for tool in manager.get_tools()}
+
+        tools["list_spaces"].func("")
+        tools["list_spaces"].func("")
+        tools["create_space"].func("space_code=LAB")
+        tools["list_spaces"].func("")
+
+        assert manager.connection.openbis.get_spaces.call_count == 2
+
+    def test_entity_objects_reused_until_a_write(self, manager):
+        """Test that tools share a fetched entity until a tool modifies openBIS."""
+        manager.connection.openbis.get_dataset.return_value.is_marked_to_be_deleted.return_value = False
+        tools = {tool.name: tool for tool in manager.get_tools()}
+
+        tools["dataset_is_marked_to_be_deleted"].func("identifier=2024-1")
+        tools["dataset_get_file_list"].func("identifier=2024-1")
+        tools["dataset_archive"].func("identifier=2024-1")
+        tools["dataset_is_marked_to_be_deleted"].func("identifier=2024-1")
+
+        assert manager.connection.openbis.get_dataset.call_count == 2
+
+    def test_set_properties_saves_or_stages(self, manager):
+        """Test that set_properties saves by default and a deferred save reuses the staged sample."""
+        sample = manager.connection.openbis.get_sample.return_value
+        sample.configure_mock(identifier="/LAB/S1", permId="20240101-1")
+        sample.is_marked_to_be_deleted.return_value = False
+        tools = {tool.name: tool for tool in manager.get_tools()}
+
+        result = tools["sample_set_properties"].func("identifier=/LAB/S1")
+        assert result == "Successfully set and saved properties on sample: /LAB/S1"
+        sample.save.assert_called_once()
+
+        tools["sample_set_properties"].func("identifier=/LAB/S1, save=false")
+        assert sample.save.call_count == 1
+        tools["sample_save"].func("identifier=/LAB/S1")
+
+        assert sample.save.call_count == 2
+        assert manager.connection.openbis.get_sample.call_count == 2
+
+    def test_staged_edits_are_saved_together(self, manager):
+        """Test that several deferred edits end up on the one saved object."""
+        dataset = MagicMock(permId="2024-1")
+        dataset.is_marked_to_be_deleted.return_value = False
+        # Every fetch returns a fresh copy, as a real server would
+        manager.connection.openbis.get_dataset.side_effect = [dataset, MagicMock(), MagicMock()]
+        tools = {tool.name: tool for tool in manager.get_tools()}
+
+        tools["dataset_set_properties"].func("identifier=2024-1, save=false")
+        tools["dataset_set_properties"].func("identifier=2024-1, save=false")
+        tools["dataset_save"].func("identifier=2024-1")
+
+        manager.connection.openbis.get_dataset.assert_called_once()
+        assert dataset.set_properties.call_count == 2
+        dataset.save.assert_called_once()
+        assert manager.connection.staged_entities == {}
+
+    def test_staged_entity_found_by_identifier_or_perm_id(self, manager):
+        """Test that a change staged under the identifier is saved by the permId and the other way round."""
+        sample = MagicMock(identifier="/LAB/S1", permId="20240101-1")
+        sample.is_marked_to_be_deleted.return_value = False
+        manager.connection.openbis.get_sample.side_effect = [sample, MagicMock()]
+        tools = {tool.name: tool for tool in manager.get_tools()}
+
+        tools["sample_set_properties"].func("identifier=/lab/s1, save=false")
+        tools["sample_set_properties"].func("identifier=20240101-1, save=false")
+        assert list(manager.connection.staged_entities) == [("sample", "20240101-1")]
+        tools["sample_save"].func("identifier=/LAB/S1")
+
+        manager.connection.openbis.get_sample.assert_called_once()
+        assert sample.set_properties.call_count == 2
+        sample.save.assert_called_once()
+        assert manager.connection.staged_entities == {}
+
+    def test_deletion_mark_is_sent_on_save(self, manager):
+        """Test that saving a marked entity moves it to the trash instead of calling save()."""
+        dataset = manager.connection.openbis.get_dataset.return_value
+        dataset.permId = "2024-1"
+        dataset.is_marked_to_be_deleted.return_value = True
+        tools = {tool.name: tool for tool in manager.get_tools()}
+
+        tools["dataset_mark_to_be_deleted"].func("identifier=2024-1")
+        tools["dataset_set_properties"].func("identifier=2024-1")
+        status = tools["dataset_is_marked_to_be_deleted"].func("identifier=2024-1")
+        result = tools["dataset_save"].func("identifier=2024-1, reason=obsolete")
+
+        assert status == "Dataset '2024-1' is marked for deletion."
+        assert result == "Successfully deleted dataset: 2024-1 (it was marked for deletion)"
+        dataset.delete.assert_called_once_with("obsolete")
+        # Only the property edit was saved; pybis' save() would drop the mark
+        dataset.save.assert_called_once()
+        manager.connection.openbis.get_dataset.assert_called_once()
+        assert manager.connection.staged_entities == {}
+
+    def test_set_properties_checks_codes_first(self, manager):
+        """Test that property codes are matched case-insensitively and unknown codes stage nothing."""
+        sample = manager.connection.openbis.get_sample.return_value
+        sample.p = SimpleNamespace(_property_names={"name": {}, "notes": {}})
+
+        result = manager._set_entity_properties("sample", {"identifier": "/LAB/S1", "properties": {"NAME": "x", "COLOUR": "red"}})
+
+        assert result.startswith("Error: unknown properties for sample '/LAB/S1': colour.")
+        sample.set_properties.assert_not_called()
+
+        manager._set_entity_properties("sample", {"identifier": "/LAB/S1", "properties": {"NAME": "x"}})
+
+        sample.set_properties.assert_called_once_with({"name": "x"})
+
+    def test_background_download_reports_status(self, manager):
+        """Test that a download without waiting runs in the background until it is polled."""
+        release = threading.Event()
+        dataset = manager.connection.openbis.get_dataset.return_value
+        dataset.download.side_effect = lambda **kwargs: release.wait(5) and "/tmp/2024-1"
+
+        started = manager._dataset_download_tool("identifier=2024-1, wait_until_finished=false")
+        assert started.startswith("Started downloading dataset: 2024-1")
+        assert manager._dataset_download_status_tool("identifier=2024-1") == "Download of dataset '2024-1' is in progress."
+
+        release.set()
+        manager._downloads["2024-1"].result(timeout=5)
+
+        assert manager._dataset_download_status_tool("identifier=2024-1") == "Download of dataset '2024-1' finished: /tmp/2024-1"
+        assert dataset.download.call_args.kwargs["wait_until_finished"] is True
+
+    def test_user_space_reset_on_disconnect(self, manager):
+        """Test that the remembered user space is dropped on disconnect."""
+        manager._user_space = "TESTER"
+
+        manager._disconnect_tool("")
+
+        assert manager._user_space is None
+
+    def test_errors_are_not_cached(self, manager):
+        """Test that a failing catalog call is retried on the next invocation."""
+        manager.connection.openbis.get_vocabularies.side_effect = [RuntimeError("boom"), []]
+
+        assert manager._list_vocabularies_tool("").startswith("Error")
+        assert manager._list_vocabularies_tool("") == "No vocabularies found."
+
+    def test_tool_reports_exceptions(self, manager):
+        """Test that a failing pybis call is returned as the tool's error message."""
+        manager.connection.openbis.get_spaces.side_effect = RuntimeError("boom")
+
+        assert manager._list_spaces_tool("") == "Error listing spaces: boom"
+
+    def test_tool_reports_missing_connection(self, manager):
+        """Test that tools return an error instead of raising when not connected."""
+        manager.connection.is_connected = False
+        manager._auto_connect_attempted = True
+
+        result = manager._list_spaces_tool("")
+
+        assert result.startswith("Error: Not connected to openBIS")
+        manager.connection.openbis.get_spaces.assert_not_called()
+
+    def test_failed_auto_connect_is_retried(self, manager, monkeypatch):
+        """Test that a failed auto-connect is tried again with credentials set afterwards."""
+        manager.connection.is_connected = False
+        for name in ("OPENBIS_URL", "OPENBIS_USERNAME", "OPENBIS_PASSWORD"):
+            monkeypatch.delenv(name, raising=False)
+        _env_credentials.cache_clear()
+
+        assert manager._list_spaces_tool("").startswith("Error: Not connected to openBIS")
+
+        monkeypatch.setenv("OPENBIS_URL", "https://openbis.example.com")
+        monkeypatch.setenv("OPENBIS_USERNAME", "tester")
+        monkeypatch.setenv("OPENBIS_PASSWORD", "secret")
+        manager.connection.openbis.get_spaces.return_value = []
+
+        def connect(*args, **kwargs):
+            manager.connection.is_connected = True
+            return True
+
+        with patch.object(PyBISConnection, "connect", side_effect=connect):
+            result = manager._list_spaces_tool("")
+        _env_credentials.cache_clear()
+
+        assert result == "No spaces found."
+
+    @pytest.mark.parametrize("tool_name, getter, input_str, method, expected", [
+        ("sample_save", "get_sample", "identifier=/LAB/S1", "save",
+         "Successfully saved sample: /LAB/S1"),
+        ("space_mark_to_be_deleted", "get_space", "space_code=LAB", "mark_to_be_deleted",
+         "Successfully marked space 'LAB' for deletion."),
+        ("dataset_unmark_to_be_deleted", "get_dataset", "identifier=2024-1", "unmark_to_be_deleted",
+         "Successfully unmarked dataset '2024-1' for deletion."),
+    ])
+    def test_entity_action_tools(self, manager, tool_name, getter, input_str, method, expected):
+        """Test the table-driven entity action tools."""
+        tool = next(t for t in manager.get_tools() if t.name == tool_name)
+        entity = getattr(manager.connection.openbis, getter).return_value
+        entity.is_marked_to_be_deleted.return_value = False
+
+        assert tool.func(input_str) == expected
+        getattr(entity, method).assert_called_once_with()
+
+    def test_entity_delete_passes_reason(self, manager):
+        """Test that delete forwards reason and permanently."""
+        tool = next(t for t in manager.get_tools() if t.name == "project_delete")
+        project = manager.connection.openbis.get_project.return_value
+
+        result = tool.func("identifier=/LAB/P1, reason=cleanup, permanently=true")
+
+        assert result == "Successfully deleted project: /LAB/P1"
+        project.delete.assert_called_once_with(reason="cleanup", permanently=True)
+
+    def test_entity_action_requires_identifier(self, manager):
+        """Test that a missing identifier is reported."""
+        tool = next(t for t in manager.get_tools() if t.name == "space_save")
+
+        assert tool.func("") == "Error: space_code parameter is required."
+
+    def test_session_active_check_is_cached(self, manager):
+        """Test that an active session is not re-checked on the server right away."""
+        manager.connection.openbis.is_session_active.return_value = True
+
+        assert manager._openbis_is_session_active_tool("") == "Session is active"
+        assert manager._openbis_is_session_active_tool("") == "Session is active"
+        manager.connection.openbis.is_session_active.assert_called_once()
+
+    def test_inactive_session_is_rechecked(self, manager):
+        """Test that an inactive session result is not cached."""
+        manager.connection.openbis.is_session_active.side_effect = [False, True]
+
+        assert manager._openbis_is_session_active_tool("") == "Session is not active"
+        assert manager._openbis_is_session_active_tool("") == "Session is active"
+
+    def test_list_samples_limit_skips_missing_dates(self, manager):
+        """Test that samples without a registration date sort last instead of failing."""
+        manager.connection.openbis.get_samples.return_value = [
+            {"identifier": "/LAB/S1", "type": "SAMPLE", "registrationDate": None},
+            {"identifier": "/LAB/S2", "type": "SAMPLE", "registrationDate": "2024-02-05 10:00:00"},
+        ]
+
+        result = manager._list_samples_tool("limit=1")
+
+        assert result == "Showing 1 most recent samples (out of 2 total):\n1. /LAB/S2 (SAMPLE) - 2024-02-05 10:00:00\n"
+
+    def test_list_experiments_reads_dataframe(self, manager):
+        """Test that list_experiments formats rows straight from the pybis DataFrame."""
+        df = pd.DataFrame([
+            {"identifier": "/LAB/P/E1", "type": "EXP", "registrationDate": "2024-01-05 10:00:00"},
+            {"identifier": "/LAB/P/E2", "type": "EXP", "registrationDate": "2024-02-05 10:00:00"},
+        ])
+        manager.connection.openbis.get_experiments.return_value = SimpleNamespace(df=df)
+
+        result = manager._list_experiments_tool("space=LAB")
+
+        assert result == "Found 2 experiments:\n1. /LAB/P/E1 (EXP)\n2. /LAB/P/E2 (EXP)\n"
+
+    def test_get_persons_reads_dataframe(self, manager):
+        """Test that persons are formatted from the listing instead of fetched one by one."""
+        persons = MagicMock()
+        persons.df = pd.DataFrame([
+            {"userId": "alice", "firstName": "Alice", "lastName": None, "email": "alice@example.com"},
+            {"userId": "bob", "firstName": None, "lastName": None, "email": None},
+        ])
+        persons.__len__.return_value = 2
+        manager.connection.openbis.get_persons.return_value = persons
+
+        result = manager._openbis_get_persons_tool("")
+
+        assert result == "Found 2 persons:\n1. alice (Alice) - alice@example.com\n2. bob\n"
+        persons.__iter__.assert_not_called()
+
+    def test_get_datastores_reads_dataframe(self, manager):
+        """Test that the data store DataFrame is listed row by row."""
+        manager.connection.openbis.get_datastores.return_value = pd.DataFrame([
+            {"code": "DSS1", "downloadUrl": "https://dss.example.com", "remoteUrl": None},
+        ])
+
+        result = manager._openbis_get_datastores_tool("")
+
+        assert result == "Found 1 data stores:\n1. DSS1 (https://dss.example.com)\n"
+
+    def test_related_listing_labels_rows_by_first_row(self, manager):
+        """Test that the label attribute is chosen on the first row and used for all rows."""
+        datasets = [SimpleNamespace(code=None, permId="2024-1"), SimpleNamespace(code="DS2", permId="2024-2")]
+        manager.connection.openbis.get_datasets.return_value = datasets
+
+        result = manager._sample_get_datasets_tool("identifier=/LAB/S1")
+
+        assert result == "Found 2 datasets for sample '/LAB/S1':\n1. 2024-1\n2. 2024-2\n"
+
+    def test_related_listing_reads_dataframe(self, manager):
+        """Test that related listings read labels from the result DataFrame instead of iterating objects."""
+        experiments = MagicMock(df=pd.DataFrame({"identifier": ["/LAB/P/E1", "/LAB/P/E2"]}))
+        experiments.__len__.return_value = 2
+        manager.connection.openbis.get_experiments.return_value = experiments
+
+        result = manager._space_get_experiments_tool("space_code=LAB")
+
+        assert result == "Found 2 experiments in space 'LAB':\n1. /LAB/P/E1\n2. /LAB/P/E2\n"
+        experiments.__iter__.assert_not_called()
+
+    def test_related_listing_pages_on_server(self, manager):
+        """Test that a page of a related listing is requested from the server with its offset."""
+        samples = MagicMock(df=pd.DataFrame({"identifier": ["/LAB/S51"]}), totalCount=120)
+        samples.__len__.return_value = 1
+        manager.connection.openbis.get_samples.return_value = samples
+        manager.connection.openbis.get_project.return_value.permId = "20240101-1"
+
+        result = manager._project_get_samples_tool("identifier=/LAB/P, page=2")
+
+        manager.connection.openbis.get_samples.assert_called_once_with(
+            project="20240101-1", start_with=LIST_DISPLAY_LIMIT, count=LIST_DISPLAY_LIMIT
+        )
+        assert result.splitlines()[1] == f"{LIST_DISPLAY_LIMIT + 1}. /LAB/S51"
+        assert result.splitlines()[-1] == f"... (showing {LIST_DISPLAY_LIMIT + 1}-{LIST_DISPLAY_LIMIT + 1} of 120 results; use page=3 for more)"
+
+    def test_related_listing_as_json(self, manager):
+        """Test that a related listing can be returned as compact JSON."""
+        manager.connection.openbis.get_datasets.return_value = [SimpleNamespace(code="DS1"), SimpleNamespace(code="DS2")]
+
+        result = manager._sample_get_datasets_tool("identifier=/LAB/S1, format=json")
+
+        assert result == '{"sample":"/LAB/S1","datasets":["DS1","DS2"],"total":2,"offset":0}'
+
+    def test_related_listing_searches_from_filter_start(self, manager):
+        """Test that a date-filtered related listing searches from the start of the month."""
+        manager.connection.openbis.get_samples.return_value = [
+            SimpleNamespace(identifier="/LAB/S1", registrationDate="2024-02-03 10:00:00"),
+            SimpleNamespace(identifier="/LAB/S2", registrationDate="2024-03-01 09:00:00"),
+        ]
+        manager.connection.openbis.get_project.return_value.permId = "20240101-1"
+
+        result = manager._project_get_samples_tool("identifier=/LAB/P, samples in February 2024")
+
+        manager.connection.openbis.get_samples.assert_called_once_with(
+            project="20240101-1", registrationDate=">=2024-02-01"
+        )
+        assert result == "Found 1 samples from February 2024 in project '/LAB/P':\n1. /LAB/S1\n"
+
+    def test_date_filtered_listing_reads_dataframe(self, manager):
+        """Test that a date-filtered listing filters and pages the DataFrame without iterating entities."""
+        experiments = MagicMock(df=pd.DataFrame({
+            "identifier": ["/LAB/P/E1", "/LAB/P/E2"],
+            "registrationDate": ["2024-02-03 10:00:00", "2024-03-01 09:00:00"],
+        }))
+        manager.connection.openbis.get_experiments.return_value = experiments
+
+        result = manager._project_get_experiments_tool("identifier=/LAB/P, experiments in February 2024")
+
+        assert result == "Found 1 experiments from February 2024 in project '/LAB/P':\n1. /LAB/P/E1\n"
+        experiments.__iter__.assert_not_called()
+
+    def test_project_contents_lists_each_kind(self, manager):
+        """Test that the project contents tool reports experiments, samples and datasets together."""
+        manager.connection.openbis.get_experiments.return_value = [SimpleNamespace(identifier="/LAB/P/E1")]
+        manager.connection.openbis.get_samples.return_value = []
+        manager.connection.openbis.get_datasets.return_value = [SimpleNamespace(code="DS1")]
+
+        result = manager._project_get_contents_tool("identifier=/LAB/P")
+
+        assert result == (
+            "Found 1 experiments in project '/LAB/P':\n1. /LAB/P/E1\n\n"
+            "No samples found in project '/LAB/P'.\n"
+            "Found 1 datasets in project '/LAB/P':\n1. DS1\n"
+        )
+
+    def test_dataset_files_listing_is_capped(self, manager):
+        """Test that dataset file listings show the first files and the total."""
+        manager.connection.openbis.get_dataset.return_value.get_files.return_value = pd.DataFrame(
+            {"pathInDataSet": [f"f{i}.txt" for i in range(25)], "fileSize": range(25)}
+        )
+
+        result = manager._dataset_get_files_tool("identifier=2024-1")
+
+        lines = result.splitlines()
+        assert lines[1] == "1. f0.txt (0 bytes)"
+        assert len(lines) == 1 + FILE_DISPLAY_LIMIT + 1
+        assert lines[-1] == f"... (showing first {FILE_DISPLAY_LIMIT} of 25 files)"
+
+    def test_dataset_files_filtered_by_start_folder(self, manager):
+        """Test that only files below start_folder are listed."""
+        manager.connection.openbis.get_dataset.return_value.get_files.return_value = pd.DataFrame(
+            {"pathInDataSet": ["original", "original/a.txt", "original2/c.txt", "originals.txt", "meta/b.txt"],
+             "fileSize": [0, 1, 3, 4, 2]}
+        )
+
+        result = manager._dataset_get_files_tool("identifier=2024-1, start_folder=/original")
+
+        assert result == "Found 2 files in dataset '2024-1':\n1. original (0 bytes)\n2. original/a.txt (1 bytes)\n"
+
+    def test_dataset_files_numeric_start_folder(self, manager):
+        """Test that a start_folder parsed as a number still filters the files."""
+        manager.connection.openbis.get_dataset.return_value.get_files.return_value = pd.DataFrame(
+            {"pathInDataSet": ["2024/a.txt", "2025/b.txt"], "fileSize": [1, 2]}
+        )
+
+        result = manager._dataset_get_files_tool("identifier=2024-1, start_folder=2024")
+
+        assert result == "Found 1 files in dataset '2024-1':\n1. 2024/a.txt (1 bytes)\n"
+
+    def test_list_samples_bounds_date_on_server(self, manager):
+        """Test that a month filter sends its start date to openBIS."""
+        manager.connection.openbis.get_samples.return_value = []
+
+        manager._list_samples_tool("samples from February 2024")
+
+        assert manager.connection.openbis.get_samples.call_args.kwargs["registrationDate"] == ">=2024-02-01"
+
+    def test_get_project_formats_set_fields(self, manager):
+        """Test that get_project lists the project fields that have a value."""
+        manager.connection.openbis.get_project.return_value = MagicMock(
+            identifier="/LAB/P1", code="P1", space="LAB", description="",
+            registrator="tester", registrationDate="2024-01-05 10:00:00"
+        )
+
+        result = manager._get_project_tool("project_identifier=/LAB/P1")
+
+        assert result == (
+            "Project: /LAB/P1\nCode: P1\nSpace: LAB\n"
+            "Registrator: tester\nRegistration Date: 2024-01-05 10:00:00\n"
+        )
+
+    def test_server_information_skips_missing_fields(self, manager):
+        """Test that server information lists the fields it has, including False ones."""
+        manager.connection.openbis.get_server_information.return_value = SimpleNamespace(
+            major_version=3, minor_version=6, project_samples_enabled=False
+        )
+
+        result = manager._openbis_get_server_information_tool()
+
+        assert result == "Server Information:\nVersion: 3.6\nProject Samples Enabled: False\n"
+
+    def test_session_info_truncates_token(self, manager):
+        """Test that only the start of the session token is shown."""
+        manager.connection.openbis.get_session_info.return_value = SimpleNamespace(
+            userName="tester", sessionToken="tester-" + "x" * 40
+        )
+
+        result = manager._openbis_get_session_info_tool()
+
+        assert result == "Session Information:\nUser: tester\nSession Token: tester-xxxxxxxxxxxxx...\n"
+
+    def test_get_sample_type_formats_field_table(self, manager):
+        """Test that sample type details come from the field table."""
+        sample_type = MagicMock(code="EXPERIMENTAL_STEP", description="", generatedCodePrefix="EXP",
+                                autoGeneratedCode=False)
+        sample_type.get_property_assignments.return_value = []
+        manager.connection.openbis.get_sample_type.return_value = sample_type
+
+        result = manager._get_sample_type_tool("sample_type_code=EXPERIMENTAL_STEP")
+
+        assert result == ("Sample Type: EXPERIMENTAL_STEP\n"
+                          "Generated Code Prefix: EXP\n"
+                          "Auto Generated Code: False\n")
+
+    def test_long_listings_are_truncated(self, manager):
+        """Test that masterdata listings only format the first entries."""
+        manager.connection.openbis.get_tags.return_value = [
+            MagicMock(code=f"TAG{i}", description=None) for i in range(LIST_DISPLAY_LIMIT + 10)
+        ]
+
+        result = manager._openbis_get_tags_tool("")
+
+        assert result.startswith(f"Found {LIST_DISPLAY_LIMIT + 10} tags:\n")
+        assert f"{LIST_DISPLAY_LIMIT}. TAG{LIST_DISPLAY_LIMIT - 1}\n" in result
+        assert f"TAG{LIST_DISPLAY_LIMIT}\n" not in result
+        assert result.endswith(f"(showing first {LIST_DISPLAY_LIMIT} of {LIST_DISPLAY_LIMIT + 10} results)\n")
+
+    def test_create_dataset_returns_details(self, manager):
+        """Test that creating a dataset reports its details without another fetch."""
+        dataset = MagicMock(code="20240101-1", type="RAW_DATA", properties={"$name": "scan"})
+        manager.connection.openbis.new_dataset.return_value = dataset
+
+        result = manager._create_dataset_tool("dataset_type=RAW_DATA, sample=/LAB/S1")
+
+        dataset.save.assert_called_once()
+        assert result == ("Successfully created dataset: 20240101-1\n"
+                          "Dataset: 20240101-1\nType: RAW_DATA\nProperties:\n  $name: scan\n")
+        manager.connection.openbis.get_dataset.assert_not_called()
+
+    def test_get_entities_keeps_order(self, manager):
+        """Test that concurrently fetched entities come back in request order."""
+        manager.connection.openbis.get_sample.side_effect = lambda identifier: f"sample {identifier}"
+
+        samples = manager.get_entities("sample", ["/LAB/S1", "/LAB/S2", "/LAB/S3"])
+
+        assert samples == ["sample /LAB/S1", "sample /LAB/S2", "sample /LAB/S3"]
+
+    def test_experiment_add_samples(self, manager):
+        """Test adding several samples to an experiment."""
+        s1 = MagicMock(identifier="/LAB/S1", permId="2024-1")
+        s2 = MagicMock(identifier="/LAB/S2", permId="2024-2")
+        manager.connection.openbis.get_sample.return_value = [s2, s1]
+        experiment = manager.connection.openbis.get_experiment.return_value
+
+        result = manager._experiment_add_samples_tool("identifier=/LAB/P/E1, samples=/LAB/S1 /LAB/S2 /lab/s1 /LAB/S3")
+
+        manager.connection.openbis.get_sample.assert_called_once_with(["/LAB/S1", "/LAB/S2", "/LAB/S3"])
+        assert result == "Successfully added 2 samples to experiment: /LAB/P/E1 (not found: /LAB/S3)"
+        experiment.add_samples.assert_called_once_with(s1, s2)
+
+    def test_list_samples_reads_dataframe(self, manager):
+        """Test that list_samples formats rows straight from the pybis DataFrame."""
+        df = pd.DataFrame([
+            {"identifier": "/LAB/S1", "type": "SAMPLE", "registrationDate": "2024-01-05 10:00:00", "permId": "1"},
+            {"identifier": "/LAB/S2", "type": "SAMPLE", "registrationDate": "2024-02-05 10:00:00", "permId": "2"},
+        ])
+        manager.connection.openbis.get_samples.return_value = SimpleNamespace(df=df)
+
+        result = manager._list_samples_tool("limit=1")
+
+        assert result == "Showing 1 most recent samples (out of 2 total):\n1. /LAB/S2 (SAMPLE) - 2024-02-05 10:00:00\n"
+
+    def test_permids_are_fetched_in_batches(self, manager):
+        """Test that permIds are handed out from one batched server request."""
+        manager.connection.openbis._post_request.return_value = ["20240101-1", "20240101-2"]
+
+        first = manager._openbis_create_permid_tool("")
+        second = manager._openbis_create_permid_tool("")
+
+        assert first == "Generated new permanent ID: 20240101-1"
+        assert second == "Generated new permanent ID: 20240101-2"
+        manager.connection.openbis._post_request.assert_called_once()
+
+    def test_get_sample_tool_fetches_samples_in_one_request(self, manager):
+        """Test that concurrent get_sample calls become one pybis request."""
+        samples = [
+            MagicMock(identifier=f"/LAB/S{i}", permId=f"2024-{i}", type="T", space="LAB", properties={})
+            for i in range(3)
+        ]
+        manager.connection.openbis.get_sample.return_value = samples
+        manager._sample_loader.window = 0.05
+
+        results = asyncio.run(manager.arun_tools(
+            [("get_sample", f"sample_identifier=/lab/S{i}") for i in range(3)]
+        ))
+
+        manager.connection.openbis.get_sample.assert_called_once()
+        assert [result.splitlines()[0] for result in results] == [
+            "Sample: /LAB/S0", "Sample: /LAB/S1", "Sample: /LAB/S2"
+        ]
+
+    def test_get_sample_served_from_detailed_listing(self, manager):
+        """Test that a sample listed with all properties is not fetched again."""
+        sample = MagicMock(identifier="/LAB/S1", permId="2024-1", type="T", space="LAB", properties={})
+        manager.connection.openbis.get_samples.return_value = [sample]
+
+        manager._list_samples_detailed_tool("space=LAB")
+        result = manager._get_sample_tool("sample_identifier=/lab/s1")
+
+        assert result.startswith("Sample: /LAB/S1")
+        manager.connection.openbis.get_sample.assert_not_called()
+
+
+class TestTTLCache:
+    """Tests for the TTLCache class."""
+
+    def test_expired_entries_are_dropped(self):
+        """Test that entries are not returned after their TTL."""
+        cache = TTLCache(ttl=0)
+        cache.set("key", "value")
+
+        assert cache.get("key") == (False, None)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache never grows beyond maxsize."""
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == (True, 1)
+        assert cache.get("b") == (False, None)
+        assert cache.get("c") == (True, 3)
+
+
+class TestPersistentTTLCache:
+    """Tests for the PersistentTTLCache class."""
+
+    def test_entries_survive_a_new_instance(self, tmp_path):
+        """Test that a fresh cache on the same file serves stored entries."""
+        path = str(tmp_path / "cache.sqlite")
+        PersistentTTLCache(path, ttl=60).set(("server", "user", "tool", ""), "result")
+
+        assert PersistentTTLCache(path, ttl=60).get(("server", "user", "tool", "")) == (True, "result")
+
+    def test_expired_entries_are_not_loaded(self, tmp_path):
+        """Test that expired entries on disk are ignored."""
+        path = str(tmp_path / "cache.sqlite")
+        PersistentTTLCache(path, ttl=0).set("key", "value")
+
+        assert PersistentTTLCache(path, ttl=60).get("key") == (False, None)
+
+    def test_file_is_private(self, tmp_path):
+        """Test that the cache file is only readable by its owner."""
+        path = tmp_path / "cache.db"
+        PersistentTTLCache(str(path), ttl=60)
+
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    @patch("src.chatBIS.tools.pybis_tools.pybis")
+    def test_only_catalog_is_persisted(self, mock_pybis, tmp_path, monkeypatch):
+        """Test that a configured cache file holds the catalog but not entity results."""
+        monkeypatch.setenv("CHATBIS_CACHE_PATH", str(tmp_path / "cache.sqlite"))
+        connection = PyBISConnection()
+        connection.connect("https://host", "user", "secret")
+
+        assert isinstance(connection.catalog_cache, PersistentTTLCache)
+        assert not isinstance(connection.entity_cache, PersistentTTLCache)
+
+    def test_purge_is_scoped_to_server_and_user(self, tmp_path):
+        """Test that purging for one server and user keeps the entries of others."""
+        path = str(tmp_path / "cache.sqlite")
+        cache = PersistentTTLCache(path, ttl=60)
+        cache.set(("https://a", "alice", "tool", ""), "a")
+        cache.set(("https://a", "bob", "tool", ""), "b")
+
+        cache.purge("https://a", "alice")
+
+        assert cache.get(("https://a", "alice", "tool", "")) == (False, None)
+        assert PersistentTTLCache(path, ttl=60).get(("https://a", "bob", "tool", "")) == (True, "b")
+
+    def test_purge_drops_entries_on_disk(self, tmp_path):
+        """Test that purging removes only the entries of the cache's own table."""
+        path = str(tmp_path / "cache.sqlite")
+        PersistentTTLCache(path, ttl=60).set("key", "catalog")
+        entities = PersistentTTLCache(path, ttl=60, table="entity_cache")
+        entities.set("key", "entity")
+
+        entities.purge()
+
+        assert PersistentTTLCache(path, ttl=60, table="entity_cache").get("key") == (False, None)
+        assert PersistentTTLCache(path, ttl=60).get("key") == (True, "catalog")
+
+
+class TestBatchLoader:
+    """Tests for the BatchLoader class."""
+
+    def test_concurrent_loads_share_one_fetch(self):
+        """Test that loads arriving within the window are fetched together."""
+        fetch_many = MagicMock(side_effect=lambda keys: {key: key.lower() for key in keys})
+        loader = BatchLoader(fetch_many, window=0.05)
+
+        with loader.batching(), ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(loader.load, ["A", "B", "C"]))
+
+        assert results == ["a", "b", "c"]
+        fetch_many.assert_called_once()
+        assert sorted(fetch_many.call_args[0][0]) == ["A", "B", "C"]
+
+    def test_fetch_errors_reach_every_caller(self):
+        """Test that a failing fetch is raised from load."""
+        loader = BatchLoader(MagicMock(side_effect=ValueError("boom")), window=0)
+
+        with pytest.raises(ValueError, match="boom"):
+            loader.load("A")
+
+    def test_single_load_does_not_wait(self):
+        """Test that a load outside a batching block is fetched without waiting for others."""
+        loader = BatchLoader(lambda keys: {key: key.lower() for key in keys}, window=10)
+
+        start = time.monotonic()
+        assert loader.load("A") == "a"
+        assert time.monotonic() - start < 1
+
+
+class TestDateFilters:
+    """Tests for parsing date filters from tool input."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("samples in February 2024", {"year": 2024, "month": 2}),
+        ("samples in feb 2024", {"year": 2024, "month": 2}),
+        ("samples from 2024-03", {"year": 2024, "month": 3}),
+        ("samples from 04/2023", {"year": 2023, "month": 4}),
+        ("samples from 2023", {"year": 2023}),
+        ("all samples", {}),
+        ("identifier=/LAB/PROJECT", {}),
+    ])
+    def test_parse_date_filters(self, manager, text, expected):
+        """Test month/year and year-only patterns."""
+        assert manager._parse_date_filters(text) == expected
+
+    def test_relative_phrases_are_parsed(self, manager):
+        """Test that relative phrases without digits still set a filter."""
+        assert manager._parse_date_filters("samples from this year") == {"year": datetime.now().year}
+
+    @pytest.mark.parametrize("date_filters, expected", [
+        ({"year": 2024, "month": 2}, " from February 2024"),
+        ({"year": 2024}, " from 2024"),
+        ({}, ""),
+    ])
+    def test_format_date_filter(self, date_filters, expected):
+        """Test the date filter description used in tool output."""
+        assert _format_date_filter(date_filters) == expected
+
+    @pytest.mark.parametrize("date_filters, expected", [
+        ({"year": 2024, "month": 2}, ["/LAB/S2"]),
+        ({"year": 2024}, ["/LAB/S1", "/LAB/S2"]),
+        ({"month": 7}, ["/LAB/S3"]),
+    ])
+    def test_filter_by_date(self, manager, date_filters, expected):
+        """Test filtering records by registration date, skipping unparseable dates."""
+        records = [
+            {"identifier": "/LAB/S1", "registrationDate": "2024-01-05 10:00:00"},
+            {"identifier": "/LAB/S2", "registrationDate": "2024-02-05T10:00:00"},
+            {"identifier": "/LAB/S3", "registrationDate": "2023-07-01 09:00:00"},
+            {"identifier": "/LAB/S4", "registrationDate": "unknown"},
+        ]
+
+        filtered = manager._filter_by_date(records, date_filters)
+
+        assert [record["identifier"] for record in filtered] == expected
+
+    def test_filter_by_date_reads_dataframe_column(self, manager):
+        """Test that pybis results are filtered on their DataFrame column."""
+        projects = [MagicMock(identifier="/LAB/P1"), MagicMock(identifier="/LAB/P2")]
+        things = MagicMock()
+        things.__iter__.return_value = iter(projects)
+        things.__len__.return_value = 2
+        things.df = pd.DataFrame({"registrationDate": ["2024-02-01 10:00:00", "2023-02-01 10:00:00"]})
+
+        filtered = manager._filter_by_date(things, {"year": 2024})
+
+        assert filtered == [projects[0]]
+
+
+class TestParseToolInput:
+    """Tests for parsing tool input strings."""
+
+    def test_parse_tool_input(self, manager):
+        """Test key=value conversion and flags."""
+        params = manager._parse_tool_input("space='LAB', limit=5, show_properties=false, fields=NAME")
+
+        assert params == {"space": "LAB", "limit": 5, "show_properties": False, "fields": "NAME"}
+
+    def test_quoted_values_keep_commas(self, manager):
+        """Test that commas inside quotes stay in the value and stray apostrophes are tolerated."""
+        params = manager._parse_tool_input('identifier=/LAB/P, reason="Deleted, retired", permanently=true')
+
+        assert params == {"identifier": "/LAB/P", "reason": "Deleted, retired", "permanently": True}
+        assert manager._parse_tool_input("space=LAB, note=it's fine")["note"] == "it's fine"
+
+    def test_free_text_quotes_are_kept(self, manager):
+        """Test that apostrophes and quotes inside a description reach openBIS unchanged."""
+        params = manager._parse_tool_input("identifier=/LAB/S1, description=Bob's sample, note=it's done")
+
+        assert params["description"] == "Bob's sample"
+        assert params["note"] == "it's done"
+        assert manager._parse_tool_input('code=S1, description=say "hi" now')["description"] == 'say "hi" now'
+
+    def test_single_pair_has_no_date_filter(self, manager):
+        """Test that a lone identifier is not read as a date filter."""
+        assert manager._parse_tool_input("identifier=20240101-1") == {"identifier": "20240101-1"}
+        assert manager._parse_tool_input("identifier=/LAB/P, samples from 2023")["year"] == 2023
+
+    def test_parsed_params_are_not_shared(self, manager):
+        """Test that callers cannot modify the cached parse result."""
+        manager._parse_tool_input("space=LAB")["space"] = "OTHER"
+
+        assert manager._parse_tool_input("space=LAB") == {"space": "LAB"}
+
+
+class TestPaging:
+    """Tests for server-side paging of list calls."""
+
+    def test_fetch_paged_stops_at_limit(self, manager):
+        """Test that only the requested number of entities is fetched."""
+        entities = list(range(1200))
+        calls = []
+
+        def fetch(start_with, count):
+            calls.append((start_with, count))
+            return entities[start_with:start_with + count]
+
+        items, total_count = manager._fetch_paged(fetch, limit=700, page_size=500)
+
+        assert items == entities[:700]
+        assert calls == [(0, 500), (500, 200)]
+        # Plain lists carry no totalCount, so only what was fetched is known
+        assert total_count == 700
+
+    def test_iter_paged_walks_all_pages(self, manager):
+        """Test that every page is requested until a short page is returned."""
+        entities = list(range(1200))
+        calls = []
+
+        def fetch(start_with, count):
+            calls.append((start_with, count))
+            return entities[start_with:start_with + count]
+
+        assert list(manager._iter_paged(fetch, page_size=500)) == entities
+        assert calls == [(0, 500), (500, 500), (1000, 500)]
+
+    def test_list_datasets_uses_server_total(self, manager):
+        """Test that list_datasets pages and reports the server-side total."""
+        page = MagicMock()
+        page.totalCount = 120
+        page.__iter__.return_value = iter([
+            MagicMock(permId=f"2024-{i}", type="RAW_DATA", _sample=None, _experiment=None, _project=None, attrs=None)
+            for i in range(2)
+        ])
+        manager.connection.openbis.get_datasets.return_value = page
+
+        result = manager._list_datasets_tool("limit=2")
+
+        manager.connection.openbis.get_datasets.assert_called_once_with(type=None, start_with=0, count=2)
+        assert result.startswith("Found 120 datasets (showing first 2):\n1. 2024-0 (RAW_DATA)")
+
+    def test_list_datasets_reports_owner(self, manager):
+        """Test that list_datasets names the owning entity without lazy loading."""
+        attrs = MagicMock()
+        attrs.all.return_value = {'sample': None, 'experiment': "/LAB/PROJ/EXP1"}
+        manager.connection.openbis.get_datasets.return_value = [
+            MagicMock(permId="2024-1", type="RAW_DATA", _sample={'identifier': "/LAB/S1"}),
+            MagicMock(permId="2024-2", type="RAW_DATA", _sample=None, _experiment=None, _project=None, attrs=attrs),
+        ]
+
+        result = manager._list_datasets_tool("limit=5")
+
+        assert "1. 2024-1 (RAW_DATA) → Sample: S1\n" in result
+        assert "2. 2024-2 (RAW_DATA) → Experiment: EXP1\n" in result
+
+    def test_list_samples_detailed_pages_limited_listing(self, manager):
+        """Test that a limited detailed listing only fetches the rows it shows."""
+        page = MagicMock()
+        page.totalCount = 40
+        page.__iter__.return_value = iter([
+            MagicMock(identifier="/LAB/S1", permId="2024-1", type="T", space="LAB", properties={})
+        ])
+        manager.connection.openbis.get_samples.return_value = page
+
+        result = manager._list_samples_detailed_tool("space=LAB, limit=1")
+
+        assert manager.connection.openbis.get_samples.call_args.kwargs["count"] == 1
+        assert result.startswith("Found 40 samples (showing 1 with details):")
+
+
+class TestHTTPSession:
+    """Tests for sending pybis requests over a shared session."""
+
+    def test_pybis_posts_through_pooled_session(self):
+        """Test that pybis' own JSON-RPC call goes through the pooled session.
+
+        Fails when pybis stops posting with the module-level requests.post,
+        e.g. after an upgrade past the pinned version.
+        """
+        import pybis
+
+        session = _install_pooled_transport(pybis)
+        openbis = pybis.Openbis("https://openbis.example.com")
+        with patch.object(session, "post") as post:
+            post.return_value.ok = True
+            post.return_value.json.return_value = {"result": {"objects": []}}
+            result = openbis._post_request_full_url("https://openbis.example.com/rpc",
+                                                    {"method": "m", "params": ["token"]})
+
+        assert result == {"objects": []}
+        post.assert_called_once()
+        assert _install_pooled_transport(pybis) is session
+
+    def test_pybis_raises_rpc_errors_from_pooled_session(self):
+        """Test that JSON-RPC errors keep pybis' own error handling."""
+        import pybis
+
+        session = _install_pooled_transport(pybis)
+        openbis = pybis.Openbis("https://openbis.example.com")
+        with patch.object(session, "post") as post:
+            post.return_value.ok = True
+            post.return_value.json.return_value = {"error": {"message": "no access"}}
+            with pytest.raises(ValueError, match="no access"):
+                openbis._post_request_full_url("https://openbis.example.com/rpc",
+                                               {"method": "m", "params": ["token"]})
+
+    @patch("src.chatBIS.tools.pybis_tools.pybis")
+    def test_session_reused_across_reconnects(self, mock_pybis):
+        """Test that reconnecting keeps the pooled HTTP session."""
+        connection = PyBISConnection()
+        connection.connect("https://host", "user", "secret")
+        session = connection.http_session
+        connection.connect("https://host", "user", "secret")
+
+        assert session is not None
+        assert connection.http_session is session
+
+    def test_session_shares_one_adapter(self):
+        """Test that both schemes share one adapter that does not retry reads."""
+        session = _create_http_session()
+        adapter = session.get_adapter("https://openbis.example.com")
+
+        assert adapter is session.get_adapter("http://openbis.example.com")
+        assert adapter.max_retries.read == 0
+
+    @pytest.mark.parametrize("brotli, expected", [
+        (True, "br, gzip, deflate"),
+        (False, "gzip, deflate"),
+    ])
+    def test_session_requests_compressed_responses(self, brotli, expected):
+        """Test that brotli is only advertised when it can be decoded."""
+        with patch("src.chatBIS.tools.pybis_tools.BROTLI_AVAILABLE", brotli):
+            session = _create_http_session()
+
+        assert session.headers["Accept-Encoding"] == expected